@@ -0,0 +1,29 @@
+"""Add content cache key to AI suggestions
+
+Revision ID: 002_ai_suggestion_cache_key
+Revises: 001_initial
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002_ai_suggestion_cache_key'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('ai_suggestions') as batch_op:
+        batch_op.add_column(sa.Column('cache_key', sa.String(length=64), nullable=True))
+    op.create_index('ix_ai_suggestions_cache_key', 'ai_suggestions', ['cache_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_suggestions_cache_key', table_name='ai_suggestions')
+    with op.batch_alter_table('ai_suggestions') as batch_op:
+        batch_op.drop_column('cache_key')
@@ -0,0 +1,42 @@
+"""Add generation jobs table
+
+Revision ID: 003_generation_jobs
+Revises: 002_ai_suggestion_cache_key
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_generation_jobs'
+down_revision: Union[str, None] = '002_ai_suggestion_cache_key'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'generation_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('session_id', sa.Integer(), nullable=False),
+        sa.Column('requested_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('params_json', sa.Text(), nullable=False),
+        sa.Column('result_json', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['requested_by_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_generation_jobs_session_id', 'generation_jobs', ['session_id'], unique=False)
+    op.create_index('ix_generation_jobs_status', 'generation_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('generation_jobs')
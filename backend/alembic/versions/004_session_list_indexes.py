@@ -0,0 +1,33 @@
+"""Add composite indexes for the patient session list
+
+Revision ID: 004_session_list_indexes
+Revises: 003_generation_jobs
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004_session_list_indexes'
+down_revision: Union[str, None] = '003_generation_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_sessions_patient_created', 'sessions', ['patient_id', 'created_at'], unique=False
+    )
+    op.create_index(
+        'ix_note_versions_session_version',
+        'note_versions',
+        ['session_id', 'version_number'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_note_versions_session_version', table_name='note_versions')
+    op.drop_index('ix_sessions_patient_created', table_name='sessions')
@@ -0,0 +1,128 @@
+"""Add denormalized summary columns to sessions
+
+Revision ID: 005_session_summary_columns
+Revises: 004_session_list_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from cryptography.fernet import Fernet
+
+from app.core.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision: str = '005_session_summary_columns'
+down_revision: Union[str, None] = '004_session_list_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+sessions = sa.table(
+    'sessions',
+    sa.column('id', sa.Integer),
+    sa.column('transcript_encrypted', sa.LargeBinary),
+    sa.column('transcript_length', sa.Integer),
+    sa.column('latest_version_id', sa.Integer),
+    sa.column('latest_version_status', sa.String),
+    sa.column('has_ai_suggestions', sa.Boolean),
+)
+note_versions = sa.table(
+    'note_versions',
+    sa.column('id', sa.Integer),
+    sa.column('session_id', sa.Integer),
+    sa.column('version_number', sa.Integer),
+    sa.column('status', sa.String),
+)
+ai_suggestions = sa.table(
+    'ai_suggestions',
+    sa.column('id', sa.Integer),
+    sa.column('session_id', sa.Integer),
+)
+
+
+def decrypt_transcript(fernet: Fernet, token: bytes) -> str:
+    """Decrypt a transcript as stored at this revision.
+
+    A frozen copy of the app's Fernet decrypt at the time, so later changes
+    to transcript encryption do not change what this migration reads.
+    """
+    return fernet.decrypt(token).decode()
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.add_column(
+            sa.Column('transcript_length', sa.Integer(), nullable=False, server_default='0')
+        )
+        batch_op.add_column(sa.Column('latest_version_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('latest_version_status', sa.String(length=20), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                'has_ai_suggestions', sa.Boolean(), nullable=False, server_default=sa.false()
+            )
+        )
+
+    backfill_summaries(op.get_bind())
+
+
+def backfill_summaries(bind: sa.engine.Connection) -> None:
+    """Fill the summary columns in id-ordered batches to bound memory on large tables."""
+    latest_version = (
+        sa.select(note_versions.c.id, note_versions.c.status)
+        .where(note_versions.c.session_id == sessions.c.id)
+        .order_by(note_versions.c.version_number.desc())
+        .limit(1)
+    )
+    has_suggestions = sa.exists().where(ai_suggestions.c.session_id == sessions.c.id)
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(sessions.c.id, sessions.c.transcript_encrypted)
+            .where(sessions.c.id > last_id)
+            .order_by(sessions.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        # Plaintext length needs the application key; Fernet padding hides it
+        fernet = Fernet(get_settings().encryption_key.encode())
+        bind.execute(
+            sessions.update()
+            .where(sessions.c.id == sa.bindparam('session_id'))
+            .values(transcript_length=sa.bindparam('length')),
+            [
+                {
+                    'session_id': row.id,
+                    'length': len(decrypt_transcript(fernet, row.transcript_encrypted)),
+                }
+                for row in rows
+            ],
+        )
+        bind.execute(
+            sessions.update()
+            .where(sessions.c.id.between(rows[0].id, rows[-1].id))
+            .values(
+                latest_version_id=latest_version.with_only_columns(
+                    note_versions.c.id
+                ).scalar_subquery(),
+                latest_version_status=latest_version.with_only_columns(
+                    note_versions.c.status
+                ).scalar_subquery(),
+                has_ai_suggestions=has_suggestions,
+            )
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.drop_column('has_ai_suggestions')
+        batch_op.drop_column('latest_version_status')
+        batch_op.drop_column('latest_version_id')
+        batch_op.drop_column('transcript_length')
@@ -0,0 +1,40 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: 006_keyset_pagination_indexes
+Revises: 005_session_summary_columns
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '006_keyset_pagination_indexes'
+down_revision: Union[str, None] = '005_session_summary_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_patients_created_id', 'patients', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_ai_suggestions_session_created',
+        'ai_suggestions',
+        ['session_id', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_note_versions_session_created',
+        'note_versions',
+        ['session_id', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index('ix_audit_logs_created_id', 'audit_logs', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_created_id', table_name='audit_logs')
+    op.drop_index('ix_note_versions_session_created', table_name='note_versions')
+    op.drop_index('ix_ai_suggestions_session_created', table_name='ai_suggestions')
+    op.drop_index('ix_patients_created_id', table_name='patients')
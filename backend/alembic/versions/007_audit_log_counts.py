@@ -0,0 +1,38 @@
+"""Add running audit log totals
+
+Revision ID: 007_audit_log_counts
+Revises: 006_keyset_pagination_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_audit_log_counts'
+down_revision: Union[str, None] = '006_keyset_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'audit_log_counts',
+        sa.Column('entity_type', sa.String(length=100), nullable=False),
+        sa.Column('action', sa.String(length=100), nullable=False),
+        sa.Column('actor_user_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['actor_user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('entity_type', 'action', 'actor_user_id')
+    )
+    op.execute(
+        "INSERT INTO audit_log_counts (entity_type, action, actor_user_id, count) "
+        "SELECT entity_type, action, actor_user_id, COUNT(*) FROM audit_logs "
+        "GROUP BY entity_type, action, actor_user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('audit_log_counts')
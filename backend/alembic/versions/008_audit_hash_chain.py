@@ -0,0 +1,145 @@
+"""Add audit log hash chain and checkpoints
+
+Revision ID: 008_audit_hash_chain
+Revises: 007_audit_log_counts
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Mapping, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_audit_hash_chain'
+down_revision: Union[str, None] = '007_audit_log_counts'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Frozen copy of the chain definition in app/services/audit_chain.py at this
+# revision, so later changes to the app do not alter how existing rows chain
+GENESIS_HASH = '0' * 64
+HEAD_ID = 1
+
+CHAINED_COLUMNS = (
+    'actor_user_id',
+    'action',
+    'entity_type',
+    'entity_id',
+    'before_hash',
+    'after_hash',
+    'metadata_json',
+    'created_at',
+)
+
+
+def canonical_time(value: datetime) -> str:
+    """Render a timestamp the same way whichever database returned it."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec='microseconds')
+
+
+def row_hash(prev_hash: str, seq: int, row: Mapping[Any, Any]) -> str:
+    """Chain hash of one audit row: SHA-256 over the previous hash, seq and fields."""
+    fields = [row[column] for column in CHAINED_COLUMNS]
+    fields[-1] = canonical_time(fields[-1])
+    payload = json.dumps([prev_hash, seq, *fields], separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+audit_logs = sa.table(
+    'audit_logs',
+    sa.column('id', sa.Integer),
+    sa.column('actor_user_id', sa.Integer),
+    sa.column('action', sa.String),
+    sa.column('entity_type', sa.String),
+    sa.column('entity_id', sa.Integer),
+    sa.column('before_hash', sa.String),
+    sa.column('after_hash', sa.String),
+    sa.column('metadata_json', sa.Text),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+    sa.column('chain_seq', sa.Integer),
+    sa.column('chain_hash', sa.String),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'audit_chain_head',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('last_seq', sa.Integer(), nullable=False),
+        sa.Column('last_hash', sa.String(length=64), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'audit_checkpoints',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('last_seq', sa.Integer(), nullable=False),
+        sa.Column('chain_hash', sa.String(length=64), nullable=False),
+        sa.Column('merkle_root', sa.String(length=64), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('last_seq')
+    )
+    with op.batch_alter_table('audit_logs') as batch_op:
+        batch_op.add_column(sa.Column('chain_seq', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('chain_hash', sa.String(length=64), nullable=True))
+
+    backfill_chain(op.get_bind())
+
+    with op.batch_alter_table('audit_logs') as batch_op:
+        batch_op.alter_column('chain_seq', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('chain_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index('ix_audit_logs_chain_seq', ['chain_seq'], unique=True)
+
+
+def backfill_chain(bind: sa.engine.Connection) -> None:
+    """Chain existing rows in id order, in batches to bound memory on large tables."""
+    last_id = last_seq = 0
+    prev_hash = GENESIS_HASH
+    while True:
+        rows = bind.execute(
+            sa.select(audit_logs.c.id, *[audit_logs.c[column] for column in CHAINED_COLUMNS])
+            .where(audit_logs.c.id > last_id)
+            .order_by(audit_logs.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        links = []
+        for row in rows:
+            last_seq += 1
+            prev_hash = row_hash(prev_hash, last_seq, row._mapping)
+            links.append({'row_id': row.id, 'seq': last_seq, 'hash': prev_hash})
+        bind.execute(
+            audit_logs.update()
+            .where(audit_logs.c.id == sa.bindparam('row_id'))
+            .values(chain_seq=sa.bindparam('seq'), chain_hash=sa.bindparam('hash')),
+            links,
+        )
+        last_id = rows[-1].id
+
+    op.execute(
+        sa.table(
+            'audit_chain_head',
+            sa.column('id', sa.Integer),
+            sa.column('last_seq', sa.Integer),
+            sa.column('last_hash', sa.String),
+        ).insert().values(id=HEAD_ID, last_seq=last_seq, last_hash=prev_hash)
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('audit_logs') as batch_op:
+        batch_op.drop_index('ix_audit_logs_chain_seq')
+        batch_op.drop_column('chain_hash')
+        batch_op.drop_column('chain_seq')
+    op.drop_table('audit_checkpoints')
+    op.drop_table('audit_chain_head')
@@ -0,0 +1,79 @@
+"""Store note version bodies zlib-compressed
+
+Revision ID: 009_compress_note_bodies
+Revises: 008_audit_hash_chain
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import zlib
+from typing import Callable, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009_compress_note_bodies'
+down_revision: Union[str, None] = '008_audit_hash_chain'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+BODY_COLUMNS = ('soap_json', 'dx_json', 'meds_json', 'safety_json')
+
+
+def upgrade() -> None:
+    convert_bodies(sa.Text(), sa.LargeBinary(), lambda text: zlib.compress(text.encode(), 6))
+
+
+def downgrade() -> None:
+    convert_bodies(sa.LargeBinary(), sa.Text(), lambda data: zlib.decompress(data).decode())
+
+
+def convert_bodies(
+    old_type: sa.types.TypeEngine, new_type: sa.types.TypeEngine, convert: Callable
+) -> None:
+    """Copy each body into a new column of ``new_type`` in batches, then swap the columns."""
+    with op.batch_alter_table('note_versions') as batch_op:
+        for column in BODY_COLUMNS:
+            batch_op.add_column(sa.Column(column + '_new', new_type, nullable=True))
+
+    note_versions = sa.table(
+        'note_versions',
+        sa.column('id', sa.Integer),
+        *[sa.column(column, old_type) for column in BODY_COLUMNS],
+        *[sa.column(column + '_new', new_type) for column in BODY_COLUMNS],
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(note_versions.c.id, *[note_versions.c[column] for column in BODY_COLUMNS])
+            .where(note_versions.c.id > last_id)
+            .order_by(note_versions.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            note_versions.update()
+            .where(note_versions.c.id == sa.bindparam('row_id'))
+            .values({column + '_new': sa.bindparam(column + '_value') for column in BODY_COLUMNS}),
+            [
+                {
+                    'row_id': row.id,
+                    **{
+                        column + '_value': None if value is None else convert(value)
+                        for column, value in zip(BODY_COLUMNS, row[1:])
+                    },
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table('note_versions') as batch_op:
+        for column in BODY_COLUMNS:
+            batch_op.drop_column(column)
+        for column in BODY_COLUMNS:
+            batch_op.alter_column(column + '_new', new_column_name=column)
@@ -0,0 +1,129 @@
+"""Allocate note version numbers from a per-session counter
+
+Revision ID: 010_version_number_counter
+Revises: 009_compress_note_bodies
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010_version_number_counter'
+down_revision: Union[str, None] = '009_compress_note_bodies'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+sessions = sa.table(
+    'sessions',
+    sa.column('id', sa.Integer),
+    sa.column('latest_version_id', sa.Integer),
+    sa.column('latest_version_status', sa.String),
+    sa.column('version_count', sa.Integer),
+)
+note_versions = sa.table(
+    'note_versions',
+    sa.column('id', sa.Integer),
+    sa.column('session_id', sa.Integer),
+    sa.column('version_number', sa.Integer),
+    sa.column('status', sa.String),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.add_column(
+            sa.Column('version_count', sa.Integer(), nullable=False, server_default='0')
+        )
+
+    bind = op.get_bind()
+    renumber_duplicates(bind)
+    backfill_counts(bind)
+
+    op.drop_index('ix_note_versions_session_version', table_name='note_versions')
+    op.create_index(
+        'ix_note_versions_session_version',
+        'note_versions',
+        ['session_id', sa.text('version_number DESC')],
+        unique=True,
+    )
+
+
+def renumber_duplicates(bind: sa.engine.Connection) -> None:
+    """Renumber sessions where concurrent writers allocated the same number twice.
+
+    Versions keep their (version_number, id) order and get 1..n; the session
+    summary is pointed at the new highest-numbered version.
+    """
+    session_ids = bind.execute(
+        sa.select(note_versions.c.session_id)
+        .group_by(note_versions.c.session_id, note_versions.c.version_number)
+        .having(sa.func.count() > 1)
+        .distinct()
+    ).scalars().all()
+
+    for session_id in session_ids:
+        versions = bind.execute(
+            sa.select(note_versions.c.id, note_versions.c.status)
+            .where(note_versions.c.session_id == session_id)
+            .order_by(note_versions.c.version_number, note_versions.c.id)
+        ).all()
+        bind.execute(
+            note_versions.update()
+            .where(note_versions.c.id == sa.bindparam('version_id'))
+            .values(version_number=sa.bindparam('number')),
+            [
+                {'version_id': version.id, 'number': number}
+                for number, version in enumerate(versions, start=1)
+            ],
+        )
+        bind.execute(
+            sessions.update()
+            .where(sessions.c.id == session_id)
+            .values(
+                latest_version_id=versions[-1].id,
+                latest_version_status=versions[-1].status,
+            )
+        )
+
+
+def backfill_counts(bind: sa.engine.Connection) -> None:
+    """Start each counter at the session's highest version number, in id-ordered batches."""
+    highest_version = (
+        sa.select(sa.func.coalesce(sa.func.max(note_versions.c.version_number), 0))
+        .where(note_versions.c.session_id == sessions.c.id)
+        .scalar_subquery()
+    )
+
+    last_id = 0
+    while True:
+        ids = bind.execute(
+            sa.select(sessions.c.id)
+            .where(sessions.c.id > last_id)
+            .order_by(sessions.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).scalars().all()
+        if not ids:
+            break
+        bind.execute(
+            sessions.update()
+            .where(sessions.c.id.between(ids[0], ids[-1]))
+            .values(version_count=highest_version)
+        )
+        last_id = ids[-1]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_note_versions_session_version', table_name='note_versions')
+    op.create_index(
+        'ix_note_versions_session_version',
+        'note_versions',
+        ['session_id', 'version_number'],
+        unique=False,
+    )
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.drop_column('version_count')
@@ -0,0 +1,66 @@
+"""Add per-patient data keys for envelope encryption of transcripts
+
+Revision ID: 011_patient_data_keys
+Revises: 010_version_number_counter
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '011_patient_data_keys'
+down_revision: Union[str, None] = '010_version_number_counter'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'patient_data_keys',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('master_key_id', sa.String(length=64), nullable=False),
+        sa.Column('wrapped_key', sa.LargeBinary(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('(CURRENT_TIMESTAMP)'),
+            nullable=True,
+        ),
+        sa.Column('rotated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('patient_id'),
+    )
+    op.create_index(
+        'ix_patient_data_keys_master_key_id', 'patient_data_keys', ['master_key_id', 'id']
+    )
+
+    # Existing transcripts keep NULL and stay readable with the global key
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.add_column(sa.Column('transcript_key_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_sessions_transcript_key_id', 'patient_data_keys', ['transcript_key_id'], ['id']
+        )
+
+
+def downgrade() -> None:
+    # Transcripts sealed with a data key cannot be read once the keys are gone
+    keyed = op.get_bind().execute(
+        sa.text('SELECT COUNT(*) FROM sessions WHERE transcript_key_id IS NOT NULL')
+    ).scalar()
+    if keyed:
+        raise RuntimeError(
+            f'{keyed} transcripts are sealed with patient data keys; '
+            'they would be unreadable after downgrading'
+        )
+
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.drop_constraint('fk_sessions_transcript_key_id', type_='foreignkey')
+        batch_op.drop_column('transcript_key_id')
+
+    op.drop_index('ix_patient_data_keys_master_key_id', table_name='patient_data_keys')
+    op.drop_table('patient_data_keys')
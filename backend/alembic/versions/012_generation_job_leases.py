@@ -0,0 +1,28 @@
+"""Add a lease heartbeat to generation jobs
+
+Revision ID: 012_generation_job_leases
+Revises: 011_patient_data_keys
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012_generation_job_leases'
+down_revision: Union[str, None] = '011_patient_data_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Running jobs without a heartbeat count as abandoned and are re-queued
+    with op.batch_alter_table('generation_jobs') as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('generation_jobs') as batch_op:
+        batch_op.drop_column('heartbeat_at')
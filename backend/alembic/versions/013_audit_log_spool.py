@@ -0,0 +1,43 @@
+"""Add the audit log write-behind spool table
+
+Revision ID: 013_audit_log_spool
+Revises: 012_generation_job_leases
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '013_audit_log_spool'
+down_revision: Union[str, None] = '012_generation_job_leases'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'audit_log_spool',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('actor_user_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(length=100), nullable=False),
+        sa.Column('entity_type', sa.String(length=100), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('before_hash', sa.String(length=64), nullable=True),
+        sa.Column('after_hash', sa.String(length=64), nullable=True),
+        sa.Column('metadata_json', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('claimed_by', sa.String(length=32), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    pending = op.get_bind().execute(sa.text('SELECT COUNT(*) FROM audit_log_spool')).scalar()
+    if pending:
+        raise RuntimeError(
+            f'{pending} audit rows are still spooled; drain them before downgrading'
+        )
+    op.drop_table('audit_log_spool')
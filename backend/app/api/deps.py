@@ -1,39 +1,38 @@
 """API dependencies for authentication and authorization."""
 
-from typing import Annotated, Optional
+from typing import Annotated, Any, Callable, Coroutine, Optional, TypeVar
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.security import decode_token
 from app.core.rate_limiter import get_rate_limiter, InMemoryRateLimiter
-from app.db.session import get_db
+from app.db.session import get_db, get_session_factory
 from app.db.models import User, UserRole
+from app.services.generation_jobs import GenerationJobQueue, get_generation_job_queue
+from app.services.principal_cache import Principal, PrincipalCache, get_principal_cache
 
 # Security scheme
 security = HTTPBearer()
 
+UserT = TypeVar("UserT", User, Principal)
 
-async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
-    """Get the current authenticated user from JWT token.
+
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    """Get the user ID from a bearer access token.
     
     Args:
         credentials: Bearer token credentials.
-        db: Database session.
         
     Returns:
-        Authenticated User.
+        User ID from the token subject.
         
     Raises:
-        HTTPException: If token is invalid or user not found.
+        HTTPException: If the token is invalid, expired or not an access token.
     """
-    token = credentials.credentials
-    payload = decode_token(token)
+    payload = decode_token(credentials.credentials)
 
     if payload is None:
         raise HTTPException(
@@ -57,11 +56,18 @@ async def get_current_user(
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return int(user_id)
 
-    # Get user from database
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
 
+def _check_found_and_active(user: Optional[UserT]) -> UserT:
+    """Reject a missing or disabled user.
+    
+    Returns:
+        The user, known to exist and be active.
+        
+    Raises:
+        HTTPException: 401 if the user does not exist, 403 if disabled.
+    """
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -74,10 +80,66 @@ async def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is disabled",
         )
-
     return user
 
 
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> User:
+    """Get the current authenticated user from JWT token.
+    
+    Args:
+        credentials: Bearer token credentials.
+        db: Database session.
+        
+    Returns:
+        Authenticated User.
+        
+    Raises:
+        HTTPException: If token is invalid or user not found.
+    """
+    user_id = _token_user_id(credentials)
+
+    # Get user from database
+    result = await db.execute(select(User).where(User.id == user_id))
+    return _check_found_and_active(result.scalar_one_or_none())
+
+
+async def get_current_principal(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    cache: Annotated[PrincipalCache, Depends(get_principal_cache)],
+) -> Principal:
+    """Get the current user's principal, from the cache when possible.
+    
+    Args:
+        credentials: Bearer token credentials.
+        db: Database session, only used on a cache miss.
+        cache: Principal cache.
+        
+    Returns:
+        Principal of the authenticated, active user.
+        
+    Raises:
+        HTTPException: If token is invalid or user not found or disabled.
+    """
+    user_id = _token_user_id(credentials)
+
+    principal = cache.get(user_id)
+    if principal is None:
+        result = await db.execute(
+            select(User.id, User.role, User.is_active).where(User.id == user_id)
+        )
+        row = result.first()
+        principal = _check_found_and_active(
+            Principal(id=row.id, role=row.role, is_active=row.is_active) if row else None
+        )
+        cache.set(principal)
+
+    return principal
+
+
 async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
@@ -97,7 +159,7 @@ async def get_current_active_user(
     return current_user
 
 
-def require_role(*roles: str):
+def require_role(*roles: str) -> Callable[[Principal], Coroutine[Any, Any, Principal]]:
     """Create a dependency that requires specific roles.
     
     Args:
@@ -107,8 +169,8 @@ def require_role(*roles: str):
         Dependency function.
     """
     async def role_checker(
-        current_user: Annotated[User, Depends(get_current_active_user)],
-    ) -> User:
+        current_user: Annotated[Principal, Depends(get_current_principal)],
+    ) -> Principal:
         if current_user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -128,9 +190,9 @@ require_any_role = require_role(
 
 
 async def check_rate_limit(
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_principal)],
     rate_limiter: Annotated[InMemoryRateLimiter, Depends(get_rate_limiter)],
-) -> User:
+) -> Principal:
     """Check rate limit for the current user.
     
     Args:
@@ -138,7 +200,7 @@ async def check_rate_limit(
         rate_limiter: Rate limiter instance.
         
     Returns:
-        User if rate limit not exceeded.
+        Principal if rate limit not exceeded.
         
     Raises:
         HTTPException: If rate limit exceeded.
@@ -156,8 +218,10 @@ async def check_rate_limit(
 
 # Type aliases for common dependencies
 CurrentUser = Annotated[User, Depends(get_current_active_user)]
-AdminUser = Annotated[User, Depends(require_admin)]
-ClinicianOrAdmin = Annotated[User, Depends(require_clinician_or_admin)]
-AnyAuthUser = Annotated[User, Depends(require_any_role)]
-RateLimitedUser = Annotated[User, Depends(check_rate_limit)]
+AdminUser = Annotated[Principal, Depends(require_admin)]
+ClinicianOrAdmin = Annotated[Principal, Depends(require_clinician_or_admin)]
+AnyAuthUser = Annotated[Principal, Depends(require_any_role)]
+RateLimitedUser = Annotated[Principal, Depends(check_rate_limit)]
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+SessionFactory = Annotated[async_sessionmaker[AsyncSession], Depends(get_session_factory)]
+JobQueue = Annotated[GenerationJobQueue, Depends(get_generation_job_queue)]
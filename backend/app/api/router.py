@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api.routes import auth, patients, sessions, notes, audit, health
+from app.api.routes import auth, patients, sessions, notes, audit, health, jobs
 
 api_router = APIRouter()
 
@@ -12,4 +12,5 @@ api_router.include_router(patients.router, prefix="/patients", tags=["Patients"]
 api_router.include_router(sessions.router, prefix="/sessions", tags=["Sessions"])
 api_router.include_router(notes.router, prefix="/notes", tags=["Notes"])
 api_router.include_router(audit.router, prefix="/audit", tags=["Audit"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
 api_router.include_router(health.router, tags=["Health"])
@@ -1,12 +1,16 @@
 """Audit log routes."""
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import DbSession, AdminUser
-from app.schemas.audit import AuditLogResponse, AuditLogListResponse
+from app.api.deps import DbSession, AdminUser, SessionFactory
+from app.schemas.audit import AuditChainVerifyResponse, AuditLogResponse, AuditLogListResponse
 from app.services.audit import AuditService
+from app.services.audit_chain import AuditChainVerifier
+from app.services.audit_export import EXPORT_MEDIA_TYPES, RowChunks, encode_export
 
 router = APIRouter()
 
@@ -15,7 +19,9 @@ router = APIRouter()
     "/logs",
     response_model=AuditLogListResponse,
     summary="List audit logs",
-    description="Get audit logs with optional filters. Admin only.",
+    description=(
+        "Get audit logs with optional filters, newest first. Page with `next_cursor`. Admin only."
+    ),
 )
 async def list_audit_logs(
     db: DbSession,
@@ -26,6 +32,12 @@ async def list_audit_logs(
     action: Optional[str] = Query(None, description="Filter by action"),
     limit: int = Query(100, le=1000, description="Maximum results"),
     offset: int = Query(0, ge=0, description="Results offset"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    total_mode: str = Query(
+        "exact",
+        pattern="^(exact|estimated|none)$",
+        description="exact: COUNT(*); estimated: running counters; none: only has_more",
+    ),
 ) -> AuditLogListResponse:
     """List audit logs with filters.
     
@@ -37,32 +49,116 @@ async def list_audit_logs(
         entity_id: Filter by entity ID.
         action: Filter by action.
         limit: Maximum results.
-        offset: Results offset.
+        offset: Results offset (not with a cursor).
+        cursor: Cursor from the previous page.
+        total_mode: How to compute the total.
         
     Returns:
         List of audit logs.
     """
     audit_service = AuditService(db)
 
-    logs = await audit_service.get_logs(
-        actor_user_id=actor_user_id,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        action=action,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        logs, next_cursor = await audit_service.get_logs(
+            actor_user_id=actor_user_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            action=action,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
-    total = await audit_service.count_logs(
-        actor_user_id=actor_user_id,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        action=action,
-    )
+    filters: dict[str, Any] = {
+        "actor_user_id": actor_user_id,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action,
+    }
+    total = None
+    if total_mode == "exact":
+        total = await audit_service.count_logs(**filters)
+    elif total_mode == "estimated":
+        total = await audit_service.estimate_logs(**filters)
 
     return AuditLogListResponse(
         logs=[AuditLogResponse.model_validate(log) for log in logs],
         total=total,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/export",
+    summary="Export audit logs",
+    description=(
+        "Stream every matching audit log in id order as NDJSON, CSV or Parquet (Parquet "
+        "needs pyarrow on the server). Takes the list filters plus a created_at range. "
+        "Admin only."
+    ),
+)
+async def export_audit_logs(
+    current_user: AdminUser,
+    session_factory: SessionFactory,
+    export_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv|parquet)$", description="Output format"
+    ),
+    actor_user_id: Optional[int] = Query(None, description="Filter by actor user ID"),
+    entity_type: Optional[str] = Query(None, description="Filter by entity type"),
+    entity_id: Optional[int] = Query(None, description="Filter by entity ID"),
+    action: Optional[str] = Query(None, description="Filter by action"),
+    start_date: Optional[datetime] = Query(None, description="Created at or after"),
+    end_date: Optional[datetime] = Query(None, description="Created before"),
+) -> StreamingResponse:
+    """Stream an audit log export.
+    
+    The export reads through its own database session, held for as long as
+    the response streams.
+    
+    Args:
+        current_user: Authenticated admin.
+        session_factory: Factory for the export's database session.
+        export_format: ndjson, csv or parquet.
+        actor_user_id: Filter by actor.
+        entity_type: Filter by entity type.
+        entity_id: Filter by entity ID.
+        action: Filter by action.
+        start_date: Only logs created at or after this time.
+        end_date: Only logs created before this time.
+        
+    Returns:
+        Streaming file download.
+    """
+    async def rows() -> RowChunks:
+        async with session_factory() as export_db:
+            async for chunk in AuditService(export_db).stream_logs(
+                actor_user_id=actor_user_id,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                action=action,
+                start_date=start_date,
+                end_date=end_date,
+            ):
+                yield chunk
+
+    try:
+        body = encode_export(export_format, rows())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="audit_logs.{export_format}"'},
     )
 
 
@@ -98,3 +194,31 @@ async def get_audit_log(
         )
 
     return AuditLogResponse.model_validate(log)
+
+
+@router.post(
+    "/verify",
+    response_model=AuditChainVerifyResponse,
+    summary="Verify audit hash chain",
+    description=(
+        "Verify the audit log hash chain from the latest checkpoint (or from the start with "
+        "`full=true`), recording new checkpoints. Admin only."
+    ),
+)
+async def verify_audit_chain(
+    db: DbSession,
+    current_user: AdminUser,
+    full: bool = Query(False, description="Verify every row and re-check all checkpoints"),
+) -> AuditChainVerifyResponse:
+    """Verify the audit hash chain.
+    
+    Args:
+        db: Database session.
+        current_user: Authenticated admin.
+        full: Verify from the first row instead of the latest checkpoint.
+        
+    Returns:
+        Verification result.
+    """
+    result = await AuditChainVerifier(db).verify(full=full)
+    return AuditChainVerifyResponse.model_validate(result)
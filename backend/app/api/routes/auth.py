@@ -8,8 +8,6 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    get_password_hash,
-    verify_password,
 )
 from app.db.models import User
 from app.schemas.auth import (
@@ -19,6 +17,7 @@ from app.schemas.auth import (
     RefreshResponse,
     UserResponse,
 )
+from app.services.password_hashing import HashingPoolFullError, get_password_hasher
 
 router = APIRouter()
 
@@ -31,6 +30,7 @@ router = APIRouter()
     responses={
         200: {"description": "Successful login"},
         401: {"description": "Invalid credentials"},
+        503: {"description": "Too many logins in progress; retry shortly"},
     },
 )
 async def login(
@@ -50,7 +50,20 @@ async def login(
     result = await db.execute(select(User).where(User.email == request.email))
     user = result.scalar_one_or_none()
 
-    if user is None or not verify_password(request.password, user.password_hash):
+    valid, new_hash = False, None
+    if user is not None:
+        try:
+            valid, new_hash = await get_password_hasher().verify(
+                request.password, user.password_hash
+            )
+        except HashingPoolFullError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many logins in progress, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+    if user is None or not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -63,6 +76,10 @@ async def login(
             detail="User account is disabled",
         )
 
+    # Upgrade hashes made with an older cost; committed with the request
+    if new_hash is not None:
+        user.password_hash = new_hash
+
     # Create tokens
     token_data = {"sub": str(user.id), "role": user.role}
     access_token = create_access_token(token_data)
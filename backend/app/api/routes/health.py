@@ -1,10 +1,19 @@
 """Health and metrics endpoints."""
 
-from fastapi import APIRouter, Response
+from typing import Any
 
+from fastapi import APIRouter, Response, status
+from sqlalchemy import text
+
+from app.api.deps import DbSession
+from app.core.config import get_settings
+from app.core.logging import get_logger
 from app.core.metrics import get_metrics, get_metrics_content_type
+from app.db.session import pool_status
 
 router = APIRouter()
+settings = get_settings()
+logger = get_logger()
 
 
 @router.get(
@@ -15,7 +24,7 @@ router = APIRouter()
         200: {"description": "Service is healthy"},
     },
 )
-async def health_check() -> dict:
+async def health_check() -> dict[str, str]:
     """Health check endpoint.
     
     Returns:
@@ -27,19 +36,48 @@ async def health_check() -> dict:
 @router.get(
     "/readyz",
     summary="Readiness check",
-    description="Check if service is ready to accept requests.",
+    description=(
+        "Check if service is ready to accept requests: the database answers and the "
+        "connection pool is not saturated."
+    ),
     responses={
         200: {"description": "Service is ready"},
+        503: {"description": "Database unreachable or connection pool saturated"},
     },
 )
-async def readiness_check() -> dict:
+async def readiness_check(db: DbSession, response: Response) -> dict[str, Any]:
     """Readiness check endpoint.
     
+    Args:
+        db: Database session (not connected until the ping).
+        response: Response, for the status code.
+        
     Returns:
-        Readiness status.
+        Readiness status with database and pool details.
     """
-    # Could add database connectivity check here
-    return {"status": "ready"}
+    # Read the pool before the ping checks out a connection of its own
+    pool = pool_status(db.get_bind())
+    saturated = (
+        pool["saturation"] is not None
+        and pool["saturation"] >= settings.db_pool_saturation_threshold
+    )
+
+    database = "skipped" if saturated else "ok"
+    if not saturated:
+        try:
+            await db.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.error(f"Readiness database check failed: {type(e).__name__}")
+            database = "error"
+
+    ready = database == "ok"
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if ready else "not_ready",
+        "database": database,
+        "pool": {**pool, "saturated": saturated},
+    }
 
 
 @router.get(
@@ -0,0 +1,115 @@
+"""Background generation job routes."""
+
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import ClinicianOrAdmin, JobQueue
+from app.core.sse import SSE_HEADERS, SSE_MEDIA_TYPE, format_sse, format_sse_comment
+from app.db.models import GenerationJob
+from app.schemas.ai import GenerateResponse
+from app.schemas.jobs import GenerationJobResponse
+
+router = APIRouter()
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_INTERVAL = 15.0
+
+
+def job_to_response(job: GenerationJob) -> GenerationJobResponse:
+    """Build the API representation of a job."""
+    return GenerationJobResponse(
+        id=job.id,
+        session_id=job.session_id,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        result=(
+            GenerateResponse.model_validate_json(job.result_json) if job.result_json else None
+        ),
+    )
+
+
+@router.get(
+    "/{job_id}",
+    response_model=GenerationJobResponse,
+    summary="Get generation job",
+    description="Poll the status of a background generation job.",
+)
+async def get_job(
+    job_id: str,
+    current_user: ClinicianOrAdmin,
+    queue: JobQueue,
+) -> GenerationJobResponse:
+    """Get a generation job's status and, once finished, its result.
+    
+    Args:
+        job_id: Job ID.
+        current_user: Authenticated clinician or admin.
+        queue: Generation job queue.
+        
+    Returns:
+        Job status.
+    """
+    job = await queue.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+
+    return job_to_response(job)
+
+
+@router.get(
+    "/{job_id}/events",
+    summary="Stream generation job events",
+    description="Server-Sent Events stream of job status changes. Closes when the job finishes.",
+)
+async def stream_job_events(
+    job_id: str,
+    current_user: ClinicianOrAdmin,
+    queue: JobQueue,
+) -> StreamingResponse:
+    """Push job status changes to the client as they happen.
+    
+    Emits a ``status`` event with the full job on every change; the final
+    event carries the result or error.
+    
+    Args:
+        job_id: Job ID.
+        current_user: Authenticated clinician or admin.
+        queue: Generation job queue.
+        
+    Returns:
+        Event stream response.
+    """
+    if not await queue.get(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+
+    async def event_stream() -> AsyncIterator[str]:
+        last_status = None
+        while True:
+            job, update = await queue.watch(job_id)
+            if job is None:
+                return
+
+            if job.status != last_status:
+                last_status = job.status
+                yield format_sse("status", job_to_response(job).model_dump_json())
+            if update is None:
+                return
+
+            try:
+                await asyncio.wait_for(update.wait(), timeout=KEEPALIVE_INTERVAL)
+            except TimeoutError:
+                yield format_sse_comment()
+
+    return StreamingResponse(event_stream(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
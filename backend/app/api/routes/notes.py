@@ -1,14 +1,17 @@
 """Note version management routes."""
 
-from typing import List
+from typing import Any, Iterable, List, Optional
 
 from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import select, func
 
 from app.api.deps import DbSession, ClinicianOrAdmin, AnyAuthUser
+from app.core.pagination import keyset_page, split_page
 from app.db.models import Session, NoteVersion
 from app.schemas.notes import (
     NoteVersionResponse,
+    NoteVersionSummary,
+    NoteVersionSummaryListResponse,
     NoteVersionUpdate,
     NoteVersionListResponse,
     RollbackRequest,
@@ -20,47 +23,142 @@ logger = get_logger()
 
 router = APIRouter()
 
+# Everything but the note bodies
+SUMMARY_COLUMNS = (
+    NoteVersion.id,
+    NoteVersion.session_id,
+    NoteVersion.version_number,
+    NoteVersion.status,
+    NoteVersion.ai_suggestion_id,
+    NoteVersion.created_by_user_id,
+    NoteVersion.created_at,
+)
+
+
+async def _page_versions(
+    db: DbSession,
+    columns: Iterable[Any],
+    session_id: int,
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> tuple[list[Any], int, Optional[str]]:
+    """Fetch one page of a session's versions, newest first.
+    
+    Args:
+        db: Database session.
+        columns: Note version columns to read.
+        session_id: Session ID.
+        limit: Maximum records, or None for all.
+        cursor: Cursor from the previous page.
+        
+    Returns:
+        Tuple of (page rows, total versions, cursor for the next page or None).
+        
+    Raises:
+        HTTPException: If the session does not exist or the cursor is invalid.
+    """
+    # Verify session exists
+    session = await db.get(Session, session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found",
+        )
+
+    # Versions are numbered in insertion order, so (created_at, id) matches
+    # version_number order
+    query = select(*columns).where(NoteVersion.session_id == session_id)
+    try:
+        query = keyset_page(query, NoteVersion, limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    result = await db.execute(query)
+    versions, next_cursor = split_page(result.all(), limit)
+
+    count_query = select(func.count(NoteVersion.id)).where(NoteVersion.session_id == session_id)
+    total = (await db.execute(count_query)).scalar() or 0
+
+    return versions, total, next_cursor
+
 
 @router.get(
     "/sessions/{session_id}/versions",
     response_model=NoteVersionListResponse,
     summary="List note versions",
-    description="Get all note versions for a session.",
+    description=(
+        "Get note versions for a session, newest first; all of them unless `limit` is "
+        "given. Page with `next_cursor`."
+    ),
 )
 async def list_versions(
     session_id: int,
     db: DbSession,
     current_user: AnyAuthUser,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> NoteVersionListResponse:
-    """List all versions for a session.
+    """List versions for a session.
     
     Args:
         session_id: Session ID.
         db: Database session.
         current_user: Authenticated user.
+        limit: Maximum records.
+        cursor: Cursor from the previous page.
         
     Returns:
         List of note versions.
     """
-    # Verify session exists
-    session = await db.get(Session, session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
-    query = (
-        select(NoteVersion)
-        .where(NoteVersion.session_id == session_id)
-        .order_by(NoteVersion.version_number.desc())
+    versions, total, next_cursor = await _page_versions(
+        db, NoteVersion.__table__.columns, session_id, limit, cursor
     )
-    result = await db.execute(query)
-    versions = result.scalars().all()
 
     return NoteVersionListResponse(
         versions=[NoteVersionResponse.model_validate(v) for v in versions],
-        total=len(versions),
+        total=total,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/sessions/{session_id}/versions/summary",
+    response_model=NoteVersionSummaryListResponse,
+    summary="List note version metadata",
+    description=(
+        "Get note version numbers, statuses and authors for a session without the note "
+        "bodies, newest first. Page with `next_cursor`; fetch a body with GET /versions/{id}."
+    ),
+)
+async def list_version_summaries(
+    session_id: int,
+    db: DbSession,
+    current_user: AnyAuthUser,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> NoteVersionSummaryListResponse:
+    """List version metadata for a session; the bodies are never read.
+    
+    Args:
+        session_id: Session ID.
+        db: Database session.
+        current_user: Authenticated user.
+        limit: Maximum records.
+        cursor: Cursor from the previous page.
+        
+    Returns:
+        List of note version summaries.
+    """
+    versions, total, next_cursor = await _page_versions(
+        db, SUMMARY_COLUMNS, session_id, limit, cursor
+    )
+
+    return NoteVersionSummaryListResponse(
+        versions=[NoteVersionSummary.model_validate(v) for v in versions],
+        total=total,
+        next_cursor=next_cursor,
     )
 
 
@@ -1,11 +1,12 @@
 """Patient management routes."""
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 from sqlalchemy import select, func
 
 from app.api.deps import DbSession, ClinicianOrAdmin, AnyAuthUser
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_page, split_page
 from app.db.models import Patient
 from app.schemas.patient import PatientCreate, PatientResponse, PatientUpdate
 from app.services.audit import AuditService
@@ -71,36 +72,51 @@ async def create_patient(
     "",
     response_model=List[PatientResponse],
     summary="List patients",
-    description="Get a list of all patients. Available to all authenticated users.",
+    description=(
+        "Get a list of all patients. Available to all authenticated users. "
+        f"Pass the `{NEXT_CURSOR_HEADER}` response header as `cursor` to get the next page."
+    ),
 )
 async def list_patients(
+    response: Response,
     db: DbSession,
     current_user: AnyAuthUser,
     skip: int = 0,
     limit: int = 100,
     search: str | None = None,
+    cursor: Optional[str] = None,
 ) -> List[PatientResponse]:
     """List all patients with optional search.
     
     Args:
+        response: Outgoing response, for the next-cursor header.
         db: Database session.
         current_user: Authenticated user.
-        skip: Number of records to skip.
+        skip: Number of records to skip (not with a cursor).
         limit: Maximum records to return.
         search: Optional search term for name.
+        cursor: Cursor from the previous page.
         
     Returns:
         List of patients.
     """
-    query = select(Patient).order_by(Patient.created_at.desc())
+    query = select(Patient)
 
     if search:
         query = query.where(Patient.name.ilike(f"%{search}%"))
 
-    query = query.offset(skip).limit(limit)
+    try:
+        query = keyset_page(query, Patient, limit, cursor=cursor, offset=skip)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
     result = await db.execute(query)
-    patients = result.scalars().all()
+    patients, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return [PatientResponse.model_validate(p) for p in patients]
 
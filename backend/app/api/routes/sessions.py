@@ -1,18 +1,25 @@
 """Session management routes."""
 
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
-from app.api.deps import DbSession, ClinicianOrAdmin, AnyAuthUser
-from app.core.security import encrypt_data, decrypt_data, hash_for_audit
-from app.db.models import Session, Patient, AiSuggestion, NoteVersion
+from app.api.deps import DbSession, ClinicianOrAdmin, AnyAuthUser, JobQueue, SessionFactory
+from app.api.routes.jobs import job_to_response
+from app.core.concurrency import ClientDisconnectedError, run_until_disconnected
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_page, split_page
+from app.core.security import hash_for_audit
+from app.core.sse import SSE_HEADERS, SSE_MEDIA_TYPE, format_sse
+from app.db.models import Session, Patient, AiSuggestion
 from app.schemas.session import SessionCreate, SessionResponse, SessionListResponse
 from app.schemas.ai import GenerateRequest, GenerateResponse, AiSuggestionResponse
+from app.schemas.jobs import GenerationJobResponse
 from app.services.notes import NotesService
 from app.services.audit import AuditService
+from app.services.data_keys import DataKeyService
 from app.core.logging import get_logger
 
 logger = get_logger()
@@ -53,14 +60,18 @@ async def create_session(
         )
 
     # Encrypt transcript
-    transcript_encrypted = encrypt_data(session_data.transcript)
+    key_id, transcript_encrypted = await DataKeyService(db).encrypt_transcript(
+        patient_id, session_data.transcript
+    )
     transcript_hash = hash_for_audit(session_data.transcript)
 
     session = Session(
         patient_id=patient_id,
         created_by_user_id=current_user.id,
         transcript_encrypted=transcript_encrypted,
+        transcript_key_id=key_id,
         transcript_hash=transcript_hash,
+        transcript_length=len(session_data.transcript),
     )
     db.add(session)
     await db.flush()
@@ -96,7 +107,7 @@ async def create_session(
     "/patients/{patient_id}/sessions",
     response_model=SessionListResponse,
     summary="List patient sessions",
-    description="Get all sessions for a patient.",
+    description="Get all sessions for a patient, newest first. Page with `next_cursor`.",
 )
 async def list_patient_sessions(
     patient_id: int,
@@ -104,6 +115,7 @@ async def list_patient_sessions(
     current_user: AnyAuthUser,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> SessionListResponse:
     """List sessions for a patient.
     
@@ -111,70 +123,51 @@ async def list_patient_sessions(
         patient_id: Patient ID.
         db: Database session.
         current_user: Authenticated user.
-        skip: Records to skip.
+        skip: Records to skip (not with a cursor).
         limit: Maximum records.
+        cursor: Cursor from the previous page.
         
     Returns:
         List of sessions.
     """
-    # Verify patient exists
-    patient = await db.get(Patient, patient_id)
-    if not patient:
+    # One round trip: page rows and the total (window count). The summary
+    # columns are denormalized on Session, so the transcript blob is not read.
+    query = select(
+        Session.id,
+        Session.patient_id,
+        Session.created_by_user_id,
+        Session.transcript_length,
+        Session.created_at,
+        Session.has_ai_suggestions,
+        Session.latest_version_id,
+        Session.latest_version_status,
+        func.count().over().label("total"),
+    ).where(Session.patient_id == patient_id)
+    try:
+        query = keyset_page(query, Session, limit, cursor=cursor, offset=skip)
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Patient {patient_id} not found",
-        )
-
-    # Get sessions with related data
-    query = (
-        select(Session)
-        .where(Session.patient_id == patient_id)
-        .order_by(Session.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    result = await db.execute(query)
-    sessions = result.scalars().all()
-
-    # Get total count
-    count_query = select(func.count(Session.id)).where(Session.patient_id == patient_id)
-    count_result = await db.execute(count_query)
-    total = count_result.scalar() or 0
-
-    # Build response with additional info
-    response_sessions = []
-    for session in sessions:
-        # Get latest version
-        version_query = (
-            select(NoteVersion)
-            .where(NoteVersion.session_id == session.id)
-            .order_by(NoteVersion.version_number.desc())
-            .limit(1)
-        )
-        version_result = await db.execute(version_query)
-        latest_version = version_result.scalar_one_or_none()
-
-        # Check for AI suggestions
-        suggestions_query = select(func.count(AiSuggestion.id)).where(
-            AiSuggestion.session_id == session.id
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
-        suggestions_result = await db.execute(suggestions_query)
-        has_suggestions = (suggestions_result.scalar() or 0) > 0
-
-        response_sessions.append(
-            SessionResponse(
-                id=session.id,
-                patient_id=session.patient_id,
-                created_by_user_id=session.created_by_user_id,
-                transcript_length=len(session.transcript_encrypted),
-                created_at=session.created_at,
-                has_ai_suggestions=has_suggestions,
-                latest_version_id=latest_version.id if latest_version else None,
-                latest_version_status=latest_version.status if latest_version else None,
+    rows, next_cursor = split_page((await db.execute(query)).all(), limit)
+
+    if rows and cursor is None:
+        total = rows[0].total
+    else:
+        # Empty page: the patient may not exist, or skip is past the end.
+        # After a cursor the window only counts the remaining rows.
+        if not rows and not await db.get(Patient, patient_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Patient {patient_id} not found",
             )
-        )
+        count_query = select(func.count(Session.id)).where(Session.patient_id == patient_id)
+        total = (await db.execute(count_query)).scalar() or 0
 
-    return SessionListResponse(sessions=response_sessions, total=total)
+    response_sessions = [SessionResponse.model_validate(row) for row in rows]
+
+    return SessionListResponse(sessions=response_sessions, total=total, next_cursor=next_cursor)
 
 
 @router.get(
@@ -205,36 +198,7 @@ async def get_session(
             detail=f"Session {session_id} not found",
         )
 
-    # Get latest version
-    version_query = (
-        select(NoteVersion)
-        .where(NoteVersion.session_id == session.id)
-        .order_by(NoteVersion.version_number.desc())
-        .limit(1)
-    )
-    version_result = await db.execute(version_query)
-    latest_version = version_result.scalar_one_or_none()
-
-    # Check for AI suggestions
-    suggestions_query = select(func.count(AiSuggestion.id)).where(
-        AiSuggestion.session_id == session.id
-    )
-    suggestions_result = await db.execute(suggestions_query)
-    has_suggestions = (suggestions_result.scalar() or 0) > 0
-
-    # Decrypt transcript to get length
-    transcript = decrypt_data(session.transcript_encrypted)
-
-    return SessionResponse(
-        id=session.id,
-        patient_id=session.patient_id,
-        created_by_user_id=session.created_by_user_id,
-        transcript_length=len(transcript),
-        created_at=session.created_at,
-        has_ai_suggestions=has_suggestions,
-        latest_version_id=latest_version.id if latest_version else None,
-        latest_version_status=latest_version.status if latest_version else None,
-    )
+    return SessionResponse.model_validate(session)
 
 
 @router.get(
@@ -264,7 +228,7 @@ async def get_session_transcript(
             detail=f"Session {session_id} not found",
         )
 
-    transcript = decrypt_data(session.transcript_encrypted)
+    transcript = await DataKeyService(db).decrypt_transcript(session)
 
     return {"transcript": transcript}
 
@@ -278,14 +242,19 @@ async def get_session_transcript(
 async def generate_ai_suggestions(
     session_id: int,
     request: GenerateRequest,
+    http_request: Request,
     db: DbSession,
     current_user: ClinicianOrAdmin,
 ) -> GenerateResponse:
     """Generate AI suggestions for a session.
     
+    The model call is cancelled if the client disconnects, so abandoned
+    requests do not keep holding a concurrency slot.
+    
     Args:
         session_id: Session ID.
         request: Generation parameters.
+        http_request: Raw request, watched for client disconnects.
         db: Database session.
         current_user: Authenticated clinician or admin.
         
@@ -303,15 +272,22 @@ async def generate_ai_suggestions(
     notes_service = NotesService(db)
 
     try:
-        response = await notes_service.generate_ai_suggestions(
-            session_id=session_id,
-            user_id=current_user.id,
-            prompt_version=request.prompt_version,
-            model_name=request.model_name,
-            mode=request.mode,
-            temperature=request.temperature,
+        response = await run_until_disconnected(
+            http_request,
+            notes_service.generate_ai_suggestions(
+                session_id=session_id,
+                user_id=current_user.id,
+                prompt_version=request.prompt_version,
+                model_name=request.model_name,
+                mode=request.mode,
+                temperature=request.temperature,
+                bypass_cache=request.bypass_cache,
+            ),
         )
         return response
+    except ClientDisconnectedError:
+        # Nothing is listening any more; roll back via get_db
+        raise HTTPException(status_code=499, detail="Client closed request")
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -325,23 +301,149 @@ async def generate_ai_suggestions(
         )
 
 
+@router.post(
+    "/{session_id}/generate/stream",
+    summary="Stream AI suggestions",
+    description=(
+        "Generate AI suggestions as a Server-Sent Events stream. Emits a `meta` event, "
+        "one `section` event per completed section (soap.subjective ... safety_plan), "
+        "then `complete` with the persisted result, or `error`. "
+        "Requires clinician or admin role."
+    ),
+)
+async def stream_ai_suggestions(
+    session_id: int,
+    request: GenerateRequest,
+    db: DbSession,
+    current_user: ClinicianOrAdmin,
+    session_factory: SessionFactory,
+) -> StreamingResponse:
+    """Stream AI suggestions for a session section by section.
+    
+    The suggestion and draft version are written in their own transaction once
+    the model finishes, independent of the request's session. The request's
+    session is committed before streaming so it holds no pooled connection
+    while the stream runs.
+    
+    Args:
+        session_id: Session ID.
+        request: Generation parameters.
+        db: Database session.
+        current_user: Authenticated clinician or admin.
+        session_factory: Factory for the stream's own database session.
+        
+    Returns:
+        Event stream response.
+    """
+    # Verify session exists
+    session = await db.get(Session, session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found",
+        )
+
+    # The request's session lives until the stream ends; hand its connection
+    # back now, since the stream uses a session of its own
+    await db.commit()
+    user_id = current_user.id
+
+    async def event_stream() -> AsyncIterator[str]:
+        async with session_factory() as stream_db:
+            notes_service = NotesService(stream_db)
+            try:
+                async for event, payload in notes_service.stream_ai_suggestions(
+                    session_id=session_id,
+                    user_id=user_id,
+                    prompt_version=request.prompt_version,
+                    model_name=request.model_name,
+                    mode=request.mode,
+                    temperature=request.temperature,
+                    bypass_cache=request.bypass_cache,
+                ):
+                    if event == "complete":
+                        await stream_db.commit()
+                        payload = payload.model_dump_json()
+                    yield format_sse(event, payload)
+            except ValueError as e:
+                yield format_sse("error", {"detail": str(e)})
+            except Exception as e:
+                logger.error(f"AI generation failed: {e}")
+                yield format_sse("error", {"detail": "AI generation failed. Please try again."})
+
+    return StreamingResponse(event_stream(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
+
+@router.post(
+    "/{session_id}/generate/jobs",
+    response_model=GenerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue AI generation",
+    description=(
+        "Queue AI generation in the background and return a job immediately. "
+        "Poll /jobs/{job_id} or subscribe to /jobs/{job_id}/events for completion. "
+        "Requires clinician or admin role."
+    ),
+)
+async def queue_ai_generation(
+    session_id: int,
+    request: GenerateRequest,
+    db: DbSession,
+    current_user: ClinicianOrAdmin,
+    queue: JobQueue,
+) -> GenerationJobResponse:
+    """Queue AI generation for a session.
+    
+    Args:
+        session_id: Session ID.
+        request: Generation parameters.
+        db: Database session.
+        current_user: Authenticated clinician or admin.
+        queue: Generation job queue.
+        
+    Returns:
+        The queued job.
+    """
+    # Verify session exists
+    session = await db.get(Session, session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found",
+        )
+
+    job = await queue.submit(session_id=session_id, user_id=current_user.id, params=request)
+
+    return job_to_response(job)
+
+
 @router.get(
     "/{session_id}/suggestions",
     response_model=List[AiSuggestionResponse],
     summary="List AI suggestions",
-    description="Get all AI suggestions for a session.",
+    description=(
+        "Get AI suggestions for a session, newest first; all of them unless `limit` is "
+        f"given. Pass the `{NEXT_CURSOR_HEADER}` response header as `cursor` to get the "
+        "next page."
+    ),
 )
 async def list_session_suggestions(
     session_id: int,
+    response: Response,
     db: DbSession,
     current_user: AnyAuthUser,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> List[AiSuggestionResponse]:
     """List AI suggestions for a session.
     
     Args:
         session_id: Session ID.
+        response: Outgoing response, for the next-cursor header.
         db: Database session.
         current_user: Authenticated user.
+        limit: Maximum results.
+        cursor: Cursor from the previous page.
         
     Returns:
         List of AI suggestions.
@@ -354,12 +456,17 @@ async def list_session_suggestions(
             detail=f"Session {session_id} not found",
         )
 
-    query = (
-        select(AiSuggestion)
-        .where(AiSuggestion.session_id == session_id)
-        .order_by(AiSuggestion.created_at.desc())
-    )
+    query = select(AiSuggestion).where(AiSuggestion.session_id == session_id)
+    try:
+        query = keyset_page(query, AiSuggestion, limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     result = await db.execute(query)
-    suggestions = result.scalars().all()
+    suggestions, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return [AiSuggestionResponse.model_validate(s) for s in suggestions]
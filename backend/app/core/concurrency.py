@@ -0,0 +1,49 @@
+"""Concurrency helpers for keeping the event loop responsive."""
+
+import asyncio
+from typing import Awaitable, TypeVar
+
+from fastapi import Request
+
+from app.core.logging import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+
+class ClientDisconnectedError(Exception):
+    """Raised when the client went away before a long-running call finished."""
+
+
+async def run_until_disconnected(
+    request: Request,
+    awaitable: Awaitable[T],
+    poll_interval: float = 0.5,
+) -> T:
+    """Await a long-running call, cancelling it if the client disconnects.
+
+    Args:
+        request: Incoming request whose connection is watched.
+        awaitable: Work to run (e.g. an LLM generation).
+        poll_interval: Seconds between disconnect checks.
+
+    Returns:
+        Result of the awaitable.
+
+    Raises:
+        ClientDisconnectedError: If the client disconnected first.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                logger.info("Client disconnected, cancelled in-flight work")
+                raise ClientDisconnectedError()
+    finally:
+        if not task.done():
+            task.cancel()
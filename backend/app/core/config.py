@@ -1,7 +1,7 @@
 """Application configuration using pydantic-settings."""
 
 from functools import lru_cache
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -20,19 +20,100 @@ class Settings(BaseSettings):
     app_name: str = "clinician-copilot"
     debug: bool = False
     secret_key: str = "change-me-in-production-min-32-characters"
-    encryption_key: str = ""  # Fernet key for transcript encryption
+    encryption_key: str = ""  # Fernet key; the AES-GCM transcript key is derived from it
+
+    # Transcript encryption: segmented AES-GCM, large payloads off the event loop
+    crypto_segment_size: int = 65536  # Plaintext bytes per AES-GCM segment
+    crypto_offload_threshold_bytes: int = 262144  # Larger payloads are encrypted off the loop
+    crypto_workers: int = 2  # Threads for offloaded encryption
+
+    # Envelope encryption: per-patient data keys wrapped by a master key
+    encryption_master_keys: str = ""  # "id:key,..."; empty derives "default" from ENCRYPTION_KEY
+    encryption_active_master_key: str = ""  # Wraps new and rotated keys; defaults to the first
+    key_rotation_on_startup: bool = True  # Rewrap keys and re-seal old transcripts at startup
+    key_rotation_batch_size: int = 500  # Data keys or transcripts handled per transaction
+    key_rotation_rows_per_second: float = 1000.0  # Throttle; 0 runs unthrottled
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./clinician_copilot.db"
 
+    # Connection pool (not used for in-memory SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10  # Connections opened beyond the pool under load
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced; -1 never
+    db_pool_pre_ping: bool = True  # Test connections on checkout (PostgreSQL)
+    db_pool_saturation_threshold: float = 0.9  # /readyz fails above this share in use
+
+    # SQLite pragmas, applied to every new connection
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000  # Wait this long for a lock before "database is locked"
+    sqlite_mmap_size: int = 268435456  # Bytes of the file to memory-map; 0 disables
+
     # JWT
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     jwt_algorithm: str = "HS256"
 
+    # Authenticated user cache: role checks skip the users table on a hit
+    principal_cache_max_entries: int = 4096
+    principal_cache_ttl_seconds: float = 5.0  # Bounds staleness of edits from other processes
+
+    # Password hashing: bcrypt runs in a bounded thread pool, off the event loop
+    password_bcrypt_rounds: int = 12  # Cost factor; older hashes are upgraded on login
+    password_hash_workers: int = 2  # Concurrent hashes per worker process
+    password_hash_max_queue: int = 16  # Hashes waiting for a thread before login returns 503
+
+    # LLM backend: "gemini", or "fake" for local load testing without a key
+    llm_backend: str = "gemini"
+
+    # Fake LLM backend
+    fake_llm_latency_ms: float = 800.0  # Median latency per call
+    fake_llm_latency_distribution: str = "lognormal"  # fixed, uniform or lognormal
+    fake_llm_latency_spread: float = 0.5  # Uniform +/- fraction, or lognormal sigma
+    fake_llm_error_rate: float = 0.0  # Fraction of calls that raise
+    fake_llm_malformed_rate: float = 0.0  # Fraction of calls returning truncated JSON
+    fake_llm_seed: Optional[int] = None
+
     # Gemini
     gemini_api_key: str = ""
     gemini_model: str = "gemini-2.0-flash"
+    gemini_timeout_seconds: float = 60.0  # Per-call deadline for one model round trip
+    gemini_max_concurrency: int = 32  # Max in-flight model calls per worker
+    gemini_min_concurrency: int = 2  # Floor for the adaptive limit
+    gemini_latency_target_seconds: float = 30.0  # Slower calls shrink the limit
+    gemini_breaker_failure_rate: float = 0.5  # Failure fraction that opens the circuit
+    gemini_breaker_window: int = 20  # Recent calls considered by the breaker
+    gemini_breaker_min_calls: int = 10  # Calls needed before the circuit can open
+    gemini_breaker_reset_seconds: float = 30.0  # Time open before a probe call
+
+    # Generation cache
+    generation_cache_enabled: bool = True
+    generation_cache_max_entries: int = 512
+    generation_cache_ttl_seconds: int = 86400
+
+    # Background generation jobs
+    generation_job_workers: int = 4
+    generation_job_lease_seconds: float = 60.0  # Re-queue running jobs silent this long
+
+    # Long transcripts (map-reduce over speaker-turn chunks)
+    transcript_chunk_threshold_chars: int = 50000  # Longer transcripts are chunked
+    transcript_chunk_size_chars: int = 12000
+    transcript_chunk_overlap_chars: int = 1000
+
+    # Audit write-behind: audit rows go to a spool table in the request's
+    # transaction and are chained into audit_logs in bulk
+    audit_write_behind: bool = False
+    audit_spool_drain_seconds: float = 1.0
+    audit_spool_batch_size: int = 1000  # Rows moved per drain transaction
+
+    # Audit hash chain verification
+    audit_checkpoint_interval: int = 1000  # Verified rows per Merkle checkpoint
+    audit_verify_batch_size: int = 5000  # Rows fetched per query while verifying
+
+    # Audit export: rows per chunk read from the cursor and written to the response
+    audit_export_chunk_size: int = 5000
 
     # CORS
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
@@ -0,0 +1,314 @@
+"""Segmented AES-GCM encryption for transcripts.
+
+Fernet pads, encrypts, MACs and then base64-encodes the whole payload, so a
+10 MB transcript passes through several full-size copies on the event loop.
+This format encrypts fixed-size segments independently with AES-256-GCM, so
+data can be sealed and opened as a stream holding one segment at a time.
+``seal_text`` and ``open_text`` do that for transcripts, encoding and
+decoding a segment at a time, so the only full-size copies are the
+ciphertext and the text themselves.
+
+Layout::
+
+    header   MAGIC (4) | segment size (4, big-endian) | salt (16) | nonce prefix (7)
+    segment  AES-GCM(plaintext[i * size:(i + 1) * size]) with a 16-byte tag
+
+As in Tink's streaming AEAD, each payload is encrypted under its own key,
+derived with HKDF-SHA256 from the caller's key and the random salt. The
+7-byte random nonce prefix therefore never has to be unique across all the
+payloads sealed under one key. Segment nonces are the prefix, the segment
+index (4 bytes) and a last-segment flag (1 byte), and every segment
+authenticates the header. A segment that is reordered, dropped, truncated
+or moved to another payload fails its tag. Fernet tokens are urlsafe base64
+text and never start with the NUL byte in ``MAGIC``, which is how
+``is_sealed`` tells the formats apart.
+"""
+
+import asyncio
+import codecs
+import itertools
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+Chunk = bytes | bytearray | memoryview
+
+MAGIC = b"\x00CG1"
+SALT_SIZE = 16
+NONCE_PREFIX_SIZE = 7
+TAG_SIZE = 16
+SALT_OFFSET = len(MAGIC) + 4
+PREFIX_OFFSET = SALT_OFFSET + SALT_SIZE
+HEADER_SIZE = PREFIX_OFFSET + NONCE_PREFIX_SIZE
+MAX_SEGMENTS = 2**32
+
+
+def is_sealed(token: bytes) -> bool:
+    """Whether a token is in this format rather than a Fernet token."""
+    return token[: len(MAGIC)] == MAGIC
+
+
+def _nonce(prefix: bytes, index: int, last: bool) -> bytes:
+    if index >= MAX_SEGMENTS:
+        raise ValueError("Payload has too many segments")
+    return prefix + struct.pack(">IB", index, last)
+
+
+def _header(segment_size: int) -> bytes:
+    return MAGIC + struct.pack(">I", segment_size) + os.urandom(SALT_SIZE + NONCE_PREFIX_SIZE)
+
+
+def _parse_header(header: bytes) -> tuple[int, bytes]:
+    """Segment size and nonce prefix from a header."""
+    if len(header) < HEADER_SIZE or not is_sealed(header):
+        raise InvalidToken("Not a sealed payload")
+    (segment_size,) = struct.unpack(">I", header[len(MAGIC) : SALT_OFFSET])
+    if segment_size == 0:
+        raise InvalidToken("Invalid segment size")
+    return segment_size, header[PREFIX_OFFSET:HEADER_SIZE]
+
+
+def _payload_aead(key: bytes, header: bytes) -> AESGCM:
+    """AES-GCM under the payload's own key, derived from ``key`` and the header salt."""
+    payload_key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=header[SALT_OFFSET:PREFIX_OFFSET],
+        info=header[:SALT_OFFSET],
+    ).derive(key)
+    return AESGCM(payload_key)
+
+
+def _segment_count(size: int, segment_size: int) -> int:
+    """Segments needed for ``size`` bytes; an empty payload still has one."""
+    return max(1, -(-size // segment_size))
+
+
+def seal(key: bytes, data: Chunk, segment_size: Optional[int] = None) -> bytearray:
+    """Encrypt a payload in one call.
+
+    Args:
+        key: 32-byte AES key.
+        data: Plaintext.
+        segment_size: Plaintext bytes per segment.
+
+    Returns:
+        Sealed payload.
+    """
+    segment_size = segment_size or settings.crypto_segment_size
+    header = _header(segment_size)
+    aead = _payload_aead(key, header)
+    prefix = header[PREFIX_OFFSET:]
+    count = _segment_count(len(data), segment_size)
+
+    output = bytearray(HEADER_SIZE + len(data) + count * TAG_SIZE)
+    output[:HEADER_SIZE] = header
+    view = memoryview(data)
+    position = HEADER_SIZE
+    for index in range(count):
+        chunk = view[index * segment_size : (index + 1) * segment_size]
+        sealed = aead.encrypt(_nonce(prefix, index, index == count - 1), chunk, header)
+        output[position : position + len(sealed)] = sealed
+        position += len(sealed)
+    return output
+
+
+def open_sealed(key: bytes, token: bytes) -> bytearray:
+    """Decrypt a payload sealed by ``seal``.
+
+    Args:
+        key: 32-byte AES key.
+        token: Sealed payload.
+
+    Returns:
+        Plaintext.
+
+    Raises:
+        InvalidToken: If the payload is malformed or fails authentication.
+    """
+    segment_size, prefix = _parse_header(token)
+    header = bytes(token[:HEADER_SIZE])
+    body = memoryview(token)[HEADER_SIZE:]
+    stride = segment_size + TAG_SIZE
+    count = _segment_count(len(body), stride)
+    if len(body) - (count - 1) * stride < TAG_SIZE:
+        raise InvalidToken("Sealed payload is truncated")
+
+    aead = _payload_aead(key, header)
+    output = bytearray(len(body) - count * TAG_SIZE)
+    position = 0
+    for index in range(count):
+        segment = body[index * stride : (index + 1) * stride]
+        try:
+            plain = aead.decrypt(_nonce(prefix, index, index == count - 1), segment, header)
+        except InvalidTag:
+            raise InvalidToken(f"Segment {index} failed authentication") from None
+        output[position : position + len(plain)] = plain
+        position += len(plain)
+    return output
+
+
+def seal_stream(
+    key: bytes, chunks: Iterable[Chunk], segment_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Encrypt a stream of plaintext chunks of any size.
+
+    Produces the same layout as ``seal``; at most one segment is buffered.
+
+    Args:
+        key: 32-byte AES key.
+        chunks: Plaintext chunks.
+        segment_size: Plaintext bytes per segment.
+
+    Yields:
+        The header, then one sealed segment at a time.
+    """
+    segment_size = segment_size or settings.crypto_segment_size
+    header = _header(segment_size)
+    aead = _payload_aead(key, header)
+    prefix = header[PREFIX_OFFSET:]
+    yield header
+
+    buffer = bytearray()
+    index = 0
+    for chunk in chunks:
+        buffer += chunk
+        # Hold back a full segment until more data shows it is not the last
+        while len(buffer) > segment_size:
+            yield aead.encrypt(
+                _nonce(prefix, index, False), bytes(buffer[:segment_size]), header
+            )
+            del buffer[:segment_size]
+            index += 1
+    yield aead.encrypt(_nonce(prefix, index, True), bytes(buffer), header)
+
+
+def open_stream(key: bytes, chunks: Iterable[Chunk]) -> Iterator[bytes]:
+    """Decrypt a stream of sealed chunks of any size.
+
+    Each segment is authenticated before its plaintext is yielded. A stream
+    that ends early raises instead of silently yielding a prefix.
+
+    Args:
+        key: 32-byte AES key.
+        chunks: Sealed payload, split anywhere.
+
+    Yields:
+        Plaintext, one segment at a time.
+
+    Raises:
+        InvalidToken: If the payload is malformed, truncated or tampered with.
+    """
+    buffer = bytearray()
+    chunks = iter(chunks)
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= HEADER_SIZE:
+            break
+    header = bytes(buffer[:HEADER_SIZE])
+    segment_size, prefix = _parse_header(header)
+    del buffer[:HEADER_SIZE]
+    stride = segment_size + TAG_SIZE
+
+    aead = _payload_aead(key, header)
+    index = 0
+
+    def decrypt(segment: bytes, last: bool) -> bytes:
+        try:
+            return aead.decrypt(_nonce(prefix, index, last), segment, header)
+        except InvalidTag:
+            raise InvalidToken(f"Segment {index} failed authentication") from None
+
+    # The header read may already have buffered whole segments
+    for chunk in itertools.chain((b"",), chunks):
+        buffer += chunk
+        while len(buffer) > stride:
+            yield decrypt(bytes(buffer[:stride]), False)
+            del buffer[:stride]
+            index += 1
+    if len(buffer) < TAG_SIZE:
+        raise InvalidToken("Sealed payload is truncated")
+    yield decrypt(bytes(buffer), True)
+
+
+def _pieces(data: Chunk, size: int) -> Iterator[memoryview]:
+    """Views of ``data`` in ``size``-byte pieces, without copying."""
+    view = memoryview(data)
+    for start in range(0, len(view), size):
+        yield view[start : start + size]
+
+
+def seal_text(key: bytes, text: str, segment_size: Optional[int] = None) -> bytes:
+    """Encode and seal text one segment at a time.
+
+    Args:
+        key: 32-byte AES key.
+        text: Plain text.
+        segment_size: Plaintext bytes per segment.
+
+    Returns:
+        Sealed UTF-8 payload.
+    """
+    segment_size = segment_size or settings.crypto_segment_size
+    encoded = (
+        text[start : start + segment_size].encode()
+        for start in range(0, len(text), segment_size)
+    )
+    return b"".join(seal_stream(key, encoded, segment_size))
+
+
+def open_text(key: bytes, token: bytes) -> str:
+    """Open and decode a payload from ``seal_text`` one segment at a time.
+
+    Raises:
+        InvalidToken: If the payload is malformed or fails authentication.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    plain = open_stream(key, _pieces(token, settings.crypto_segment_size))
+    text = "".join(decoder.decode(segment) for segment in plain)
+    return text + decoder.decode(b"", final=True)
+
+
+_crypto_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_crypto_executor() -> ThreadPoolExecutor:
+    """Get the thread pool for large encryption jobs."""
+    global _crypto_executor
+    if _crypto_executor is None:
+        _crypto_executor = ThreadPoolExecutor(
+            max_workers=settings.crypto_workers, thread_name_prefix="crypto"
+        )
+    return _crypto_executor
+
+
+async def run_crypto(size: int, func: Callable[..., T], *args: object) -> T:
+    """Run a crypto call inline if small, otherwise on the crypto pool.
+
+    ``cryptography`` releases the GIL while OpenSSL works, so large payloads
+    leave the event loop free. Small ones are cheaper than the thread hop.
+
+    Args:
+        size: Payload size in bytes.
+        func: Function to call.
+        *args: Its arguments.
+
+    Returns:
+        The function's result.
+    """
+    if size < settings.crypto_offload_threshold_bytes:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(get_crypto_executor(), func, *args)
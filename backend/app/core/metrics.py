@@ -1,6 +1,6 @@
 """Prometheus metrics for observability."""
 
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
 # Request metrics
 REQUEST_COUNT = Counter(
@@ -22,6 +22,36 @@ ERROR_COUNT = Counter(
     ["method", "endpoint", "error_type"],
 )
 
+# Database pool metrics
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0],
+)
+
+# Password hashing pool metrics
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password hashes waiting for a hashing thread",
+)
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Password hashes running in the hashing pool",
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time from submitting a password hash to its result, including queueing",
+    ["operation"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+
+PASSWORD_HASH_REJECTIONS = Counter(
+    "password_hash_rejections_total",
+    "Password hashes rejected because the hashing pool was full",
+)
+
 # Gemini LLM metrics
 GEMINI_REQUEST_COUNT = Counter(
     "gemini_requests_total",
@@ -42,6 +72,36 @@ GEMINI_FAILURES = Counter(
     ["model", "error_type"],
 )
 
+GEMINI_CIRCUIT_STATE = Gauge(
+    "gemini_circuit_state",
+    "Gemini circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["model"],
+)
+
+GEMINI_CIRCUIT_REJECTIONS = Counter(
+    "gemini_circuit_rejections_total",
+    "Gemini calls rejected while the circuit was open",
+    ["model"],
+)
+
+GEMINI_CONCURRENCY_LIMIT = Gauge(
+    "gemini_concurrency_limit",
+    "Current adaptive limit on in-flight Gemini calls",
+    ["model"],
+)
+
+GEMINI_IN_FLIGHT = Gauge(
+    "gemini_in_flight",
+    "Gemini calls currently in flight",
+    ["model"],
+)
+
+LLM_JSON_REPAIRS = Counter(
+    "llm_json_repairs_total",
+    "Model outputs parsed, by the repair tier that succeeded",
+    ["tier"],
+)
+
 # AI Generation metrics
 AI_GENERATION_COUNT = Counter(
     "ai_generations_total",
@@ -49,6 +109,81 @@ AI_GENERATION_COUNT = Counter(
     ["status", "safety_mode"],
 )
 
+# Generation cache metrics
+GENERATION_CACHE_HITS = Counter(
+    "generation_cache_hits_total",
+    "AI generations served from cache",
+    ["tier"],
+)
+
+GENERATION_CACHE_MISSES = Counter(
+    "generation_cache_misses_total",
+    "AI generations not found in cache",
+)
+
+GENERATION_CACHE_EVICTIONS = Counter(
+    "generation_cache_evictions_total",
+    "Generation cache entries evicted from memory",
+    ["reason"],
+)
+
+# Principal cache metrics
+PRINCIPAL_CACHE_LOOKUPS = Counter(
+    "principal_cache_lookups_total",
+    "Authenticated user lookups by cache result",
+    ["result"],
+)
+
+PRINCIPAL_CACHE_HIT_RATIO = Gauge(
+    "principal_cache_hit_ratio",
+    "Share of principal lookups served from the cache since startup",
+)
+
+# Key rotation metrics
+KEY_ROTATION_REWRAPPED = Counter(
+    "key_rotation_rewrapped_total",
+    "Patient data keys rewrapped with the active master key",
+)
+
+KEY_ROTATION_RESEALED = Counter(
+    "key_rotation_resealed_total",
+    "Transcripts without a data key re-sealed under their patient's data key",
+)
+
+KEY_ROTATION_FAILURES = Counter(
+    "key_rotation_failures_total",
+    "Patient data keys or transcripts that could not be decrypted for rotation",
+)
+
+KEY_ROTATION_PENDING = Gauge(
+    "key_rotation_pending",
+    "Patient data keys still wrapped by a master key other than the active one",
+)
+
+# Generation job metrics
+GENERATION_JOBS = Counter(
+    "generation_jobs_total",
+    "Background generation jobs by final status",
+    ["status"],
+)
+
+GENERATION_JOB_QUEUE_DEPTH = Gauge(
+    "generation_job_queue_depth",
+    "Generation jobs waiting for a worker",
+)
+
+# Audit write-behind metrics
+AUDIT_SPOOL_DRAINED = Counter(
+    "audit_spool_drained_total",
+    "Audit rows drained from the write-behind spool to the database",
+)
+
+TRANSCRIPT_CHUNKS = Histogram(
+    "transcript_chunks",
+    "Chunks per long transcript generated with map-reduce",
+    buckets=[2, 3, 4, 6, 8, 12, 16, 24, 32],
+)
+
 INJECTION_DETECTED_COUNT = Counter(
     "injection_detected_total",
     "Total prompt injection attempts detected",
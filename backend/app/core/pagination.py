@@ -0,0 +1,111 @@
+"""Keyset (cursor) pagination on ``(created_at, id)``.
+
+Lists are ordered newest first. A cursor encodes the last row of a page, and
+the next page starts strictly after it, so deep pages cost the same as the
+first one instead of scanning and discarding ``offset`` rows.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, TypeVar, TypeVarTuple, Unpack
+
+from sqlalchemy import Select, and_, func, or_, select
+
+T = TypeVar("T")
+Ts = TypeVarTuple("Ts")
+
+# Carries the next cursor for endpoints whose body is a bare list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Build an opaque cursor pointing just after a row.
+
+    Args:
+        created_at: Row creation time.
+        row_id: Row primary key.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor from ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def keyset_page(
+    query: Select[Unpack[Ts]],
+    model: Any,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Select[Unpack[Ts]]:
+    """Order a query newest first and restrict it to one page.
+
+    One extra row is fetched so ``split_page`` can tell whether another page
+    exists. ``offset`` is kept for older clients and cannot be combined with a
+    cursor.
+
+    Args:
+        query: Filtered select over ``model``.
+        model: Mapped class with ``created_at`` and ``id`` columns.
+        limit: Page size, or None for every remaining row.
+        cursor: Cursor from the previous page.
+        offset: Rows to skip (legacy paging).
+
+    Returns:
+        The paged query.
+
+    Raises:
+        ValueError: If the cursor is malformed or combined with an offset.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+    if cursor is None:
+        return query.offset(offset)
+    if offset:
+        raise ValueError("Use either a cursor or an offset, not both")
+
+    created_at, row_id = decode_cursor(cursor)
+    # Compare against the stored timestamp when the row still exists: its
+    # precision (and, on SQLite, its text form) can differ from the decoded one
+    anchor = func.coalesce(
+        select(model.created_at).where(model.id == row_id).scalar_subquery(), created_at
+    )
+    return query.where(
+        or_(model.created_at < anchor, and_(model.created_at == anchor, model.id < row_id))
+    )
+
+
+def split_page(rows: Sequence[T], limit: Optional[int]) -> tuple[list[T], Optional[str]]:
+    """Trim the extra row fetched by ``keyset_page`` and build the next cursor.
+
+    Args:
+        rows: Query results (entities or rows with ``created_at`` and ``id``).
+        limit: Page size, or None when the query was not limited.
+
+    Returns:
+        Tuple of (page rows, cursor for the next page or None on the last page).
+    """
+    if limit is None:
+        return list(rows), None
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    last: Any = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
@@ -1,20 +1,37 @@
 """Security utilities: password hashing, JWT, encryption."""
 
+import base64
 import hashlib
+import os
 import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
-from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.core.crypto import is_sealed, open_text, run_crypto
 
 settings = get_settings()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+TRANSCRIPT_KEY_INFO = b"clinician-copilot transcript aes-gcm v1"
+MASTER_KEY_INFO = b"clinician-copilot master key v1"
+DEFAULT_MASTER_KEY_ID = "default"
+
+# Password hashing; hashes with a different cost count as needing an update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.password_bcrypt_rounds,
+    bcrypt__min_rounds=settings.password_bcrypt_rounds,
+    bcrypt__max_rounds=settings.password_bcrypt_rounds,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,6 +39,17 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Verify a password and rehash it if the stored hash uses other settings.
+
+    Returns:
+        (valid, new_hash); ``new_hash`` is None unless the hash should be replaced.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
@@ -59,16 +87,17 @@ def generate_encryption_key() -> str:
     return Fernet.generate_key().decode()
 
 
-# Cache the Fernet instance
-_fernet_instance: Optional[Fernet] = None
+# Cache the Fernet instance with its raw key, and the AES key derived from it
+_fernet_state: Optional[tuple[Fernet, bytes]] = None
+_transcript_key: Optional[bytes] = None
 
 
-def get_fernet() -> Fernet:
-    """Get Fernet instance for encryption/decryption."""
-    global _fernet_instance
+def _load_fernet() -> tuple[Fernet, bytes]:
+    """Get the Fernet instance and the raw key it was built from."""
+    global _fernet_state
     
-    if _fernet_instance is not None:
-        return _fernet_instance
+    if _fernet_state is not None:
+        return _fernet_state
     
     key = settings.encryption_key
     if not key:
@@ -77,26 +106,134 @@ def get_fernet() -> Fernet:
         
     # Ensure the key is valid Fernet format
     try:
-        _fernet_instance = Fernet(key.encode())
+        fernet = Fernet(key.encode())
     except Exception:
         # If key is invalid, generate a new one (development only)
-        _fernet_instance = Fernet(Fernet.generate_key())
+        key = Fernet.generate_key().decode()
+        fernet = Fernet(key.encode())
+
+    _fernet_state = (fernet, base64.urlsafe_b64decode(key))
+    return _fernet_state
+
+
+def get_fernet() -> Fernet:
+    """Get Fernet instance for encryption/decryption."""
+    return _load_fernet()[0]
+
+
+def _derive_key(info: bytes) -> bytes:
+    """Derive a 32-byte key for one purpose from the Fernet key."""
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=info).derive(
+        _load_fernet()[1]
+    )
+
+
+def get_transcript_key() -> bytes:
+    """Get the AES-256 key for sealed transcripts, derived from the Fernet key."""
+    global _transcript_key
+    if _transcript_key is None:
+        _transcript_key = _derive_key(TRANSCRIPT_KEY_INFO)
+    return _transcript_key
+
+
+_master_keys: Optional[dict[str, bytes]] = None
+
+
+def get_master_keys() -> dict[str, bytes]:
+    """Get the master keys that wrap patient data keys, by key id.
+    
+    Read from ``ENCRYPTION_MASTER_KEYS`` ("id:key,..." with urlsafe base64
+    32-byte keys). When that is empty a single ``default`` key is derived
+    from ``ENCRYPTION_KEY``.
+    
+    Raises:
+        ValueError: If an entry is malformed.
+    """
+    global _master_keys
+    if _master_keys is not None:
+        return _master_keys
+
+    keys: dict[str, bytes] = {}
+    for entry in settings.encryption_master_keys.split(","):
+        if not entry.strip():
+            continue
+        key_id, _, encoded = entry.strip().partition(":")
+        try:
+            key = base64.urlsafe_b64decode(encoded)
+        except ValueError:
+            key = b""
+        if not key_id or len(key) != 32:
+            raise ValueError(f"Invalid master key entry {key_id!r}")
+        keys[key_id] = key
+    if not keys:
+        keys[DEFAULT_MASTER_KEY_ID] = _derive_key(MASTER_KEY_INFO)
+
+    _master_keys = keys
+    return _master_keys
+
+
+def get_active_master_key_id() -> str:
+    """Id of the master key that wraps new and rotated data keys.
+    
+    Raises:
+        ValueError: If ``ENCRYPTION_ACTIVE_MASTER_KEY`` names an unknown key.
+    """
+    keys = get_master_keys()
+    active = settings.encryption_active_master_key or next(iter(keys))
+    if active not in keys:
+        raise ValueError(f"Active master key {active!r} is not configured")
+    return active
+
+
+def wrap_data_key(data_key: bytes, context: bytes) -> tuple[str, bytes]:
+    """Wrap a data key with the active master key.
     
-    return _fernet_instance
+    Args:
+        data_key: Plain data key.
+        context: Owner binding (e.g. the patient), authenticated with the key.
+        
+    Returns:
+        (master_key_id, nonce + sealed key).
+    """
+    master_key_id = get_active_master_key_id()
+    nonce = os.urandom(12)
+    sealed = AESGCM(get_master_keys()[master_key_id]).encrypt(nonce, data_key, context)
+    return master_key_id, nonce + sealed
 
 
-def encrypt_data(data: str) -> bytes:
-    """Encrypt sensitive data using Fernet."""
-    fernet = get_fernet()
-    return fernet.encrypt(data.encode())
+def unwrap_data_key(master_key_id: str, wrapped_key: bytes, context: bytes) -> bytes:
+    """Unwrap a data key from ``wrap_data_key``.
+    
+    Raises:
+        ValueError: If the master key is not configured.
+        InvalidToken: If the wrapped key or its context does not authenticate.
+    """
+    master_key = get_master_keys().get(master_key_id)
+    if master_key is None:
+        raise ValueError(f"Master key {master_key_id!r} is not configured")
+    try:
+        return AESGCM(master_key).decrypt(wrapped_key[:12], wrapped_key[12:], context)
+    except InvalidTag:
+        raise InvalidToken("Data key failed to unwrap") from None
 
 
 def decrypt_data(encrypted_data: bytes) -> str:
-    """Decrypt data using Fernet."""
+    """Decrypt a transcript stored without a data key (``transcript_key_id`` NULL).
+    
+    These are sealed with the key derived from ``ENCRYPTION_KEY``, or are
+    Fernet tokens written before that format.
+    """
+    if is_sealed(encrypted_data):
+        return open_text(get_transcript_key(), encrypted_data)
     fernet = get_fernet()
     return fernet.decrypt(encrypted_data).decode()
 
 
+async def decrypt_data_async(encrypted_data: bytes) -> str:
+    """Decrypt like ``decrypt_data``, off the event loop for large payloads."""
+    return await run_crypto(len(encrypted_data), decrypt_data, encrypted_data)
+
+
 def hash_for_audit(data: str) -> str:
     """Create a SHA-256 hash for audit logging."""
     return hashlib.sha256(data.encode()).hexdigest()
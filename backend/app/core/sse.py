@@ -0,0 +1,31 @@
+"""Server-Sent Events helpers."""
+
+import json
+from typing import Any
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Headers that stop proxies from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event.
+
+    Args:
+        event: Event name.
+        data: JSON-serializable payload, or a pre-serialized JSON string.
+
+    Returns:
+        Wire-format event terminated by a blank line.
+    """
+    payload = data if isinstance(data, str) else json.dumps(data)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def format_sse_comment(comment: str = "keep-alive") -> str:
+    """Format an SSE comment line, used as a keep-alive."""
+    return f": {comment}\n\n"
@@ -1,5 +1,5 @@
 """Database module."""
 
-from app.db.session import get_db, engine, async_session
+from app.db.session import get_db, get_session_factory, engine, async_session
 
-__all__ = ["get_db", "engine", "async_session"]
+__all__ = ["get_db", "get_session_factory", "engine", "async_session"]
@@ -13,10 +13,13 @@ from sqlalchemy import (
     LargeBinary,
     String,
     Text,
+    desc,
     func,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from app.db.types import CompressedText
+
 
 class Base(DeclarativeBase):
     """Base class for all models."""
@@ -39,6 +42,15 @@ class NoteStatus(str, Enum):
     FINAL = "final"
 
 
+class JobStatus(str, Enum):
+    """Status of a background generation job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
 class User(Base):
     """User model for authentication and authorization."""
 
@@ -79,7 +91,29 @@ class Patient(Base):
     # Relationships
     sessions: Mapped[List["Session"]] = relationship("Session", back_populates="patient")
 
-    __table_args__ = (Index("ix_patients_name", "name"),)
+    __table_args__ = (
+        Index("ix_patients_name", "name"),
+        Index("ix_patients_created_id", "created_at", "id"),
+    )
+
+
+class PatientDataKey(Base):
+    """Per-patient transcript key, stored wrapped by a master key."""
+
+    __tablename__ = "patient_data_keys"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    patient_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    master_key_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    wrapped_key: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # Nonce + sealed key
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    rotated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (Index("ix_patient_data_keys_master_key_id", "master_key_id", "id"),)
 
 
 class Session(Base):
@@ -96,10 +130,23 @@ class Session(Base):
     )
     transcript_encrypted: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     transcript_hash: Mapped[str] = mapped_column(String(64), nullable=False)  # For audit
+    # Patient data key sealing the transcript; NULL for the global key (or Fernet)
+    # until KeyRotationJob re-seals it
+    transcript_key_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("patient_data_keys.id"), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
 
+    # Denormalized summary, maintained by NotesService so reads never decrypt or join
+    transcript_length: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latest_version_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    latest_version_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    has_ai_suggestions: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Last allocated NoteVersion.version_number
+    version_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
     # Relationships
     patient: Mapped["Patient"] = relationship("Patient", back_populates="sessions")
     created_by: Mapped["User"] = relationship(
@@ -115,6 +162,7 @@ class Session(Base):
     __table_args__ = (
         Index("ix_sessions_patient_id", "patient_id"),
         Index("ix_sessions_created_at", "created_at"),
+        Index("ix_sessions_patient_created", "patient_id", "created_at"),
     )
 
 
@@ -133,6 +181,7 @@ class AiSuggestion(Base):
     injection_flag: Mapped[bool] = mapped_column(Boolean, default=False)
     safety_mode: Mapped[bool] = mapped_column(Boolean, default=False)
     gemini_latency_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    cache_key: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # Content key
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -140,7 +189,11 @@ class AiSuggestion(Base):
     # Relationships
     session: Mapped["Session"] = relationship("Session", back_populates="ai_suggestions")
 
-    __table_args__ = (Index("ix_ai_suggestions_session_id", "session_id"),)
+    __table_args__ = (
+        Index("ix_ai_suggestions_session_id", "session_id"),
+        Index("ix_ai_suggestions_cache_key", "cache_key"),
+        Index("ix_ai_suggestions_session_created", "session_id", "created_at", "id"),
+    )
 
 
 class NoteVersion(Base):
@@ -156,10 +209,11 @@ class NoteVersion(Base):
     status: Mapped[str] = mapped_column(
         String(20), nullable=False, default=NoteStatus.DRAFT.value
     )
-    soap_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    dx_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Diagnosis
-    meds_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Medication education
-    safety_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Safety plan
+    # Note bodies, stored compressed
+    soap_json: Mapped[Optional[str]] = mapped_column(CompressedText, nullable=True)
+    dx_json: Mapped[Optional[str]] = mapped_column(CompressedText, nullable=True)  # Diagnosis
+    meds_json: Mapped[Optional[str]] = mapped_column(CompressedText, nullable=True)  # Medications
+    safety_json: Mapped[Optional[str]] = mapped_column(CompressedText, nullable=True)  # Safety plan
     ai_suggestion_id: Mapped[Optional[int]] = mapped_column(
         Integer, ForeignKey("ai_suggestions.id"), nullable=True
     )
@@ -177,6 +231,47 @@ class NoteVersion(Base):
     __table_args__ = (
         Index("ix_note_versions_session_id", "session_id"),
         Index("ix_note_versions_status", "status"),
+        Index(
+            "ix_note_versions_session_version",
+            "session_id",
+            desc("version_number"),
+            unique=True,
+        ),
+        Index("ix_note_versions_session_created", "session_id", "created_at", "id"),
+    )
+
+
+class GenerationJob(Base):
+    """Queued AI generation, run by the in-process worker pool."""
+
+    __tablename__ = "generation_jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    session_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False
+    )
+    requested_by_user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), nullable=False
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=JobStatus.QUEUED.value
+    )
+    params_json: Mapped[str] = mapped_column(Text, nullable=False)  # GenerateRequest
+    result_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # GenerateResponse
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Renewed by the worker running the job; a stale value means it died
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        Index("ix_generation_jobs_status", "status"),
+        Index("ix_generation_jobs_session_id", "session_id"),
     )
 
 
@@ -198,6 +293,9 @@ class AuditLog(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Position in the hash chain and SHA-256 over the previous row's hash and this row
+    chain_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    chain_hash: Mapped[str] = mapped_column(String(64), nullable=False)
 
     # Relationships
     actor: Mapped["User"] = relationship("User", back_populates="audit_logs")
@@ -206,4 +304,62 @@ class AuditLog(Base):
         Index("ix_audit_logs_entity", "entity_type", "entity_id"),
         Index("ix_audit_logs_actor", "actor_user_id"),
         Index("ix_audit_logs_created_at", "created_at"),
+        Index("ix_audit_logs_created_id", "created_at", "id"),
+        Index("ix_audit_logs_chain_seq", "chain_seq", unique=True),
+    )
+
+
+class AuditLogSpool(Base):
+    """Audit row written with its transaction, waiting to be chained into audit_logs."""
+
+    __tablename__ = "audit_log_spool"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    actor_user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    action: Mapped[str] = mapped_column(String(100), nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    before_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    after_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    metadata_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Set by the drain transaction that is moving the row
+    claimed_by: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+
+
+class AuditLogCount(Base):
+    """Running audit log totals per (entity_type, action, actor) for cheap list totals."""
+
+    __tablename__ = "audit_log_counts"
+
+    entity_type: Mapped[str] = mapped_column(String(100), primary_key=True)
+    action: Mapped[str] = mapped_column(String(100), primary_key=True)
+    actor_user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class AuditChainHead(Base):
+    """Single row holding the audit hash chain's tip; writers lock it to append."""
+
+    __tablename__ = "audit_chain_head"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+
+class AuditCheckpoint(Base):
+    """Verified audit chain position with the Merkle root of the rows since the previous one."""
+
+    __tablename__ = "audit_checkpoints"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    last_seq: Mapped[int] = mapped_column(Integer, nullable=False, unique=True)
+    chain_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    merkle_root: Mapped[str] = mapped_column(String(64), nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
     )
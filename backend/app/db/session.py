@@ -1,19 +1,101 @@
 """Database session management."""
 
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Connection, Engine, event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import get_settings
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
 
 settings = get_settings()
 
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Apply the configured pragmas to a new SQLite connection.
+
+    WAL lets readers run alongside the single writer, and busy_timeout makes a
+    writer wait for the lock instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.close()
+
+
+def create_engine(database_url: str) -> AsyncEngine:
+    """Create an async engine tuned from settings.
+
+    Args:
+        database_url: Database URL.
+
+    Returns:
+        AsyncEngine: Engine with a timed, sized pool (and SQLite pragmas).
+    """
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    options: dict[str, Any] = {}
+    # In-memory SQLite keeps its single shared connection
+    if not (is_sqlite and url.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping and not is_sqlite,
+        )
+
+    new_engine = create_async_engine(database_url, echo=settings.debug, future=True, **options)
+    if is_sqlite:
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return new_engine
+
+
+def pool_status(bind: Engine | Connection) -> dict[str, Any]:
+    """Report how much of an engine's connection pool is in use.
+
+    Args:
+        bind: Sync engine or connection (``AsyncSession.get_bind()`` returns either).
+
+    Returns:
+        Pool counters; ``saturation`` is None when the pool is unbounded.
+    """
+    pool = bind.engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"checked_out": None, "capacity": None, "saturation": None}
+
+    checked_out = pool.checkedout()
+    capacity = pool.size() + pool._max_overflow if pool._max_overflow >= 0 else None
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else None,
+    }
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-)
+engine = create_engine(settings.database_url)
 
 # Create async session factory
 async_session = async_sessionmaker(
@@ -25,6 +107,18 @@ async_session = async_sessionmaker(
 )
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Dependency that provides the session factory.
+    
+    For work that must outlive or stay independent of the request's own
+    transaction, such as persisting at the end of a streamed response.
+    
+    Returns:
+        async_sessionmaker: Session factory.
+    """
+    return async_session
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency that provides a database session.
     
@@ -0,0 +1,29 @@
+"""Custom column types."""
+
+import zlib
+from typing import Any, Optional
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+
+class CompressedText(TypeDecorator[str]):
+    """Text stored zlib-compressed as bytes; reads and writes plain ``str``.
+
+    Note bodies are repetitive JSON, so this cuts their size several times
+    over. Compressed values cannot be filtered or compared in SQL.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect: Dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return zlib.compress(value.encode(), 6)
+
+    def process_result_value(self, value: Optional[Any], dialect: Dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return zlib.decompress(value).decode()
@@ -13,6 +13,11 @@ from app.api import api_router
 from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY, ERROR_COUNT
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.services.audit_spool import get_audit_spool
+from app.services.generation_jobs import get_generation_job_queue
+from app.services.key_rotation import get_key_rotation_job
+from app.services.password_hashing import get_password_hasher
 
 settings = get_settings()
 logger = get_logger()
@@ -26,9 +31,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     # Startup
     logger.info("Starting Clinician Copilot API")
+    job_queue = get_generation_job_queue()
+    await job_queue.start()
+    audit_spool = get_audit_spool() if settings.audit_write_behind else None
+    if audit_spool:
+        await audit_spool.start()
+    key_rotation = get_key_rotation_job() if settings.key_rotation_on_startup else None
+    if key_rotation:
+        await key_rotation.start()
     yield
     # Shutdown
     logger.info("Shutting down Clinician Copilot API")
+    await job_queue.stop()
+    if audit_spool:
+        await audit_spool.stop()
+    if key_rotation:
+        await key_rotation.stop()
+    get_password_hasher().shutdown()
 
 
 app = FastAPI(
@@ -48,7 +67,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["X-RateLimit-Remaining"],
+    expose_headers=["X-RateLimit-Remaining", NEXT_CURSOR_HEADER],
 )
 
 
@@ -37,6 +37,7 @@ from app.schemas.audit import (
     AuditLogResponse,
     AuditLogFilter,
 )
+from app.schemas.jobs import GenerationJobResponse
 
 __all__ = [
     # Auth
@@ -70,4 +71,6 @@ __all__ = [
     # Audit
     "AuditLogResponse",
     "AuditLogFilter",
+    # Jobs
+    "GenerationJobResponse",
 ]
@@ -89,8 +89,15 @@ class GenerateRequest(BaseModel):
 
     prompt_version: str = Field(default="v1", pattern="^v[0-9]+$")
     model_name: Optional[str] = Field(None, description="Override default model")
-    mode: str = Field(default="full", pattern="^(full|safe)$")
+    mode: str = Field(
+        default="full",
+        pattern="^(full|safe|parallel)$",
+        description="'parallel' generates each top-level section in its own concurrent call",
+    )
     temperature: float = Field(default=0.0, ge=0.0, le=1.0)
+    bypass_cache: bool = Field(
+        default=False, description="Always call the model, even for a cached input"
+    )
 
 
 class GenerateResponse(BaseModel):
@@ -106,6 +113,7 @@ class GenerateResponse(BaseModel):
     medications: MedicationEducation
     safety_plan: SafetyPlan
     gemini_latency_ms: int
+    cached: bool = False
 
 
 class AiSuggestionResponse(BaseModel):
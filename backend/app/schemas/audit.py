@@ -26,7 +26,22 @@ class AuditLogListResponse(BaseModel):
     """Schema for listing audit logs."""
 
     logs: List[AuditLogResponse]
-    total: int
+    total: Optional[int] = None  # Omitted with total_mode=none
+    has_more: bool = False
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
+
+
+class AuditChainVerifyResponse(BaseModel):
+    """Schema for an audit hash chain verification result."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    ok: bool
+    verified_rows: int
+    last_seq: int
+    checkpoints_created: int
+    first_bad_seq: Optional[int] = None  # First row where the chain breaks
+    error: Optional[str] = None
 
 
 class AuditLogFilter(BaseModel):
@@ -40,3 +55,4 @@ class AuditLogFilter(BaseModel):
     end_date: Optional[datetime] = None
     limit: int = Field(default=100, le=1000)
     offset: int = Field(default=0, ge=0)
+    cursor: Optional[str] = None
@@ -0,0 +1,21 @@
+"""Background generation job schemas."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.schemas.ai import GenerateResponse
+
+
+class GenerationJobResponse(BaseModel):
+    """Status of a background generation job."""
+
+    id: str
+    session_id: int
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[GenerateResponse] = None
@@ -42,11 +42,34 @@ class NoteVersionResponse(BaseModel):
     created_at: datetime
 
 
+class NoteVersionSummary(BaseModel):
+    """Schema for note version metadata, without the note bodies."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    session_id: int
+    version_number: int
+    status: str
+    ai_suggestion_id: Optional[int] = None
+    created_by_user_id: int
+    created_at: datetime
+
+
+class NoteVersionSummaryListResponse(BaseModel):
+    """Schema for listing note version metadata."""
+
+    versions: list[NoteVersionSummary]
+    total: int
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
+
+
 class NoteVersionListResponse(BaseModel):
     """Schema for listing note versions."""
 
     versions: list[NoteVersionResponse]
     total: int
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
 
 
 class RollbackRequest(BaseModel):
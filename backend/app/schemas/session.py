@@ -32,6 +32,7 @@ class SessionListResponse(BaseModel):
 
     sessions: List[SessionResponse]
     total: int
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
 
 
 class SessionDetailResponse(BaseModel):
@@ -4,6 +4,7 @@ from app.services.llm_client import LLMClient, get_llm_client
 from app.services.guardrails import GuardrailsService
 from app.services.notes import NotesService
 from app.services.audit import AuditService
+from app.services.generation_jobs import GenerationJobQueue, get_generation_job_queue
 
 __all__ = [
     "LLMClient",
@@ -11,4 +12,6 @@ __all__ = [
     "GuardrailsService",
     "NotesService",
     "AuditService",
+    "GenerationJobQueue",
+    "get_generation_job_queue",
 ]
@@ -1,17 +1,119 @@
-"""Audit service for immutable logging."""
+"""Audit service for immutable logging.
+
+Audit rows are not flushed one by one: ``log`` adds them to the session and
+they are written together at the next flush (normally the commit), in the
+same transaction as the entity change they describe. On PostgreSQL that is a
+single multi-row INSERT ... RETURNING; SQLite cannot match returned ids to
+rows, so the ORM still inserts row by row there. Running totals are updated
+with one upsert per flush. With ``AUDIT_WRITE_BEHIND`` rows go to the
+``audit_log_spool`` table instead and are chained later (see ``audit_spool``).
+"""
 
 import json
-from typing import Any, Optional
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional, Sequence, TypeVarTuple, Unpack
 
-from sqlalchemy import select
+from sqlalchemy import Insert, Row, Select, event, func, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.core.pagination import keyset_page, split_page
 from app.core.security import hash_for_audit
-from app.db.models import AuditLog
+from app.db.models import AuditLog, AuditLogCount, AuditLogSpool
+from app.services.audit_chain import CHAINED_COLUMNS, link_rows
 
+settings = get_settings()
 logger = get_logger()
 
+Ts = TypeVarTuple("Ts")
+
+AuditBucket = tuple[str, str, int]  # (entity_type, action, actor_user_id)
+
+
+def count_upsert(dialect_name: str, buckets: Counter[AuditBucket]) -> Insert:
+    """Build one statement adding ``buckets`` to the running audit totals.
+    
+    Args:
+        dialect_name: Database dialect ('postgresql' or 'sqlite').
+        buckets: New log counts per (entity_type, action, actor_user_id).
+        
+    Returns:
+        INSERT ... ON CONFLICT DO UPDATE statement.
+    """
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    upsert = dialect_insert(AuditLogCount).values(
+        [
+            {"entity_type": entity_type, "action": action, "actor_user_id": actor, "count": n}
+            for (entity_type, action, actor), n in buckets.items()
+        ]
+    )
+    return upsert.on_conflict_do_update(
+        index_elements=["entity_type", "action", "actor_user_id"],
+        set_={"count": AuditLogCount.count + upsert.excluded.count},
+    )
+
+
+@event.listens_for(OrmSession, "before_flush")
+def _prepare_pending_audit_logs(session: OrmSession, flush_context: Any, instances: Any) -> None:
+    """Chain the audit rows about to be inserted and add them to the running totals."""
+    pending = sorted(
+        (obj for obj in session.new if isinstance(obj, AuditLog)), key=lambda obj: obj.created_at
+    )
+    if not pending:
+        return
+
+    connection = session.connection()
+    rows = [{column: getattr(obj, column) for column in CHAINED_COLUMNS} for obj in pending]
+    links = link_rows(connection, rows)
+    for obj, (seq, chain_hash) in zip(pending, links, strict=True):
+        obj.chain_seq = seq
+        obj.chain_hash = chain_hash
+
+    buckets = Counter((obj.entity_type, obj.action, obj.actor_user_id) for obj in pending)
+    connection.execute(count_upsert(connection.dialect.name, buckets))
+
+
+def filter_logs(
+    query: Select[Unpack[Ts]],
+    actor_user_id: Optional[int] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    action: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Select[Unpack[Ts]]:
+    """Apply the audit log filters to a query.
+    
+    Args:
+        query: Select over ``audit_logs``.
+        actor_user_id: Filter by actor.
+        entity_type: Filter by entity type.
+        entity_id: Filter by entity ID.
+        action: Filter by action.
+        start_date: Only logs created at or after this time.
+        end_date: Only logs created before this time.
+        
+    Returns:
+        The filtered query.
+    """
+    if actor_user_id is not None:
+        query = query.where(AuditLog.actor_user_id == actor_user_id)
+    if entity_type is not None:
+        query = query.where(AuditLog.entity_type == entity_type)
+    if entity_id is not None:
+        query = query.where(AuditLog.entity_id == entity_id)
+    if action is not None:
+        query = query.where(AuditLog.action == action)
+    if start_date is not None:
+        query = query.where(AuditLog.created_at >= start_date)
+    if end_date is not None:
+        query = query.where(AuditLog.created_at < end_date)
+    return query
+
 
 class AuditService:
     """Service for managing immutable audit logs."""
@@ -46,9 +148,9 @@ class AuditService:
             metadata: Additional metadata dict.
             
         Returns:
-            Created AuditLog entry.
+            Created AuditLog entry (its id is assigned when it is written).
         """
-        # Hash the data for immutability verification
+        # Hash the data for immutability verification (now, with the entity change)
         before_hash = hash_for_audit(before_data) if before_data else None
         after_hash = hash_for_audit(after_data) if after_data else None
 
@@ -60,12 +162,20 @@ class AuditService:
             before_hash=before_hash,
             after_hash=after_hash,
             metadata_json=json.dumps(metadata) if metadata else None,
+            # Set here rather than by the database: it is part of the chain hash
+            created_at=datetime.now(timezone.utc),
         )
 
-        self.db.add(audit_log)
-        await self.db.flush()
+        if settings.audit_write_behind:
+            # Same transaction, but chained and counted later by the spool drain
+            self.db.add(
+                AuditLogSpool(**{column: getattr(audit_log, column) for column in CHAINED_COLUMNS})
+            )
+        else:
+            # Inserted with the rest of the unit of work at the next flush
+            self.db.add(audit_log)
 
-        logger.info(
+        logger.debug(
             f"Audit log created: {action} on {entity_type}:{entity_id}",
             extra={
                 "action": action,
@@ -85,8 +195,9 @@ class AuditService:
         action: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> list[AuditLog]:
-        """Get audit logs with optional filters.
+        cursor: Optional[str] = None,
+    ) -> tuple[list[AuditLog], Optional[str]]:
+        """Get a page of audit logs with optional filters, newest first.
         
         Args:
             actor_user_id: Filter by actor.
@@ -94,26 +205,99 @@ class AuditService:
             entity_id: Filter by entity ID.
             action: Filter by action.
             limit: Maximum results.
-            offset: Results offset.
+            offset: Results offset (cannot be combined with a cursor).
+            cursor: Cursor from the previous page.
             
         Returns:
-            List of matching audit logs.
+            Tuple of (matching audit logs, cursor for the next page or None).
+            
+        Raises:
+            ValueError: If the cursor is invalid or combined with an offset.
         """
-        query = select(AuditLog).order_by(AuditLog.created_at.desc())
+        query = filter_logs(select(AuditLog), actor_user_id, entity_type, entity_id, action)
+        query = keyset_page(query, AuditLog, limit, cursor=cursor, offset=offset)
+
+        result = await self.db.execute(query)
+        return split_page(result.scalars().all(), limit)
 
+    async def stream_logs(
+        self,
+        actor_user_id: Optional[int] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        action: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        chunk_size: Optional[int] = None,
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """Stream every matching log in id order, a chunk at a time.
+        
+        Rows come from a server-side cursor as plain column tuples (not ORM
+        objects), so memory is bounded by the chunk size whatever the total.
+        
+        Args:
+            actor_user_id: Filter by actor.
+            entity_type: Filter by entity type.
+            entity_id: Filter by entity ID.
+            action: Filter by action.
+            start_date: Only logs created at or after this time.
+            end_date: Only logs created before this time.
+            chunk_size: Rows per chunk.
+            
+        Yields:
+            Chunks of rows with every ``audit_logs`` column.
+        """
+        query = filter_logs(
+            select(*AuditLog.__table__.columns),
+            actor_user_id,
+            entity_type,
+            entity_id,
+            action,
+            start_date,
+            end_date,
+        )
+        query = query.order_by(AuditLog.id).execution_options(
+            yield_per=chunk_size or settings.audit_export_chunk_size
+        )
+
+        result = await self.db.stream(query)
+        async for chunk in result.partitions():
+            yield chunk
+
+    async def estimate_logs(
+        self,
+        actor_user_id: Optional[int] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        action: Optional[str] = None,
+    ) -> int:
+        """Total matching logs from the running counters instead of a scan.
+        
+        The counters have no entity_id dimension; that filter is narrow and
+        indexed, so it falls back to an exact count.
+        
+        Args:
+            actor_user_id: Filter by actor.
+            entity_type: Filter by entity type.
+            entity_id: Filter by entity ID.
+            action: Filter by action.
+            
+        Returns:
+            Number of matching logs.
+        """
+        if entity_id is not None:
+            return await self.count_logs(actor_user_id, entity_type, entity_id, action)
+
+        query = select(func.coalesce(func.sum(AuditLogCount.count), 0))
         if actor_user_id is not None:
-            query = query.where(AuditLog.actor_user_id == actor_user_id)
+            query = query.where(AuditLogCount.actor_user_id == actor_user_id)
         if entity_type is not None:
-            query = query.where(AuditLog.entity_type == entity_type)
-        if entity_id is not None:
-            query = query.where(AuditLog.entity_id == entity_id)
+            query = query.where(AuditLogCount.entity_type == entity_type)
         if action is not None:
-            query = query.where(AuditLog.action == action)
-
-        query = query.limit(limit).offset(offset)
+            query = query.where(AuditLogCount.action == action)
 
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return int(result.scalar() or 0)
 
     async def count_logs(
         self,
@@ -133,18 +317,9 @@ class AuditService:
         Returns:
             Count of matching logs.
         """
-        from sqlalchemy import func
-
-        query = select(func.count(AuditLog.id))
-
-        if actor_user_id is not None:
-            query = query.where(AuditLog.actor_user_id == actor_user_id)
-        if entity_type is not None:
-            query = query.where(AuditLog.entity_type == entity_type)
-        if entity_id is not None:
-            query = query.where(AuditLog.entity_id == entity_id)
-        if action is not None:
-            query = query.where(AuditLog.action == action)
+        query = filter_logs(
+            select(func.count(AuditLog.id)), actor_user_id, entity_type, entity_id, action
+        )
 
         result = await self.db.execute(query)
         return result.scalar() or 0
@@ -0,0 +1,279 @@
+"""Hash chain over the audit log, with Merkle checkpoints.
+
+Every audit row gets the next ``chain_seq`` and a ``chain_hash``: SHA-256 over
+the previous row's hash and this row's canonical fields. Editing, deleting or
+reordering rows breaks the chain from that point on. Writers append under the
+lock on the single ``audit_chain_head`` row, which also records the tip so a
+truncated tail is caught.
+
+``AuditChainVerifier`` walks the chain in ``chain_seq`` order with keyset
+batches, so memory does not grow with the table. Every
+``AUDIT_CHECKPOINT_INTERVAL`` verified rows it records a checkpoint (tip hash
+plus the Merkle root of the rows since the previous checkpoint); the next run
+starts from the latest one instead of from the first row.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Mapping, Optional, Sequence, cast
+
+from sqlalchemy import Connection, Table, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.models import AuditChainHead, AuditCheckpoint, AuditLog
+
+settings = get_settings()
+logger = get_logger()
+
+GENESIS_HASH = "0" * 64
+HEAD_ID = 1
+
+# Row fields covered by the chain hash, in hashing order
+CHAINED_COLUMNS = (
+    "actor_user_id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "before_hash",
+    "after_hash",
+    "metadata_json",
+    "created_at",
+)
+
+
+def canonical_time(value: datetime) -> str:
+    """Render a timestamp the same way whichever database returned it.
+
+    SQLite hands back naive UTC values and PostgreSQL aware ones.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds")
+
+
+def row_hash(prev_hash: str, seq: int, row: Mapping[Any, Any]) -> str:
+    """Chain hash of one audit row.
+
+    Args:
+        prev_hash: Chain hash of the previous row (``GENESIS_HASH`` for the first).
+        seq: The row's ``chain_seq``.
+        row: Mapping with every column in ``CHAINED_COLUMNS``.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    fields = [row[column] for column in CHAINED_COLUMNS]
+    fields[-1] = canonical_time(fields[-1])
+    payload = json.dumps([prev_hash, seq, *fields], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def merkle_root(leaves: Sequence[str]) -> str:
+    """Merkle root of hex hashes; an odd node out is paired with itself."""
+    level = [bytes.fromhex(leaf) for leaf in leaves]
+    if not level:
+        return GENESIS_HASH
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)
+        ]
+    return level[0].hex()
+
+
+def link_rows(connection: Connection, rows: Sequence[Mapping[str, Any]]) -> list[tuple[int, str]]:
+    """Append rows to the chain inside the caller's transaction.
+
+    The head row is updated before it is read, so its lock (SQLite: the
+    database write lock) is held until commit and concurrent writers append
+    one transaction after another.
+
+    Args:
+        connection: Connection of the transaction inserting the rows.
+        rows: Mappings with every column in ``CHAINED_COLUMNS``, in chain order.
+
+    Returns:
+        (chain_seq, chain_hash) for each row.
+    """
+    head = cast(Table, AuditChainHead.__table__)
+    tip = connection.execute(
+        update(head)
+        .where(head.c.id == HEAD_ID)
+        .values(last_seq=head.c.last_seq + len(rows))
+        .returning(head.c.last_seq, head.c.last_hash)
+    ).first()
+    if tip is None:
+        connection.execute(
+            insert(head).values(id=HEAD_ID, last_seq=len(rows), last_hash=GENESIS_HASH)
+        )
+        last_seq, prev_hash = len(rows), GENESIS_HASH
+    else:
+        last_seq, prev_hash = tip
+
+    links = []
+    for seq, row in enumerate(rows, start=last_seq - len(rows) + 1):
+        prev_hash = row_hash(prev_hash, seq, row)
+        links.append((seq, prev_hash))
+
+    connection.execute(update(head).where(head.c.id == HEAD_ID).values(last_hash=prev_hash))
+    return links
+
+
+@dataclass
+class ChainVerification:
+    """Outcome of a verification run."""
+
+    ok: bool
+    verified_rows: int
+    last_seq: int
+    checkpoints_created: int = 0
+    first_bad_seq: Optional[int] = None
+    error: Optional[str] = None
+
+
+class AuditChainVerifier:
+    """Verifies the audit hash chain and records checkpoints as it goes."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: Optional[int] = None,
+        checkpoint_interval: Optional[int] = None,
+    ):
+        """Initialize the verifier.
+
+        Args:
+            db: Database session.
+            batch_size: Rows fetched per query.
+            checkpoint_interval: Verified rows between checkpoints.
+        """
+        self.db = db
+        self.batch_size = batch_size or settings.audit_verify_batch_size
+        self.checkpoint_interval = checkpoint_interval or settings.audit_checkpoint_interval
+
+    async def verify(self, full: bool = False) -> ChainVerification:
+        """Verify the chain up to the current head.
+
+        Args:
+            full: Start from the first row and re-check every checkpoint
+                instead of trusting the latest one.
+
+        Returns:
+            Verification result; ``first_bad_seq`` marks where the chain breaks.
+        """
+        tip = (
+            await self.db.execute(
+                select(AuditChainHead.last_seq, AuditChainHead.last_hash).where(
+                    AuditChainHead.id == HEAD_ID
+                )
+            )
+        ).first()
+        head_seq, head_hash = tip or (0, GENESIS_HASH)
+
+        seq, prev_hash = 0, GENESIS_HASH
+        if not full:
+            checkpoint = (
+                await self.db.execute(
+                    select(AuditCheckpoint)
+                    .where(AuditCheckpoint.last_seq <= head_seq)
+                    .order_by(AuditCheckpoint.last_seq.desc())
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
+            if checkpoint is not None:
+                anchor = await self.db.scalar(
+                    select(AuditLog.chain_hash).where(AuditLog.chain_seq == checkpoint.last_seq)
+                )
+                if anchor != checkpoint.chain_hash:
+                    return self._failed(
+                        0, checkpoint.last_seq, checkpoint.last_seq, 0, "Checkpoint row changed"
+                    )
+                seq, prev_hash = checkpoint.last_seq, checkpoint.chain_hash
+
+        verified = created = 0
+        leaves: list[str] = []  # Chain hashes since the last checkpoint
+        columns = [getattr(AuditLog, column) for column in CHAINED_COLUMNS]
+        while seq < head_seq:
+            rows = (
+                await self.db.execute(
+                    select(AuditLog.chain_seq, AuditLog.chain_hash, *columns)
+                    .where(AuditLog.chain_seq > seq, AuditLog.chain_seq <= head_seq)
+                    .order_by(AuditLog.chain_seq)
+                    .limit(self.batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+            checkpoints = {
+                checkpoint.last_seq: checkpoint
+                for checkpoint in (
+                    await self.db.execute(
+                        select(AuditCheckpoint).where(
+                            AuditCheckpoint.last_seq.between(rows[0].chain_seq, rows[-1].chain_seq)
+                        )
+                    )
+                ).scalars()
+            }
+
+            for row in rows:
+                if row.chain_seq != seq + 1:
+                    return self._failed(verified, seq, seq + 1, created, "Row missing")
+                if row.chain_hash != row_hash(prev_hash, row.chain_seq, row._mapping):
+                    return self._failed(verified, seq, row.chain_seq, created, "Hash mismatch")
+                seq, prev_hash = row.chain_seq, row.chain_hash
+                verified += 1
+                leaves.append(prev_hash)
+
+                checkpoint = checkpoints.get(seq)
+                if checkpoint is not None:
+                    if (
+                        checkpoint.chain_hash != prev_hash
+                        or checkpoint.merkle_root != merkle_root(leaves)
+                    ):
+                        return self._failed(
+                            verified, seq, seq, created, "Checkpoint does not match the chain"
+                        )
+                    leaves = []
+                elif len(leaves) == self.checkpoint_interval:
+                    self.db.add(
+                        AuditCheckpoint(
+                            last_seq=seq,
+                            chain_hash=prev_hash,
+                            merkle_root=merkle_root(leaves),
+                            row_count=len(leaves),
+                        )
+                    )
+                    # Committed as we go so an interrupted run keeps its progress
+                    await self.db.commit()
+                    created += 1
+                    leaves = []
+
+        if seq != head_seq or prev_hash != head_hash:
+            return self._failed(verified, seq, seq + 1, created, "Chain does not reach the head")
+
+        logger.info(
+            f"Audit chain verified to row {seq}",
+            extra={"verified_rows": verified, "checkpoints_created": created},
+        )
+        return ChainVerification(
+            ok=True, verified_rows=verified, last_seq=seq, checkpoints_created=created
+        )
+
+    def _failed(
+        self, verified: int, last_seq: int, bad_seq: int, created: int, error: str
+    ) -> ChainVerification:
+        """Build and log a failed result."""
+        logger.error(f"Audit chain verification failed at row {bad_seq}: {error}")
+        return ChainVerification(
+            ok=False,
+            verified_rows=verified,
+            last_seq=last_seq,
+            checkpoints_created=created,
+            first_bad_seq=bad_seq,
+            error=error,
+        )
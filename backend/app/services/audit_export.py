@@ -0,0 +1,157 @@
+"""Encoders for streaming audit log exports.
+
+Each encoder turns the row chunks from ``AuditService.stream_logs`` into
+response body chunks as they arrive, so an export never holds more than one
+chunk in memory. Parquet needs the optional ``pyarrow`` package and writes
+one row group per chunk.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import Row
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+RowChunks = AsyncIterator[Sequence[Row[Any]]]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_COLUMNS = (
+    "id",
+    "actor_user_id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "before_hash",
+    "after_hash",
+    "metadata_json",
+    "created_at",
+    "chain_seq",
+    "chain_hash",
+)
+
+
+def parquet_available() -> bool:
+    """Whether pyarrow is installed for Parquet exports."""
+    return pq is not None
+
+
+def _record(row: Row[Any]) -> dict[str, Any]:
+    """Export columns of a row, with the timestamp as ISO 8601."""
+    record = {column: getattr(row, column) for column in EXPORT_COLUMNS}
+    if isinstance(record["created_at"], datetime):
+        record["created_at"] = record["created_at"].isoformat()
+    return record
+
+
+async def encode_ndjson(chunks: RowChunks) -> AsyncIterator[bytes]:
+    """One JSON object per line."""
+    async for chunk in chunks:
+        yield "".join(
+            json.dumps(_record(row), separators=(",", ":")) + "\n" for row in chunk
+        ).encode()
+
+
+async def encode_csv(chunks: RowChunks) -> AsyncIterator[bytes]:
+    """CSV with a header row."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    async for chunk in chunks:
+        writer.writerows(_record(row) for row in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()  # Header only when nothing matched
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file handing back what was written since the last ``drain``.
+
+    The Parquet writer tracks row group offsets through ``tell``, so the
+    position keeps counting across drains.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+async def encode_parquet(chunks: RowChunks) -> AsyncIterator[bytes]:
+    """Parquet with one row group per chunk."""
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("actor_user_id", pa.int64()),
+            ("action", pa.string()),
+            ("entity_type", pa.string()),
+            ("entity_id", pa.int64()),
+            ("before_hash", pa.string()),
+            ("after_hash", pa.string()),
+            ("metadata_json", pa.string()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("chain_seq", pa.int64()),
+            ("chain_hash", pa.string()),
+        ]
+    )
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for chunk in chunks:
+            records = [{column: getattr(row, column) for column in EXPORT_COLUMNS} for row in chunk]
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()  # Footer
+
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+    "parquet": encode_parquet,
+}
+
+
+def encode_export(export_format: str, chunks: RowChunks) -> AsyncIterator[bytes]:
+    """Encode row chunks in the requested format.
+
+    Raises:
+        ValueError: If the format is unknown, or Parquet without pyarrow.
+    """
+    if export_format not in ENCODERS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    if export_format == "parquet" and not parquet_available():
+        raise ValueError("Parquet export requires pyarrow")
+    return ENCODERS[export_format](chunks)
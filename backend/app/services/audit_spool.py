@@ -0,0 +1,148 @@
+"""Write-behind spool for audit rows.
+
+With ``AUDIT_WRITE_BEHIND`` enabled, ``AuditService.log`` adds an
+``AuditLogSpool`` row instead of an ``AuditLog``. It is inserted in the same
+transaction as the entity change it describes, so it commits or rolls back
+with it, but request transactions never take the hash chain head lock or
+update the running totals. A background task drains the spool into
+``audit_logs`` in batches, linking the rows into the hash chain at that
+point.
+
+Each batch is moved in one transaction. The drain claims the oldest
+unclaimed rows with an ``UPDATE ... RETURNING`` and inserts them with one
+executemany. It then deletes exactly the rows it claimed and commits. A
+crash anywhere in between rolls the whole batch back, and concurrent drains
+in other processes cannot claim the same rows.
+"""
+
+import asyncio
+import uuid
+from collections import Counter
+from typing import Optional, cast
+
+from sqlalchemy import Table, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import AUDIT_SPOOL_DRAINED
+from app.db.models import AuditLog, AuditLogSpool
+from app.db.session import async_session
+from app.services.audit import count_upsert
+from app.services.audit_chain import CHAINED_COLUMNS, link_rows
+
+settings = get_settings()
+logger = get_logger()
+
+
+class AuditSpool:
+    """Drains ``audit_log_spool`` into the hash-chained audit log in bulk."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """Initialize the spool.
+
+        Args:
+            session_factory: Factory for the drain's sessions.
+            interval: Seconds between drains.
+            batch_size: Rows moved per transaction.
+        """
+        self.session_factory = session_factory
+        self.interval = interval or settings.audit_spool_drain_seconds
+        self.batch_size = batch_size or settings.audit_spool_batch_size
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def drain(self) -> int:
+        """Move every spooled row into ``audit_logs``, one batch per transaction.
+
+        Returns:
+            Number of rows drained.
+        """
+        drained = 0
+        while True:
+            moved = await self._drain_batch()
+            drained += moved
+            if moved < self.batch_size:
+                return drained
+
+    async def _drain_batch(self) -> int:
+        """Claim, insert and delete one batch in a single transaction."""
+        spool = cast(Table, AuditLogSpool.__table__)
+        claim = uuid.uuid4().hex
+        async with self.session_factory() as db:
+            claimed = (
+                await db.execute(
+                    update(spool)
+                    .where(
+                        spool.c.id.in_(
+                            select(spool.c.id)
+                            .where(spool.c.claimed_by.is_(None))
+                            .order_by(spool.c.id)
+                            .limit(self.batch_size)
+                        )
+                    )
+                    .values(claimed_by=claim)
+                    .returning(spool.c.id, *(spool.c[column] for column in CHAINED_COLUMNS))
+                )
+            ).all()
+            if not claimed:
+                return 0
+
+            # RETURNING order is unspecified; chain in the order rows were logged
+            ordered = sorted(claimed, key=lambda row: (row.created_at, row.id))
+            rows = [{column: row._mapping[column] for column in CHAINED_COLUMNS} for row in ordered]
+            links = await db.run_sync(lambda sync_db: link_rows(sync_db.connection(), rows))
+            for row, (seq, chain_hash) in zip(rows, links, strict=True):
+                row["chain_seq"] = seq
+                row["chain_hash"] = chain_hash
+            buckets = Counter(
+                (row["entity_type"], row["action"], row["actor_user_id"]) for row in rows
+            )
+
+            await db.execute(insert(AuditLog), rows)
+            await db.execute(count_upsert(db.get_bind().dialect.name, buckets))
+            await db.execute(delete(spool).where(spool.c.claimed_by == claim))
+            await db.commit()
+
+        AUDIT_SPOOL_DRAINED.inc(len(rows))
+        return len(rows)
+
+    async def start(self) -> None:
+        """Drain anything left from a previous run and start the drain task."""
+        if self._task:
+            return
+        await self.drain()
+        self._task = asyncio.create_task(self._drain_loop(), name="audit-spool-drain")
+
+    async def stop(self) -> None:
+        """Stop the drain task and drain what is left."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.drain()
+
+    async def _drain_loop(self) -> None:
+        """Drain periodically; a failed drain is retried on the next tick."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error(f"Audit spool drain failed: {type(e).__name__}")
+
+
+# Singleton instance
+_audit_spool: Optional[AuditSpool] = None
+
+
+def get_audit_spool() -> AuditSpool:
+    """Get the audit spool singleton."""
+    global _audit_spool
+    if _audit_spool is None:
+        _audit_spool = AuditSpool()
+    return _audit_spool
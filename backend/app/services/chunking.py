@@ -0,0 +1,125 @@
+"""Speaker-turn chunking for transcripts too long for a single prompt."""
+
+import re
+from itertools import pairwise
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.ai import Citation
+
+# "Clinician:", "Patient:", "Dr. Smith:" etc. at the start of a line
+SPEAKER_TURN_PATTERN = re.compile(r"^[ \t]*[A-Z][\w .'()-]{0,40}:", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class TranscriptChunk:
+    """A contiguous slice of a transcript."""
+
+    index: int
+    start: int
+    end: int
+    text: str
+
+
+def split_transcript(transcript: str, chunk_size: int, overlap: int) -> list[TranscriptChunk]:
+    """Split a transcript into overlapping chunks on speaker-turn boundaries.
+
+    Whole turns are packed into each chunk up to ``chunk_size`` characters. A
+    single turn longer than that is cut at whitespace. Each chunk after the
+    first repeats the trailing turns of the previous one, up to ``overlap``
+    characters, so findings spanning a boundary are seen whole at least once.
+
+    Args:
+        transcript: Full transcript text.
+        chunk_size: Maximum characters per chunk.
+        overlap: Maximum characters repeated from the previous chunk.
+
+    Returns:
+        Chunks in transcript order, with offsets into ``transcript``.
+    """
+    starts = [match.start() for match in SPEAKER_TURN_PATTERN.finditer(transcript)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(transcript)]
+
+    segments: list[tuple[int, int]] = []
+    for seg_start, seg_end in pairwise(bounds):
+        while seg_end - seg_start > chunk_size:
+            cut = transcript.rfind(" ", seg_start + 1, seg_start + chunk_size)
+            if cut <= seg_start:
+                cut = seg_start + chunk_size
+            segments.append((seg_start, cut))
+            seg_start = cut
+        if seg_end > seg_start:
+            segments.append((seg_start, seg_end))
+
+    chunks: list[TranscriptChunk] = []
+    first = 0
+    while first < len(segments):
+        start = segments[first][0]
+        last = first + 1
+        while last < len(segments) and segments[last][1] - start <= chunk_size:
+            last += 1
+        end = segments[last - 1][1]
+        chunks.append(TranscriptChunk(len(chunks), start, end, transcript[start:end]))
+        if last >= len(segments):
+            break
+
+        # Back up over trailing turns that fit in the overlap
+        next_first = last
+        while next_first - 1 > first and end - segments[next_first - 1][0] <= overlap:
+            next_first -= 1
+        first = next_first
+
+    return chunks
+
+
+def iter_citations(model: BaseModel) -> Iterator[Citation]:
+    """Yield every citation nested anywhere in a model."""
+    for name in type(model).model_fields:
+        value = getattr(model, name)
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            if isinstance(item, Citation):
+                yield item
+            elif isinstance(item, BaseModel):
+                yield from iter_citations(item)
+
+
+def remap_citations(
+    output: BaseModel, transcript: str, chunk: Optional[TranscriptChunk] = None
+) -> None:
+    """Point citation offsets into the full transcript, in place.
+
+    Offsets relative to ``chunk`` are shifted by its start. Any citation whose
+    offsets do not then frame its quoted text is located by searching the
+    transcript (from the chunk onward first); quotes that cannot be found get
+    no offsets rather than wrong ones.
+
+    Args:
+        output: Parsed model output (or one section of it).
+        transcript: Full transcript text.
+        chunk: Chunk the offsets are relative to, or None if already absolute.
+    """
+    base = chunk.start if chunk else 0
+    for citation in iter_citations(output):
+        if citation.start_offset is not None and citation.end_offset is not None:
+            start = citation.start_offset + base
+            end = citation.end_offset + base
+            if citation.text and transcript[start:end] == citation.text:
+                citation.start_offset, citation.end_offset = start, end
+                continue
+
+        position = -1
+        if citation.text:
+            position = transcript.find(citation.text, base)
+            if position < 0:
+                position = transcript.find(citation.text)
+
+        if position < 0:
+            citation.start_offset = citation.end_offset = None
+        else:
+            citation.start_offset = position
+            citation.end_offset = position + len(citation.text)
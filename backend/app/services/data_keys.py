@@ -0,0 +1,123 @@
+"""Per-patient data keys for envelope encryption of transcripts.
+
+Each patient gets a random AES-256 data key the first time a transcript is
+stored for them. Only the key wrapped by a master key is stored, bound to
+the patient id, and sessions record which data key sealed their transcript.
+Rotating a master key then means rewrapping these small keys
+(``app.services.key_rotation``), not re-encrypting every transcript.
+Transcripts stored before data keys existed are re-sealed once by the same
+job.
+"""
+
+from typing import Optional
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from sqlalchemy import ColumnElement, Row, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.crypto import open_text, run_crypto, seal_text
+from app.core.security import decrypt_data_async, unwrap_data_key, wrap_data_key
+from app.db.models import PatientDataKey, Session
+
+
+def key_context(patient_id: int) -> bytes:
+    """Authenticated context binding a wrapped key to its patient."""
+    return f"patient-data-key:{patient_id}".encode()
+
+
+class DataKeyService:
+    """Creates, unwraps and uses patient data keys."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the service.
+
+        Args:
+            db: Database session.
+        """
+        self.db = db
+
+    async def patient_key(self, patient_id: int) -> tuple[int, bytes]:
+        """Get a patient's data key, creating it on first use.
+
+        Args:
+            patient_id: Patient ID.
+
+        Returns:
+            (data key id, plain data key).
+            
+        Raises:
+            ValueError: If the key could not be stored (e.g. the patient is gone).
+        """
+        row = await self._load(PatientDataKey.patient_id == patient_id)
+        if row is None:
+            master_key_id, wrapped_key = wrap_data_key(
+                AESGCM.generate_key(bit_length=256), key_context(patient_id)
+            )
+            dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+            await self.db.execute(
+                dialect.insert(PatientDataKey)
+                .values(
+                    patient_id=patient_id, master_key_id=master_key_id, wrapped_key=wrapped_key
+                )
+                .on_conflict_do_nothing(index_elements=["patient_id"])
+            )
+            # A concurrent request may have created it first; use whichever won
+            row = await self._load(PatientDataKey.patient_id == patient_id)
+            if row is None:
+                raise ValueError(f"Data key for patient {patient_id} could not be created")
+
+        return row.id, unwrap_data_key(
+            row.master_key_id, row.wrapped_key, key_context(row.patient_id)
+        )
+
+    async def data_key(self, key_id: int) -> bytes:
+        """Unwrap a data key by id.
+
+        Raises:
+            ValueError: If the key does not exist or its master key is not configured.
+        """
+        row = await self._load(PatientDataKey.id == key_id)
+        if row is None:
+            raise ValueError(f"Data key {key_id} not found")
+        return unwrap_data_key(row.master_key_id, row.wrapped_key, key_context(row.patient_id))
+
+    async def encrypt_transcript(self, patient_id: int, transcript: str) -> tuple[int, bytes]:
+        """Seal a transcript with the patient's data key.
+
+        Args:
+            patient_id: Patient the session belongs to.
+            transcript: Plain transcript.
+
+        Returns:
+            (data key id to store as ``transcript_key_id``, sealed transcript).
+        """
+        key_id, key = await self.patient_key(patient_id)
+        return key_id, await run_crypto(len(transcript), seal_text, key, transcript)
+
+    async def decrypt_transcript(self, session: Session) -> str:
+        """Decrypt a session's transcript, whichever key sealed it.
+
+        Args:
+            session: Session with ``transcript_encrypted``.
+
+        Returns:
+            Plain transcript.
+        """
+        token = session.transcript_encrypted
+        if session.transcript_key_id is None:
+            return await decrypt_data_async(token)
+        key = await self.data_key(session.transcript_key_id)
+        return await run_crypto(len(token), open_text, key, token)
+
+    async def _load(self, condition: ColumnElement[bool]) -> Optional[Row[int, int, str, bytes]]:
+        """Load the columns needed to unwrap one data key."""
+        result = await self.db.execute(
+            select(
+                PatientDataKey.id,
+                PatientDataKey.patient_id,
+                PatientDataKey.master_key_id,
+                PatientDataKey.wrapped_key,
+            ).where(condition)
+        )
+        return result.first()
@@ -0,0 +1,159 @@
+"""Content-addressed cache for AI generations."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import (
+    GENERATION_CACHE_EVICTIONS,
+    GENERATION_CACHE_HITS,
+    GENERATION_CACHE_MISSES,
+)
+from app.db.models import AiSuggestion
+
+settings = get_settings()
+logger = get_logger()
+
+
+@dataclass(frozen=True)
+class GenerationCacheKey:
+    """Every input that determines the model output for a transcript."""
+
+    transcript_hash: str
+    prompt_version: str
+    model_name: str
+    safe_mode: bool
+    temperature: float
+    schema_version: str
+    generation_mode: str = "full"  # How the output was produced: full, parallel or chunked
+
+    @property
+    def digest(self) -> str:
+        """Stable SHA-256 digest used as the storage key."""
+        parts = [
+            self.transcript_hash,
+            self.prompt_version,
+            self.model_name,
+            ("safe" if self.safe_mode else "full")
+            + ("" if self.generation_mode == "full" else f"-{self.generation_mode}"),
+            f"{self.temperature:.3f}",
+            self.schema_version,
+        ]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+class GenerationCache:
+    """Two-tier generation cache.
+
+    Tier one is an in-process LRU with TTL. Tier two looks up a previously
+    stored ``AiSuggestion`` with the same content key, so identical inputs are
+    served without a model call across workers and restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum in-memory entries before LRU eviction.
+            ttl_seconds: Entry lifetime in seconds.
+        """
+        self.max_entries = max_entries or settings.generation_cache_max_entries
+        self.ttl_seconds = ttl_seconds or settings.generation_cache_ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, digest: str) -> Optional[str]:
+        """Get a cached raw JSON output from memory.
+
+        Args:
+            digest: Cache key digest.
+
+        Returns:
+            Raw JSON output, or None on miss or expiry.
+        """
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        expires_at, raw_json = entry
+        if expires_at < time.monotonic():
+            del self._entries[digest]
+            GENERATION_CACHE_EVICTIONS.labels(reason="ttl").inc()
+            return None
+
+        self._entries.move_to_end(digest)
+        return raw_json
+
+    def set(self, digest: str, raw_json: str) -> None:
+        """Store a raw JSON output in memory.
+
+        Args:
+            digest: Cache key digest.
+            raw_json: Validated model output.
+        """
+        self._entries[digest] = (time.monotonic() + self.ttl_seconds, raw_json)
+        self._entries.move_to_end(digest)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            GENERATION_CACHE_EVICTIONS.labels(reason="lru").inc()
+
+    def clear(self) -> None:
+        """Drop all in-memory entries."""
+        self._entries.clear()
+
+    async def lookup(self, db: AsyncSession, key: GenerationCacheKey) -> Optional[str]:
+        """Look up a generation in memory, then in stored suggestions.
+
+        Args:
+            db: Database session.
+            key: Cache key.
+
+        Returns:
+            Raw JSON output, or None on miss.
+        """
+        digest = key.digest
+
+        raw_json = self.get(digest)
+        if raw_json is not None:
+            GENERATION_CACHE_HITS.labels(tier="memory").inc()
+            return raw_json
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        result = await db.execute(
+            select(AiSuggestion.raw_json)
+            .where(AiSuggestion.cache_key == digest, AiSuggestion.created_at >= cutoff)
+            .order_by(AiSuggestion.id.desc())
+            .limit(1)
+        )
+        raw_json = result.scalar_one_or_none()
+        if raw_json is not None:
+            GENERATION_CACHE_HITS.labels(tier="database").inc()
+            self.set(digest, raw_json)
+            return raw_json
+
+        GENERATION_CACHE_MISSES.inc()
+        return None
+
+
+# Singleton instance
+_generation_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> GenerationCache:
+    """Get the generation cache singleton."""
+    global _generation_cache
+    if _generation_cache is None:
+        _generation_cache = GenerationCache()
+    return _generation_cache
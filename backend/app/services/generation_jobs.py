@@ -0,0 +1,313 @@
+"""In-process background queue for AI generation jobs.
+
+Jobs are persisted in the ``generation_jobs`` table, so status survives the
+request that created them. An ``asyncio.Queue`` dispatches job ids to a fixed
+pool of worker tasks; no external broker is needed.
+
+A worker claims a job by atomically moving it from queued to running, so a
+job handed to several workers or processes still runs once. While it runs,
+the worker renews the job's lease through ``heartbeat_at``. Running jobs
+whose lease has expired belonged to a worker that died; they are re-queued
+on startup and by a periodic reaper.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import Row, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import GENERATION_JOB_QUEUE_DEPTH, GENERATION_JOBS
+from app.db.models import GenerationJob, JobStatus
+from app.db.session import async_session
+from app.schemas.ai import GenerateRequest
+from app.services.notes import NotesService
+
+settings = get_settings()
+logger = get_logger()
+
+TERMINAL_STATUSES = {JobStatus.SUCCEEDED.value, JobStatus.FAILED.value}
+
+
+class GenerationJobQueue:
+    """Worker pool that runs ``NotesService.generate_ai_suggestions`` off-request."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        workers: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+    ):
+        """Initialize the queue.
+
+        Args:
+            session_factory: Factory for the short-lived sessions each job uses.
+            workers: Number of concurrent worker tasks.
+            lease_seconds: How long a running job may go without a heartbeat
+                before it is re-queued.
+        """
+        self.session_factory = session_factory
+        self.workers = workers or settings.generation_job_workers
+        self.lease_seconds = lease_seconds or settings.generation_job_lease_seconds
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._watchers: dict[str, asyncio.Event] = {}
+
+    async def start(self) -> None:
+        """Pick up queued and abandoned jobs and start the worker tasks."""
+        if self._tasks:
+            return
+
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(GenerationJob.id)
+                .where(GenerationJob.status == JobStatus.QUEUED.value)
+                .order_by(GenerationJob.created_at)
+            )
+            queued = result.scalars().all()
+        for job_id in queued:
+            self._enqueue(job_id)
+
+        expired = await self._requeue_expired()
+        if queued or expired:
+            logger.info(f"Picked up {len(queued)} queued and {expired} abandoned generation jobs")
+
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(), name=f"generation-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._reaper_loop(), name="generation-reaper"))
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks. Running jobs are re-queued once their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(
+        self, session_id: int, user_id: int, params: GenerateRequest
+    ) -> GenerationJob:
+        """Persist a new job and hand it to the workers.
+
+        Args:
+            session_id: Session to generate for.
+            user_id: User requesting generation.
+            params: Generation parameters.
+
+        Returns:
+            The queued job.
+        """
+        job = GenerationJob(
+            id=uuid.uuid4().hex,
+            session_id=session_id,
+            requested_by_user_id=user_id,
+            status=JobStatus.QUEUED.value,
+            params_json=params.model_dump_json(),
+        )
+        async with self.session_factory() as db:
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+
+        self._enqueue(job.id)
+        return job
+
+    async def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Load a job's current state in a fresh session.
+
+        Args:
+            job_id: Job ID.
+
+        Returns:
+            The job, or None if it does not exist.
+        """
+        async with self.session_factory() as db:
+            return await db.get(GenerationJob, job_id)
+
+    async def watch(
+        self, job_id: str
+    ) -> tuple[Optional[GenerationJob], Optional[asyncio.Event]]:
+        """Load a job along with an event set on its next status change.
+
+        The event is registered before the job is read, so an update between
+        the read and the wait is not missed.
+
+        Args:
+            job_id: Job ID.
+
+        Returns:
+            (job, event). The job is None if it does not exist, and the event
+            is None if the job does not exist or has already finished.
+        """
+        event = self._watchers.setdefault(job_id, asyncio.Event())
+        job = await self.get(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            # No further status change will come to remove it
+            if self._watchers.get(job_id) is event:
+                del self._watchers[job_id]
+            return job, None
+        return job, event
+
+    def _enqueue(self, job_id: str) -> None:
+        """Hand a job id to the workers."""
+        self._queue.put_nowait(job_id)
+        GENERATION_JOB_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _notify(self, job_id: str) -> None:
+        """Wake everyone watching a job."""
+        event = self._watchers.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _worker_loop(self) -> None:
+        """Take job ids off the queue and run them until cancelled."""
+        while True:
+            job_id = await self._queue.get()
+            GENERATION_JOB_QUEUE_DEPTH.set(self._queue.qsize())
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Generation job {job_id} crashed: {type(e).__name__}")
+            finally:
+                self._queue.task_done()
+
+    async def _reaper_loop(self) -> None:
+        """Re-queue abandoned jobs every lease period until cancelled."""
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                requeued = await self._requeue_expired()
+            except Exception as e:
+                logger.error(f"Generation job reaper failed: {type(e).__name__}")
+                continue
+            if requeued:
+                logger.warning(f"Re-queued {requeued} generation jobs with expired leases")
+
+    async def _requeue_expired(self) -> int:
+        """Move running jobs whose lease expired back to queued.
+
+        Returns:
+            Number of jobs re-queued.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(GenerationJob)
+                .where(
+                    GenerationJob.status == JobStatus.RUNNING.value,
+                    or_(GenerationJob.heartbeat_at.is_(None), GenerationJob.heartbeat_at < cutoff),
+                )
+                .values(status=JobStatus.QUEUED.value)
+                .returning(GenerationJob.id)
+            )
+            job_ids = result.scalars().all()
+            await db.commit()
+
+        for job_id in job_ids:
+            self._enqueue(job_id)
+        return len(job_ids)
+
+    async def _claim(self, job_id: str) -> Optional[Row[int, int, str]]:
+        """Atomically move a queued job to running.
+
+        Returns:
+            The job's session, user and parameters, or None if it is missing
+            or another worker claimed it first.
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(GenerationJob)
+                .where(GenerationJob.id == job_id, GenerationJob.status == JobStatus.QUEUED.value)
+                .values(status=JobStatus.RUNNING.value, started_at=now, heartbeat_at=now)
+                .returning(
+                    GenerationJob.session_id,
+                    GenerationJob.requested_by_user_id,
+                    GenerationJob.params_json,
+                )
+            )
+            claimed = result.first()
+            await db.commit()
+        return claimed
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Renew a running job's lease until cancelled."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(GenerationJob)
+                        .where(
+                            GenerationJob.id == job_id,
+                            GenerationJob.status == JobStatus.RUNNING.value,
+                        )
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Generation job {job_id} heartbeat failed: {type(e).__name__}")
+
+    async def _run_job(self, job_id: str) -> None:
+        """Run one job, recording its outcome."""
+        claimed = await self._claim(job_id)
+        if claimed is None:
+            return
+        params = GenerateRequest.model_validate_json(claimed.params_json)
+        self._notify(job_id)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id), name=f"generation-lease-{job_id}")
+        result_json = None
+        error = None
+        try:
+            async with self.session_factory() as db:
+                response = await NotesService(db).generate_ai_suggestions(
+                    session_id=claimed.session_id,
+                    user_id=claimed.requested_by_user_id,
+                    prompt_version=params.prompt_version,
+                    model_name=params.model_name,
+                    mode=params.mode,
+                    temperature=params.temperature,
+                    bypass_cache=params.bypass_cache,
+                )
+                await db.commit()
+            result_json = response.model_dump_json()
+        except ValueError as e:
+            error = str(e)
+        except Exception as e:
+            logger.error(f"Generation job {job_id} failed: {type(e).__name__}")
+            error = "AI generation failed. Please try again."
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+        async with self.session_factory() as db:
+            job = await db.get(GenerationJob, job_id)
+            if job is not None:
+                job.status = JobStatus.FAILED.value if error else JobStatus.SUCCEEDED.value
+                job.result_json = result_json
+                job.error = error
+                job.finished_at = datetime.now(timezone.utc)
+                await db.commit()
+
+        GENERATION_JOBS.labels(status="failed" if error else "succeeded").inc()
+        self._notify(job_id)
+
+
+# Singleton instance
+_generation_job_queue: Optional[GenerationJobQueue] = None
+
+
+def get_generation_job_queue() -> GenerationJobQueue:
+    """Get the generation job queue singleton."""
+    global _generation_job_queue
+    if _generation_job_queue is None:
+        _generation_job_queue = GenerationJobQueue()
+    return _generation_job_queue
@@ -1,13 +1,16 @@
 """Guardrails service for prompt injection detection and safety."""
 
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.core.logging import get_logger
 from app.core.metrics import INJECTION_DETECTED_COUNT
 
 logger = get_logger()
 
+# Longest transcript sent to the model in a single prompt
+MAX_PROMPT_CHARS = 50000
+
 # Suspicious patterns that may indicate prompt injection
 INJECTION_PATTERNS = [
     r"ignore\s+(previous|above|prior|all)\s+(instructions?|prompts?|context)",
@@ -78,13 +81,16 @@ class GuardrailsService:
 
         return is_flagged, matched_patterns
 
-    def sanitize_for_prompt(self, text: str) -> str:
+    def sanitize_for_prompt(
+        self, text: str, max_length: Optional[int] = MAX_PROMPT_CHARS
+    ) -> str:
         """Sanitize text before including in prompts.
         
         This removes or escapes potentially dangerous content.
         
         Args:
             text: Raw text to sanitize.
+            max_length: Truncate beyond this many characters (None to keep all).
             
         Returns:
             Sanitized text safe for prompt inclusion.
@@ -96,8 +102,7 @@ class GuardrailsService:
         text = re.sub(r"\s{10,}", " " * 5, text)
 
         # Limit length
-        max_length = 50000
-        if len(text) > max_length:
+        if max_length is not None and len(text) > max_length:
             text = text[:max_length] + "... [TRUNCATED]"
 
         return text
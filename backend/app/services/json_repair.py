@@ -0,0 +1,407 @@
+"""Deterministic local repair of malformed model JSON output.
+
+Tiers, cheapest first:
+
+* ``strict`` - the output (minus markdown fences) is valid JSON.
+* ``extract`` - valid JSON surrounded by prose.
+* ``tolerant`` - trailing commas, single quotes, Python literals and
+  truncated closing brackets fixed up before parsing.
+* ``coerce`` - parsed data adjusted to the schema using validation errors
+  (over-long strings cut, numbers parsed out of text, 1-100 read as a
+  percentage of a 0-1 field, missing or unusable fields filled from a
+  fallback, unfixable list items dropped). A ``RepairReport`` lists what
+  was changed so callers can log or flag it.
+
+Only when all of these fail does the caller pay for an LLM fix round trip.
+"""
+
+import copy
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import ErrorDetails
+
+# Coercion applies one fix per validation pass
+MAX_COERCE_PASSES = 200
+
+_NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_TRUE_TOKENS = {"true", "yes", "1"}
+_FALSE_TOKENS = {"false", "no", "not yet", "0"}
+
+
+class JsonRepairError(ValueError):
+    """Model output could not be repaired locally."""
+
+
+@dataclass
+class RepairReport:
+    """Fields the coerce tier changed, as dotted paths into the output."""
+
+    coerced: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    filled: list[str] = field(default_factory=list)
+    coerce_used: bool = False  # Output only validated after the coerce tier
+
+    @property
+    def changed(self) -> bool:
+        """Whether any field was coerced, dropped or filled from the fallback."""
+        return bool(self.coerced or self.dropped or self.filled)
+
+    def merge(self, other: "RepairReport", prefix: str = "") -> None:
+        """Add another report's changes, with paths prefixed by where its output sits."""
+        for mine, theirs in (
+            (self.coerced, other.coerced),
+            (self.dropped, other.dropped),
+            (self.filled, other.filled),
+        ):
+            mine.extend(".".join(part for part in (prefix, path) if part) for path in theirs)
+        self.coerce_used = self.coerce_used or other.coerce_used
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding markdown code block, if present."""
+    text = text.strip()
+    if text.startswith("```"):
+        lines = text.split("\n")
+        # Find start and end of code block
+        start_idx = 1 if lines[0].startswith("```") else 0
+        end_idx = len(lines) - 1 if lines[-1].strip() == "```" else len(lines)
+        text = "\n".join(lines[start_idx:end_idx])
+    return text
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """Cut the outermost JSON object out of surrounding prose.
+
+    Returns:
+        Text from the first ``{`` to the last ``}`` (or to the end when the
+        object is truncated), or None if there is no object.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    end = text.rfind("}")
+    if end < start:
+        return text[start:]
+    return text[start : end + 1]
+
+
+def tolerant_json_loads(text: str) -> Any:
+    """Parse JSON with common model mistakes fixed.
+
+    Handles single-quoted strings, Python ``True``/``False``/``None``,
+    trailing commas and output cut off before its closing brackets. For cut
+    off output the last incomplete member is dropped.
+
+    Raises:
+        json.JSONDecodeError: If the text still does not parse.
+    """
+    out: list[str] = []
+    stack: list[str] = []
+    # (output length, open containers) at points where the document can be closed
+    checkpoints: list[tuple[int, list[str]]] = []
+    quote: Optional[str] = None
+    i = 0
+
+    while i < len(text):
+        char = text[i]
+
+        if quote is not None:
+            if char == "\\" and i + 1 < len(text):
+                escaped = text[i + 1]
+                out.append("'" if escaped == "'" else char + escaped)
+                i += 2
+                continue
+            if char == quote:
+                out.append('"')
+                quote = None
+            elif char == '"':
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+            i += 1
+            continue
+
+        if char in "\"'":
+            quote = char
+            out.append('"')
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+            checkpoints.append((len(out), list(stack)))
+        elif char in "}]":
+            _strip_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+            checkpoints.append((len(out), list(stack)))
+        elif char == ",":
+            checkpoints.append((len(out), list(stack)))
+            out.append(char)
+        else:
+            literal = next(
+                (name for name in _PYTHON_LITERALS if text.startswith(name, i)), None
+            )
+            if literal is not None and not text[i + len(literal) : i + len(literal) + 1].isalnum():
+                out.append(_PYTHON_LITERALS[literal])
+                i += len(literal)
+                continue
+            out.append(char)
+        i += 1
+
+    # Close whatever is still open
+    closed = list(out)
+    if quote is not None:
+        closed.append('"')
+    _strip_trailing_comma(closed)
+    attempts = ["".join(closed) + "".join(reversed(stack))]
+    for length, open_containers in reversed(checkpoints):
+        head = out[:length]
+        _strip_trailing_comma(head)
+        attempts.append("".join(head) + "".join(reversed(open_containers)))
+
+    error: Optional[json.JSONDecodeError] = None
+    for attempt in attempts:
+        try:
+            return json.loads(attempt)
+        except json.JSONDecodeError as e:
+            error = error or e
+    raise error or json.JSONDecodeError("Empty document", text, 0)
+
+
+def coerce_to_model(
+    data: Any,
+    model: type[BaseModel],
+    fallback: Optional[BaseModel] = None,
+    report: Optional[RepairReport] = None,
+) -> BaseModel:
+    """Adjust parsed data until it validates against a model.
+
+    Args:
+        data: Parsed JSON.
+        model: Model to validate against.
+        fallback: Instance whose values fill in missing or unusable fields.
+        report: Collects the fields that were changed.
+
+    Returns:
+        Validated model instance.
+
+    Raises:
+        ValidationError: If the data cannot be coerced.
+    """
+    data = copy.deepcopy(data)
+    if isinstance(data, list) and len(data) == 1:
+        data = data[0]
+    fallback_data = fallback.model_dump() if fallback is not None else None
+    report = report if report is not None else RepairReport()
+
+    for _ in range(MAX_COERCE_PASSES):
+        try:
+            return model.model_validate(data)
+        except ValidationError as e:
+            if not any(_apply_fix(data, error, fallback_data, report) for error in e.errors()):
+                raise
+    return model.model_validate(data)
+
+
+def repair_json(
+    text: str, model: type[BaseModel], fallback: Optional[BaseModel] = None
+) -> tuple[BaseModel, str, RepairReport]:
+    """Parse and validate model output, repairing it locally if needed.
+
+    Args:
+        text: Raw model output.
+        model: Model to validate against.
+        fallback: Instance whose values fill in missing or unusable fields.
+
+    Returns:
+        Tuple of (validated instance, name of the tier that succeeded,
+        fields the coerce tier changed).
+
+    Raises:
+        JsonRepairError: If no local tier produced a valid instance.
+    """
+    cleaned = strip_code_fences(text)
+    data, tier = _parse(cleaned)
+    report = RepairReport()
+
+    try:
+        return model.model_validate(data), tier, report
+    except ValidationError:
+        pass
+
+    report.coerce_used = True
+    try:
+        return coerce_to_model(data, model, fallback, report), "coerce", report
+    except ValidationError as e:
+        raise JsonRepairError(f"Output does not match schema: {e.error_count()} errors") from e
+
+
+def _parse(cleaned: str) -> tuple[Any, str]:
+    """Run the parsing tiers in order."""
+    try:
+        return json.loads(cleaned), "strict"
+    except json.JSONDecodeError:
+        pass
+
+    extracted = extract_json_object(cleaned)
+    if extracted is not None and extracted != cleaned:
+        try:
+            return json.loads(extracted), "extract"
+        except json.JSONDecodeError:
+            pass
+
+    try:
+        return tolerant_json_loads(extracted or cleaned), "tolerant"
+    except json.JSONDecodeError as e:
+        raise JsonRepairError("Output is not recoverable JSON") from e
+
+
+def _strip_trailing_comma(out: list[str]) -> None:
+    """Drop whitespace and a dangling comma from the end of ``out``."""
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _resolve(container: Any, path: tuple[Any, ...]) -> Any:
+    """Follow a validation error location into parsed data."""
+    for key in path:
+        if isinstance(container, dict) and key in container:
+            container = container[key]
+        elif isinstance(container, list) and isinstance(key, int) and key < len(container):
+            container = container[key]
+        else:
+            raise LookupError(path)
+    return container
+
+
+def _path(loc: tuple[Any, ...]) -> str:
+    """Dotted form of a validation error location."""
+    return ".".join(str(key) for key in loc)
+
+
+def _as_percentage(value: Any, bound: Any) -> Optional[float]:
+    """Read a number between 1 and 100 as a percentage of a 0-1 field."""
+    if bound != 1:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number / 100 if 1 < number <= 100 else None
+
+
+def _as_bool(value: Any) -> Optional[bool]:
+    """Read a known yes/no token, or None for anything else."""
+    token = str(value).strip().lower()
+    if token in _TRUE_TOKENS:
+        return True
+    if token in _FALSE_TOKENS:
+        return False
+    return None
+
+
+def _apply_fix(data: Any, error: ErrorDetails, fallback: Any, report: RepairReport) -> bool:
+    """Fix one validation error in place. Returns whether anything changed."""
+    loc = tuple(error["loc"])
+    if not loc:
+        return False
+    try:
+        parent = _resolve(data, loc[:-1])
+    except LookupError:
+        return False
+    key = loc[-1]
+    if not isinstance(parent, (dict, list)):
+        return False
+
+    kind = error["type"]
+    ctx = error.get("ctx", {})
+    value = error["input"]
+
+    try:
+        default = copy.deepcopy(_resolve(fallback, loc)) if fallback is not None else None
+        has_default = fallback is not None
+    except LookupError:
+        default, has_default = None, False
+
+    replacement: Any
+    changes = report.coerced
+    if kind == "string_too_long":
+        replacement = value[: ctx["max_length"]]
+    elif kind == "less_than_equal" and _as_percentage(value, ctx["le"]) is not None:
+        replacement = _as_percentage(value, ctx["le"])
+    elif kind in ("float_parsing", "int_parsing") and isinstance(value, str):
+        match = _NUMBER_PATTERN.search(value)
+        if match is None:
+            return _drop(data, loc, fallback, report)
+        replacement = float(match.group())
+        if "%" in value:
+            replacement /= 100
+    elif kind == "list_type":
+        replacement = [] if value is None else [value]
+    elif kind == "string_type" and isinstance(value, (int, float, bool)):
+        replacement = str(value)
+    elif kind == "string_type" and isinstance(value, list):
+        replacement = "; ".join(str(item) for item in value)
+    elif kind in ("bool_type", "bool_parsing") and _as_bool(value) is not None:
+        replacement = _as_bool(value)
+    elif has_default and kind in (
+        "missing",
+        "string_type",
+        "model_type",
+        "dict_type",
+        "model_attributes_type",
+        "bool_type",
+        "bool_parsing",
+        "less_than_equal",
+        "greater_than_equal",
+    ):
+        replacement, changes = default, report.filled
+    else:
+        return _drop(data, loc, fallback, report)
+
+    if isinstance(parent, dict):
+        parent[key] = replacement
+    elif isinstance(key, int) and key < len(parent):
+        parent[key] = replacement
+    else:
+        return False
+    changes.append(_path(loc))
+    return True
+
+
+def _drop(data: Any, loc: tuple[Any, ...], fallback: Any, report: RepairReport) -> bool:
+    """Discard the innermost list item or fallback-backed object holding an unfixable value.
+
+    Walks outwards from the value: a list element is removed, and an
+    enclosing object the fallback has a value for is replaced by it.
+    """
+    for depth in range(len(loc) - 1, -1, -1):
+        if isinstance(loc[depth], int):
+            try:
+                items = _resolve(data, loc[:depth])
+            except LookupError:
+                return False
+            if isinstance(items, list) and loc[depth] < len(items):
+                del items[loc[depth]]
+                report.dropped.append(_path(loc[: depth + 1]))
+                return True
+        elif depth < len(loc) - 1 and fallback is not None:
+            try:
+                default = copy.deepcopy(_resolve(fallback, loc[: depth + 1]))
+                parent = _resolve(data, loc[:depth])
+            except LookupError:
+                continue
+            if isinstance(parent, dict):
+                parent[loc[depth]] = default
+                report.filled.append(_path(loc[: depth + 1]))
+                return True
+    return False
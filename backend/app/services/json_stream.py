@@ -0,0 +1,124 @@
+"""Incremental JSON parsing for streamed model output."""
+
+import json
+from typing import Any, Iterable, Optional
+
+JsonPath = tuple[str, ...]
+
+
+class _Frame:
+    """One open JSON container."""
+
+    __slots__ = ("is_object", "key", "expecting_key")
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.expecting_key = is_object
+
+
+class IncrementalSectionParser:
+    """Emit selected sub-objects of a JSON document as soon as they close.
+
+    Feed the parser text chunks as they arrive. It tracks string, object and
+    array boundaries without building the full document, and returns each
+    watched path (e.g. ``("soap", "subjective")``) once its object or array
+    is complete. Anything before the first ``{`` (markdown fences, prose) is
+    skipped. Values at watched paths that are not valid JSON are dropped and
+    left for the final whole-document parse to handle.
+    """
+
+    def __init__(self, paths: Iterable[JsonPath]):
+        """Initialize the parser.
+
+        Args:
+            paths: Key paths whose values should be emitted.
+        """
+        self.paths = set(paths)
+        self._text = ""
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._open: dict[int, tuple[JsonPath, int]] = {}
+        self._started = False
+        self._finished = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> list[tuple[JsonPath, Any]]:
+        """Consume a chunk of model output.
+
+        Args:
+            chunk: Next piece of streamed text.
+
+        Returns:
+            (path, value) pairs for watched values completed by this chunk.
+        """
+        self._text += chunk
+        completed: list[tuple[JsonPath, Any]] = []
+        text = self._text
+
+        while self._pos < len(text) and not self._finished:
+            char = text[self._pos]
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    continue
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    frame = self._stack[-1] if self._stack else None
+                    if frame is not None and frame.is_object and frame.expecting_key:
+                        frame.key = json.loads(text[self._string_start : self._pos + 1])
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char in "{[":
+                path = self._current_path()
+                self._stack.append(_Frame(is_object=char == "{"))
+                if path in self.paths:
+                    self._open[len(self._stack)] = (path, self._pos)
+            elif char in "}]":
+                depth = len(self._stack)
+                self._stack.pop()
+                opened = self._open.pop(depth, None)
+                if opened is not None:
+                    path, start = opened
+                    try:
+                        completed.append((path, json.loads(text[start : self._pos + 1])))
+                    except json.JSONDecodeError:
+                        pass
+                if not self._stack:
+                    self._finished = True
+            elif char == ":":
+                if self._stack:
+                    self._stack[-1].expecting_key = False
+            elif char == ",":
+                if self._stack and self._stack[-1].is_object:
+                    self._stack[-1].expecting_key = True
+
+            self._pos += 1
+
+        return completed
+
+    def _current_path(self) -> Optional[JsonPath]:
+        """Key path of a value starting at the current position."""
+        path: list[str] = []
+        for frame in self._stack:
+            if not frame.is_object or frame.key is None:
+                return None
+            path.append(frame.key)
+        return tuple(path)
@@ -0,0 +1,279 @@
+"""Online master key rotation for patient data keys.
+
+To rotate, add the new master key to ``ENCRYPTION_MASTER_KEYS``, make it
+``ENCRYPTION_ACTIVE_MASTER_KEY`` and keep the old one configured. New data
+keys are wrapped with the new key straight away. ``KeyRotationJob`` rewraps
+the existing ones in throttled batches, committing each batch. Each update
+only applies if the row is still under its old key, so concurrent runs
+cannot clobber each other. The job resumes where it stopped because it only
+selects keys still under another master key. Once ``key_rotation_pending``
+reaches zero the old master key can be removed. Rewrapping never touches
+the transcripts themselves.
+
+The same job also re-seals transcripts written before data keys existed
+(``transcript_key_id`` NULL, sealed with the global key or Fernet) under
+their patient's data key. That happens once per session, in batches of the
+same size and under the same throttle. Each update only applies while the
+session is still unkeyed, and a rerun picks up whatever is still NULL.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, cast
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy import Table, bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import (
+    KEY_ROTATION_FAILURES,
+    KEY_ROTATION_PENDING,
+    KEY_ROTATION_RESEALED,
+    KEY_ROTATION_REWRAPPED,
+)
+from app.core.security import (
+    decrypt_data_async,
+    get_active_master_key_id,
+    unwrap_data_key,
+    wrap_data_key,
+)
+from app.db.models import PatientDataKey, Session
+from app.db.session import async_session
+from app.services.data_keys import DataKeyService, key_context
+
+settings = get_settings()
+logger = get_logger()
+
+
+@dataclass
+class RotationResult:
+    """Outcome of a rotation run."""
+
+    master_key_id: str
+    rewrapped: int = 0
+    resealed: int = 0
+    failed: int = 0
+    remaining: int = 0
+    unkeyed_remaining: int = 0
+
+
+class KeyRotationJob:
+    """Rewraps data keys held under other master keys with the active one."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        batch_size: Optional[int] = None,
+        rows_per_second: Optional[float] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        """Initialize the job.
+
+        Args:
+            session_factory: Session factory for the job's own transactions.
+            batch_size: Keys rewrapped or transcripts re-sealed per transaction.
+            rows_per_second: Throttle; 0 runs unthrottled.
+            sleep: Async sleep, for the throttle.
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.key_rotation_batch_size
+        self.rows_per_second = (
+            settings.key_rotation_rows_per_second if rows_per_second is None else rows_per_second
+        )
+        self._sleep = sleep
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def run(self) -> RotationResult:
+        """Rewrap data keys under the active master key and re-seal unkeyed transcripts.
+
+        Keys whose master key is missing or that fail to unwrap, and
+        transcripts that fail to decrypt, are logged, counted and skipped;
+        they stay pending.
+
+        Returns:
+            Counts for this run.
+        """
+        result = RotationResult(master_key_id=get_active_master_key_id())
+        await self._rewrap_keys(result)
+        await self._reseal_unkeyed_transcripts(result)
+
+        logger.info(
+            f"Key rotation to master key {result.master_key_id} finished",
+            extra={
+                "rewrapped": result.rewrapped,
+                "resealed": result.resealed,
+                "failed": result.failed,
+                "remaining": result.remaining,
+                "unkeyed_remaining": result.unkeyed_remaining,
+            },
+        )
+        return result
+
+    async def _rewrap_keys(self, result: RotationResult) -> None:
+        """Rewrap data keys under other master keys, one batch per transaction."""
+        active = result.master_key_id
+        table = cast(Table, PatientDataKey.__table__)
+        rewrap = (
+            update(table)
+            .where(table.c.id == bindparam("key_id"), table.c.master_key_id == bindparam("old_id"))
+            .values(
+                master_key_id=active,
+                wrapped_key=bindparam("new_key"),
+                rotated_at=bindparam("rotated_at"),
+            )
+        )
+
+        async with self.session_factory() as db:
+            pending = await self._pending(db, active)
+            KEY_ROTATION_PENDING.set(pending)
+            last_id = 0
+            while True:
+                started = time.monotonic()
+                rows = (
+                    await db.execute(
+                        select(
+                            table.c.id,
+                            table.c.patient_id,
+                            table.c.master_key_id,
+                            table.c.wrapped_key,
+                        )
+                        .where(table.c.master_key_id != active, table.c.id > last_id)
+                        .order_by(table.c.id)
+                        .limit(self.batch_size)
+                    )
+                ).all()
+                if not rows:
+                    break
+
+                now = datetime.now(timezone.utc)
+                params = []
+                for row in rows:
+                    context = key_context(row.patient_id)
+                    try:
+                        data_key = unwrap_data_key(row.master_key_id, row.wrapped_key, context)
+                    except (ValueError, InvalidToken) as e:
+                        logger.error(f"Cannot rotate data key {row.id}: {e}")
+                        KEY_ROTATION_FAILURES.inc()
+                        result.failed += 1
+                        continue
+                    _, new_key = wrap_data_key(data_key, context)
+                    params.append(
+                        {
+                            "key_id": row.id,
+                            "old_id": row.master_key_id,
+                            "new_key": new_key,
+                            "rotated_at": now,
+                        }
+                    )
+                if params:
+                    await db.execute(rewrap, params)
+                await db.commit()
+
+                result.rewrapped += len(params)
+                pending -= len(params)
+                KEY_ROTATION_REWRAPPED.inc(len(params))
+                KEY_ROTATION_PENDING.set(pending)
+                last_id = rows[-1].id
+                await self._throttle(started, len(rows))
+
+            result.remaining = await self._pending(db, active)
+            KEY_ROTATION_PENDING.set(result.remaining)
+
+    async def _reseal_unkeyed_transcripts(self, result: RotationResult) -> None:
+        """Re-seal transcripts that have no data key, one batch per transaction."""
+        table = cast(Table, Session.__table__)
+        reseal = (
+            update(table)
+            .where(table.c.id == bindparam("session_id"), table.c.transcript_key_id.is_(None))
+            .values(transcript_encrypted=bindparam("token"), transcript_key_id=bindparam("key_id"))
+        )
+
+        async with self.session_factory() as db:
+            data_keys = DataKeyService(db)
+            last_id = 0
+            while True:
+                started = time.monotonic()
+                rows = (
+                    await db.execute(
+                        select(table.c.id, table.c.patient_id, table.c.transcript_encrypted)
+                        .where(table.c.transcript_key_id.is_(None), table.c.id > last_id)
+                        .order_by(table.c.id)
+                        .limit(self.batch_size)
+                    )
+                ).all()
+                if not rows:
+                    break
+
+                params = []
+                for row in rows:
+                    try:
+                        transcript = await decrypt_data_async(row.transcript_encrypted)
+                    except InvalidToken:
+                        logger.error(f"Cannot re-seal transcript of session {row.id}")
+                        KEY_ROTATION_FAILURES.inc()
+                        result.failed += 1
+                        continue
+                    key_id, token = await data_keys.encrypt_transcript(row.patient_id, transcript)
+                    params.append({"session_id": row.id, "token": token, "key_id": key_id})
+                if params:
+                    await db.execute(reseal, params)
+                await db.commit()
+
+                result.resealed += len(params)
+                KEY_ROTATION_RESEALED.inc(len(params))
+                last_id = rows[-1].id
+                await self._throttle(started, len(rows))
+
+            result.unkeyed_remaining = (
+                await db.scalar(
+                    select(func.count(Session.id)).where(Session.transcript_key_id.is_(None))
+                )
+            ) or 0
+
+    async def _throttle(self, started: float, rows: int) -> None:
+        """Sleep off the rest of a batch's time budget."""
+        if self.rows_per_second > 0:
+            await self._sleep(max(0.0, rows / self.rows_per_second - (time.monotonic() - started)))
+
+    async def _pending(self, db: AsyncSession, active: str) -> int:
+        """Data keys not yet under the active master key."""
+        return (
+            await db.scalar(
+                select(func.count(PatientDataKey.id)).where(PatientDataKey.master_key_id != active)
+            )
+        ) or 0
+
+    async def start(self) -> None:
+        """Run the rotation in the background."""
+        if self._task:
+            return
+        self._task = asyncio.create_task(self._run_logged(), name="key-rotation")
+
+    async def stop(self) -> None:
+        """Stop a background rotation; committed batches are kept."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run_logged(self) -> None:
+        try:
+            await self.run()
+        except Exception as e:
+            logger.error(f"Key rotation failed: {e}")
+
+
+# Singleton instance
+_key_rotation_job: Optional[KeyRotationJob] = None
+
+
+def get_key_rotation_job() -> KeyRotationJob:
+    """Get the key rotation job singleton."""
+    global _key_rotation_job
+    if _key_rotation_job is None:
+        _key_rotation_job = KeyRotationJob()
+    return _key_rotation_job
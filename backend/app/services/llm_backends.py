@@ -0,0 +1,379 @@
+"""Model backends behind ``LLMClient``.
+
+``LLMClient`` owns prompts, parsing, retries and the circuit breaker; a
+backend only turns a prompt into text. ``GeminiBackend`` calls the Gemini
+API. ``FakeBackend`` answers locally with schema-valid output quoting the
+transcript, so the full generate path can be load-tested without a key.
+"""
+
+import asyncio
+import json
+import random
+import re
+from typing import Any, AsyncGenerator, Optional, Protocol
+
+import google.generativeai as genai
+from pydantic import BaseModel
+
+from app.core.config import Settings
+from app.schemas.ai import (
+    AiOutputSchema,
+    Citation,
+    DiagnosisItem,
+    DiagnosisSuggestion,
+    MedicationEducation,
+    MedicationItem,
+    SafetyPlan,
+    SafetyPlanItem,
+    SOAPNote,
+    SOAPSection,
+)
+from app.services.chunking import iter_citations
+from app.services.prompts import OUTPUT_SECTION_MODELS
+
+
+class LLMBackend(Protocol):
+    """Turns a prompt into model output text."""
+
+    model_name: str
+
+    async def generate(
+        self, prompt: str, temperature: float, max_output_tokens: int, timeout: float
+    ) -> str:
+        """Return the complete response text."""
+        ...
+
+    def stream(
+        self, prompt: str, temperature: float, max_output_tokens: int, timeout: float
+    ) -> AsyncGenerator[str, None]:
+        """Yield response text chunks as they are decoded."""
+        ...
+
+
+class GeminiBackend:
+    """Backend for the Gemini API."""
+
+    def __init__(self, model_name: str, api_key: Optional[str] = None, model: Any = None):
+        """Initialize the backend.
+
+        Args:
+            model_name: Gemini model name.
+            api_key: Gemini API key, used when ``model`` is not given.
+            model: Pre-built model object exposing ``generate_content_async``.
+        """
+        self.model_name = model_name
+        if model is None:
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(model_name)
+        self.model = model
+
+    async def generate(
+        self, prompt: str, temperature: float, max_output_tokens: int, timeout: float
+    ) -> str:
+        """Return the complete response text."""
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self._config(temperature, max_output_tokens),
+            request_options={"timeout": timeout},
+        )
+        return response.text
+
+    async def stream(
+        self, prompt: str, temperature: float, max_output_tokens: int, timeout: float
+    ) -> AsyncGenerator[str, None]:
+        """Yield response text chunks as they are decoded."""
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self._config(temperature, max_output_tokens),
+            stream=True,
+            request_options={"timeout": timeout},
+        )
+        async for chunk in response:
+            yield chunk.text
+
+    @staticmethod
+    def _config(temperature: float, max_output_tokens: int) -> Any:
+        """Build the SDK generation config."""
+        return genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+        )
+
+
+# Prompt sections holding the text the fake documents
+_PROMPT_BODY = re.compile(
+    r"(?:TRANSCRIPT|CLINICAL TEXT TO ANALYZE|EXCERPT DOCUMENTATION):\n---\n(.*)\n---", re.DOTALL
+)
+_SCHEMA_TITLE = re.compile(r'"title":\s*"(\w+)"')
+_SPEAKER_LINE = re.compile(r"^[ \t]*([A-Z][\w .'()-]{0,40}):[ \t]*(.+)$", re.MULTILINE)
+_SENTENCE = re.compile(r"[^.!?\s][^.!?]*[.!?]?")
+_WORD = re.compile(r"\S+")
+_DOSE = re.compile(r"\b([A-Za-z][a-z]{3,})\W{0,3}\d+\s?mg\b", re.IGNORECASE)
+
+_FAKE_DIAGNOSES = [
+    (re.compile(r"depress|low mood|hopeless", re.IGNORECASE), "Major depressive disorder (F32.9)"),
+    (re.compile(r"anxi|worr|panic", re.IGNORECASE), "Generalized anxiety disorder (F41.1)"),
+    (re.compile(r"sleep|insomnia|wake", re.IGNORECASE), "Insomnia disorder (G47.00)"),
+]
+_RISK_TERMS = re.compile(r"hurt|harm|suicid|kill|die|unsafe", re.IGNORECASE)
+_PATIENT_SPEAKERS = ("patient", "client", "pt")
+
+NOT_DOCUMENTED = "Not documented in session."
+
+
+class FakeBackend:
+    """Deterministic local stand-in for a model.
+
+    Output validates against whichever schema the prompt embeds (the full
+    output or one section) and quotes the prompt's transcript verbatim, with
+    offsets. Latency follows a fixed, uniform or lognormal distribution, and
+    a fraction of calls can fail or return truncated JSON.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 800.0,
+        distribution: str = "lognormal",
+        spread: float = 0.5,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: Optional[int] = None,
+        model_name: str = "fake-llm",
+    ):
+        """Initialize the backend.
+
+        Args:
+            latency_ms: Median call latency.
+            distribution: 'fixed', 'uniform' (+/- spread) or 'lognormal' (sigma = spread).
+            spread: Width of the latency distribution.
+            error_rate: Fraction of calls that raise ConnectionError.
+            malformed_rate: Fraction of calls that return truncated JSON.
+            seed: Seed for latency and fault injection.
+            model_name: Name recorded with generated suggestions.
+        """
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution '{distribution}'")
+        self.model_name = model_name
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.spread = spread
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "FakeBackend":
+        """Build a fake backend from ``FAKE_LLM_*`` settings."""
+        return cls(
+            latency_ms=settings.fake_llm_latency_ms,
+            distribution=settings.fake_llm_latency_distribution,
+            spread=settings.fake_llm_latency_spread,
+            error_rate=settings.fake_llm_error_rate,
+            malformed_rate=settings.fake_llm_malformed_rate,
+            seed=settings.fake_llm_seed,
+        )
+
+    async def generate(
+        self, prompt: str, temperature: float, max_output_tokens: int, timeout: float
+    ) -> str:
+        """Return the complete response text after a sampled delay."""
+        await self._wait(self.sample_latency())
+        return self._respond(prompt)
+
+    async def stream(
+        self, prompt: str, temperature: float, max_output_tokens: int, timeout: float
+    ) -> AsyncGenerator[str, None]:
+        """Yield the response in small chunks spread over a sampled delay."""
+        latency = self.sample_latency()
+        text = self._respond(prompt)
+        chunks = [text[i : i + 64] for i in range(0, len(text), 64)]
+        for chunk in chunks:
+            await self._wait(latency / len(chunks))
+            yield chunk
+
+    def sample_latency(self) -> float:
+        """Draw one call latency in seconds."""
+        median = self.latency_ms / 1000
+        if self.distribution == "fixed":
+            return median
+        if self.distribution == "uniform":
+            return max(0.0, median * self._random.uniform(1 - self.spread, 1 + self.spread))
+        return median * self._random.lognormvariate(0.0, self.spread)
+
+    async def _wait(self, seconds: float) -> None:
+        """Simulate model time."""
+        await asyncio.sleep(seconds)
+
+    def _respond(self, prompt: str) -> str:
+        """Build the response text for a prompt, applying fault injection."""
+        if self._random.random() < self.error_rate:
+            raise ConnectionError("Injected fake backend error")
+
+        output = build_fake_response(prompt)
+        if self._random.random() < self.malformed_rate:
+            return output[: max(1, len(output) * 3 // 4)]
+        return output
+
+
+def build_fake_response(prompt: str) -> str:
+    """Answer a generation, section, reduce or fix prompt with valid JSON."""
+    body_match = _PROMPT_BODY.search(prompt)
+    body = body_match.group(1) if body_match else ""
+
+    if "EXCERPT DOCUMENTATION:" in prompt:
+        output = _merge_findings(body)
+    else:
+        output = build_fake_output(body)
+
+    titles = set(_SCHEMA_TITLE.findall(prompt))
+    if "AiOutputSchema" not in titles:
+        for section, model in OUTPUT_SECTION_MODELS.items():
+            if model.__name__ in titles:
+                section_output: BaseModel = getattr(output, section)
+                return section_output.model_dump_json()
+    return output.model_dump_json()
+
+
+def build_fake_output(transcript: str) -> AiOutputSchema:
+    """Document a transcript using its own sentences as evidence.
+
+    Args:
+        transcript: Transcript text as it appears in the prompt.
+
+    Returns:
+        Output whose citations are verbatim quotes with correct offsets.
+    """
+    turns = [
+        (match.group(1).strip().lower(), match.start(2), match.group(2))
+        for match in _SPEAKER_LINE.finditer(transcript)
+    ]
+    if turns:
+        patient = [turn for turn in turns if turn[0].startswith(_PATIENT_SPEAKERS)]
+        clinician = [turn for turn in turns if not turn[0].startswith(_PATIENT_SPEAKERS)]
+    else:
+        # Narrative note without speaker labels: every sentence is evidence
+        turns = [("", match.start(), match.group()) for match in _SENTENCE.finditer(transcript)]
+        patient = clinician = turns
+
+    def section(prefix: str, picked: list[tuple[str, int, str]]) -> SOAPSection:
+        if not picked:
+            return SOAPSection(content=NOT_DOCUMENTED, citations=[])
+        citations = [_quote(offset, text) for _, offset, text in picked]
+        return SOAPSection(
+            content=f"{prefix}: " + " ".join(citation.text for citation in citations),
+            citations=citations,
+        )
+
+    symptomatic = [
+        turn for turn in patient if any(p.search(turn[2]) for p, _ in _FAKE_DIAGNOSES)
+    ]
+    soap = SOAPNote(
+        subjective=section("Patient reports", patient[:2]),
+        objective=section("Clinician observes", clinician[:1]),
+        assessment=section("Presentation consistent with", symptomatic[:2] or patient[-1:]),
+        plan=section("Plan discussed", clinician[-1:]),
+    )
+
+    diagnoses: list[DiagnosisItem] = []
+    for pattern, name in _FAKE_DIAGNOSES:
+        evidence = next((turn for turn in patient if pattern.search(turn[2])), None)
+        if evidence is not None:
+            diagnoses.append(
+                DiagnosisItem(
+                    diagnosis=name,
+                    confidence=round(0.8 - 0.15 * len(diagnoses), 2),
+                    rationale="Symptoms described by the patient during the session.",
+                    citations=[_quote(evidence[1], evidence[2])],
+                )
+            )
+
+    medications = []
+    seen: set[str] = set()
+    for _, offset, text in turns:
+        for match in _DOSE.finditer(text):
+            name = match.group(1).lower()
+            if name not in seen:
+                seen.add(name)
+                medications.append(
+                    MedicationItem(
+                        medication=name.capitalize(),
+                        education=f"Continue {name} as prescribed; report side effects.",
+                        warnings=["Do not stop abruptly without discussing with prescriber."],
+                        citations=[_quote(offset, text)],
+                    )
+                )
+
+    warning_signs = [
+        SafetyPlanItem(item="Discussed during session", citations=[_quote(offset, text)])
+        for _, offset, text in patient
+        if _RISK_TERMS.search(text)
+    ][:3]
+
+    return AiOutputSchema(
+        soap=soap,
+        diagnosis=DiagnosisSuggestion(
+            primary=diagnoses[0] if diagnoses else None,
+            differential=diagnoses[1:],
+        ),
+        medications=MedicationEducation(
+            medications=medications,
+            general_guidance="Take medications as prescribed." if medications else None,
+        ),
+        safety_plan=SafetyPlan(warning_signs=warning_signs),
+    )
+
+
+def _quote(offset: int, text: str) -> Citation:
+    """Cite up to the first 25 words (150 characters) of a turn."""
+    words = list(_WORD.finditer(text))[:25]
+    end = words[-1].end() if words else 0
+    quote = text[:end]
+    if len(quote) > 150:
+        quote = quote[:150].rsplit(" ", 1)[0]
+    return Citation(text=quote, start_offset=offset, end_offset=offset + len(quote))
+
+
+def _merge_findings(findings: str) -> AiOutputSchema:
+    """Reduce step: per section, keep the first excerpt that has evidence."""
+    try:
+        documents = [
+            AiOutputSchema.model_validate(entry["documentation"]) for entry in json.loads(findings)
+        ]
+    except (ValueError, KeyError, TypeError):
+        return build_fake_output("")
+    if not documents:
+        return build_fake_output("")
+
+    merged = documents[0].model_copy()
+    for section in OUTPUT_SECTION_MODELS:
+        for document in documents:
+            if any(True for _ in iter_citations(getattr(document, section))):
+                setattr(merged, section, getattr(document, section))
+                break
+    return merged
+
+
+def create_llm_backend(
+    settings: Settings, model_name: str, api_key: Optional[str]
+) -> Optional[LLMBackend]:
+    """Build the backend selected by ``LLM_BACKEND``.
+
+    Args:
+        settings: Application settings.
+        model_name: Gemini model name.
+        api_key: Gemini API key.
+
+    Returns:
+        The backend, or None if Gemini is selected without an API key.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if settings.llm_backend == "fake":
+        return FakeBackend.from_settings(settings)
+    if settings.llm_backend == "gemini":
+        if not api_key:
+            return None
+        return GeminiBackend(model_name, api_key=api_key)
+    raise ValueError(f"Unknown LLM backend '{settings.llm_backend}'")
+
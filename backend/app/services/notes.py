@@ -1,21 +1,128 @@
 """Notes service for managing clinical documentation."""
 
 import json
-from typing import Optional
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
 
-from sqlalchemy import select, func
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.core.security import encrypt_data, decrypt_data, hash_for_audit
+from app.core.security import hash_for_audit
 from app.db.models import Session, AiSuggestion, NoteVersion, NoteStatus
-from app.schemas.ai import AiOutputSchema, GenerateResponse
+from app.schemas.ai import (
+    AiOutputSchema,
+    DiagnosisSuggestion,
+    GenerateResponse,
+    MedicationEducation,
+    SafetyPlan,
+    SOAPSection,
+)
+from app.services.generation_cache import (
+    GenerationCache,
+    GenerationCacheKey,
+    get_generation_cache,
+)
 from app.services.llm_client import LLMClient, get_llm_client
+from app.services.resilience import CircuitOpenError
 from app.services.guardrails import GuardrailsService
 from app.services.audit import AuditService
-
+from app.services.data_keys import DataKeyService
+from app.services.json_repair import RepairReport
+from app.services.json_stream import IncrementalSectionParser, JsonPath
+from app.services.prompts import (
+    OUTPUT_SECTION_MODELS,
+    get_prompt_template,
+    get_schema_version,
+)
+
+settings = get_settings()
 logger = get_logger()
 
+# Top-level output sections streamed to clients, in schema order
+SECTION_MODELS: dict[JsonPath, type[BaseModel]] = {
+    ("soap", "subjective"): SOAPSection,
+    ("soap", "objective"): SOAPSection,
+    ("soap", "assessment"): SOAPSection,
+    ("soap", "plan"): SOAPSection,
+    ("diagnosis",): DiagnosisSuggestion,
+    ("medications",): MedicationEducation,
+    ("safety_plan",): SafetyPlan,
+}
+
+
+def iter_output_sections(output: AiOutputSchema) -> list[tuple[str, BaseModel]]:
+    """Split a complete output into the sections streamed to clients."""
+    sections: list[tuple[str, BaseModel]] = []
+    for path in SECTION_MODELS:
+        value: Any = output
+        for key in path:
+            value = getattr(value, key)
+        sections.append((".".join(path), value))
+    return sections
+
+
+def generation_failure_warning(error: Exception) -> str:
+    """Describe why generation fell back to an empty note."""
+    if isinstance(error, CircuitOpenError):
+        return (
+            "AI service is temporarily unavailable after repeated failures. "
+            f"An empty note was created; please try again shortly. ({error})"
+        )
+    return f"AI generation failed: {str(error)}"
+
+
+def section_failure_warning(failed_sections: list[str]) -> Optional[str]:
+    """Describe sections left empty by a partially failed parallel generation."""
+    if not failed_sections:
+        return None
+    return (
+        f"AI generation failed for sections: {', '.join(failed_sections)}. "
+        "These sections are empty."
+    )
+
+
+def repair_warning(report: RepairReport) -> Optional[str]:
+    """Describe fields local repair changed so the output would fit the schema."""
+    if not report.changed:
+        return None
+    changes = []
+    if report.filled:
+        changes.append(f"replaced with empty defaults: {', '.join(report.filled)}")
+    if report.dropped:
+        changes.append(f"removed: {', '.join(report.dropped)}")
+    if report.coerced:
+        changes.append(f"converted: {', '.join(report.coerced)}")
+    return (
+        "AI output did not match the expected format and was repaired; "
+        f"review these fields before signing. {'; '.join(changes)}."
+    )
+
+
+def join_warnings(*warnings: Optional[str]) -> Optional[str]:
+    """Combine the warnings that apply, or None if there are none."""
+    return " ".join(warning for warning in warnings if warning) or None
+
+
+@dataclass
+class GenerationContext:
+    """A session's screened transcript and the settings to generate with."""
+
+    session_id: int
+    transcript: str
+    prompt_version: str
+    model_name: str
+    injection_detected: bool
+    safe_mode: bool
+    parallel: bool
+    chunked: bool
+    warning_message: Optional[str]
+    cache_key: GenerationCacheKey
+    use_cache: bool
+
 
 class NotesService:
     """Service for managing clinical notes and AI generation."""
@@ -24,15 +131,18 @@ class NotesService:
         self,
         db: AsyncSession,
         llm_client: Optional[LLMClient] = None,
+        generation_cache: Optional[GenerationCache] = None,
     ):
         """Initialize notes service.
         
         Args:
             db: Database session.
             llm_client: LLM client instance.
+            generation_cache: Generation cache instance.
         """
         self.db = db
         self.llm_client = llm_client or get_llm_client()
+        self.generation_cache = generation_cache or get_generation_cache()
         self.guardrails = GuardrailsService()
         self.audit = AuditService(db)
 
@@ -44,27 +154,277 @@ class NotesService:
         model_name: Optional[str] = None,
         mode: str = "full",
         temperature: float = 0.0,
+        bypass_cache: bool = False,
     ) -> GenerateResponse:
         """Generate AI suggestions for a session.
         
+        Identical inputs (same transcript, prompt, model, mode, temperature and
+        schema) are served from the generation cache without a model call.
+        Transcripts longer than ``transcript_chunk_threshold_chars`` are
+        generated with map-reduce over chunks instead of being truncated.
+        
+        The transcript is read in its own transaction, which is committed
+        before the model call so no pooled connection (or SQLite lock) is held
+        while the model runs. The suggestion, version and audit rows are then
+        written in a second, short transaction that the caller commits.
+        
         Args:
             session_id: Session ID to generate for.
             user_id: User requesting generation.
             prompt_version: Version of prompt template.
             model_name: Override model name.
-            mode: 'full' or 'safe' mode.
+            mode: 'full', 'safe' or 'parallel' mode.
             temperature: Generation temperature.
+            bypass_cache: Always call the model.
             
         Returns:
             GenerateResponse with AI suggestions.
         """
+        context = await self._prepare_generation(
+            session_id=session_id,
+            prompt_version=prompt_version,
+            model_name=model_name,
+            mode=mode,
+            temperature=temperature,
+            bypass_cache=bypass_cache,
+        )
+
+        cached_json = await self._lookup_cached(context)
+        if cached_json is not None:
+            output = AiOutputSchema.model_validate_json(cached_json)
+            return await self._store_generation(
+                context, user_id, output, latency_ms=0, cached=True
+            )
+        await self._release_connection()
+
+        # Generate AI output
+        failed_sections: list[str] = []
+        repairs = RepairReport()
+        try:
+            if context.chunked:
+                output, latency_ms = await self.llm_client.generate_chunked(
+                    transcript=context.transcript,
+                    temperature=temperature,
+                    safe_mode=context.safe_mode,
+                    prompt_version=context.prompt_version,
+                    repairs=repairs,
+                )
+            elif context.parallel:
+                output, latency_ms, failed_sections = await self.llm_client.generate_sections(
+                    transcript=context.transcript,
+                    temperature=temperature,
+                    safe_mode=context.safe_mode,
+                    prompt_version=context.prompt_version,
+                    repairs=repairs,
+                )
+            else:
+                output, latency_ms = await self.llm_client.generate(
+                    transcript=context.transcript,
+                    temperature=temperature,
+                    safe_mode=context.safe_mode,
+                    prompt_version=context.prompt_version,
+                    repairs=repairs,
+                )
+        except Exception as e:
+            logger.error(f"AI generation failed: {e}")
+            # Create empty output on failure
+            output = self.llm_client.create_empty_output()
+            return await self._store_generation(
+                context,
+                user_id,
+                output,
+                latency_ms=0,
+                warning_message=generation_failure_warning(e),
+            )
+
+        return await self._store_generation(
+            context,
+            user_id,
+            output,
+            latency_ms=latency_ms,
+            warning_message=join_warnings(
+                section_failure_warning(failed_sections), repair_warning(repairs)
+            ),
+            repaired=repairs.coerce_used,
+        )
+
+    async def stream_ai_suggestions(
+        self,
+        session_id: int,
+        user_id: int,
+        prompt_version: str = "v1",
+        model_name: Optional[str] = None,
+        mode: str = "full",
+        temperature: float = 0.0,
+        bypass_cache: bool = False,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Generate AI suggestions, yielding each section as soon as it is ready.
+        
+        Yields a ``meta`` event first, then one ``section`` event per completed
+        top-level section that validates against its schema, then ``complete``
+        with the persisted GenerateResponse. Persistence, and the connection
+        being released during the model call, are as in
+        ``generate_ai_suggestions``.
+        
+        Args:
+            session_id: Session ID to generate for.
+            user_id: User requesting generation.
+            prompt_version: Version of prompt template.
+            model_name: Override model name.
+            mode: 'full', 'safe' or 'parallel' mode.
+            temperature: Generation temperature.
+            bypass_cache: Always call the model.
+            
+        Yields:
+            (event name, payload) tuples.
+        """
+        context = await self._prepare_generation(
+            session_id=session_id,
+            prompt_version=prompt_version,
+            model_name=model_name,
+            mode=mode,
+            temperature=temperature,
+            bypass_cache=bypass_cache,
+        )
+        yield "meta", {
+            "injection_detected": context.injection_detected,
+            "safety_mode": context.safe_mode,
+            "warning_message": context.warning_message,
+        }
+
+        cached_json = await self._lookup_cached(context)
+        if cached_json is not None:
+            output = AiOutputSchema.model_validate_json(cached_json)
+            for name, section in iter_output_sections(output):
+                yield "section", {"section": name, "data": section.model_dump(mode="json")}
+            response = await self._store_generation(
+                context, user_id, output, latency_ms=0, cached=True
+            )
+            yield "complete", response
+            return
+        await self._release_connection()
+
+        start_time = time.time()
+        failed_sections: list[str] = []
+        repairs = RepairReport()
+        try:
+            if context.chunked:
+                # Sections are only known once the reduce step has finished
+                output, latency_ms = await self.llm_client.generate_chunked(
+                    transcript=context.transcript,
+                    temperature=temperature,
+                    safe_mode=context.safe_mode,
+                    prompt_version=context.prompt_version,
+                    repairs=repairs,
+                )
+                for name, section in iter_output_sections(output):
+                    yield "section", {"section": name, "data": section.model_dump(mode="json")}
+            elif context.parallel:
+                # Each section arrives whole from its own call
+                output = self.llm_client.create_empty_output()
+                failed: dict[str, Exception] = {}
+                async for name, result in self.llm_client.iter_sections(
+                    transcript=context.transcript,
+                    temperature=temperature,
+                    safe_mode=context.safe_mode,
+                    prompt_version=context.prompt_version,
+                    repairs=repairs,
+                ):
+                    if isinstance(result, Exception):
+                        failed[name] = result
+                        continue
+                    setattr(output, name, result)
+                    for section_name, section in iter_output_sections(output):
+                        if section_name.split(".")[0] == name:
+                            yield "section", {
+                                "section": section_name,
+                                "data": section.model_dump(mode="json"),
+                            }
+                if len(failed) == len(OUTPUT_SECTION_MODELS):
+                    raise next(iter(failed.values()))
+                failed_sections = sorted(failed)
+                latency_ms = int((time.time() - start_time) * 1000)
+            else:
+                parser = IncrementalSectionParser(SECTION_MODELS)
+                async for chunk in self.llm_client.generate_stream(
+                    transcript=context.transcript,
+                    temperature=temperature,
+                    safe_mode=context.safe_mode,
+                    prompt_version=context.prompt_version,
+                ):
+                    for path, value in parser.feed(chunk):
+                        try:
+                            section = SECTION_MODELS[path].model_validate(value)
+                        except ValidationError:
+                            continue
+                        yield "section", {
+                            "section": ".".join(path),
+                            "data": section.model_dump(mode="json"),
+                        }
+                latency_ms = int((time.time() - start_time) * 1000)
+                output = await self.llm_client.parse_output(
+                    parser.text, temperature, context.prompt_version, repairs=repairs
+                )
+        except Exception as e:
+            logger.error(f"AI generation failed: {e}")
+            output = self.llm_client.create_empty_output()
+            response = await self._store_generation(
+                context,
+                user_id,
+                output,
+                latency_ms=0,
+                warning_message=generation_failure_warning(e),
+            )
+            yield "complete", response
+            return
+
+        response = await self._store_generation(
+            context,
+            user_id,
+            output,
+            latency_ms=latency_ms,
+            warning_message=join_warnings(
+                section_failure_warning(failed_sections), repair_warning(repairs)
+            ),
+            repaired=repairs.coerce_used,
+        )
+        yield "complete", response
+
+    async def _prepare_generation(
+        self,
+        session_id: int,
+        prompt_version: str,
+        model_name: Optional[str],
+        mode: str,
+        temperature: float,
+        bypass_cache: bool,
+    ) -> GenerationContext:
+        """Load and screen a session's transcript ahead of generation.
+        
+        Args:
+            session_id: Session ID to generate for.
+            prompt_version: Version of prompt template.
+            model_name: Override model name.
+            mode: 'full', 'safe' or 'parallel' mode.
+            temperature: Generation temperature.
+            bypass_cache: Always call the model.
+            
+        Returns:
+            Everything needed to run and store the generation.
+            
+        Raises:
+            ValueError: If the session or prompt version does not exist.
+        """
+        # Fail before any model call if the version is not registered
+        get_prompt_template(prompt_version)
+
         # Get session with encrypted transcript
         session = await self.db.get(Session, session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
 
         # Decrypt transcript
-        transcript = decrypt_data(session.transcript_encrypted)
+        transcript = await DataKeyService(self.db).decrypt_transcript(session)
 
         # Check for prompt injection
         injection_detected, patterns = self.guardrails.scan_for_injection(transcript)
@@ -83,52 +443,124 @@ class NotesService:
                 extra={"session_id": session_id, "pattern_count": len(patterns)},
             )
 
-        # Generate AI output
-        try:
-            output, latency_ms = await self.llm_client.generate(
-                transcript=transcript,
-                temperature=temperature,
-                safe_mode=safe_mode,
-            )
-        except Exception as e:
-            logger.error(f"AI generation failed: {e}")
-            # Create empty output on failure
-            output = self.llm_client.create_empty_output()
-            latency_ms = 0
-            warning_message = f"AI generation failed: {str(e)}"
+        # Long transcripts are chunked whatever mode was asked for
+        chunked = len(transcript) > settings.transcript_chunk_threshold_chars
+        parallel = mode == "parallel"
+        if chunked:
+            generation_mode = "chunked"
+        elif parallel:
+            generation_mode = "parallel"
+        else:
+            generation_mode = "full"
+
+        resolved_model_name = model_name or self.llm_client.model_name
+        cache_key = GenerationCacheKey(
+            transcript_hash=session.transcript_hash,
+            prompt_version=prompt_version,
+            model_name=resolved_model_name,
+            safe_mode=safe_mode,
+            temperature=temperature,
+            schema_version=get_schema_version(),
+            generation_mode=generation_mode,
+        )
 
-        # Store AI suggestion
-        ai_suggestion = AiSuggestion(
+        return GenerationContext(
             session_id=session_id,
-            model_name=model_name or self.llm_client.model_name,
+            transcript=transcript,
             prompt_version=prompt_version,
-            raw_json=output.model_dump_json(),
-            injection_flag=injection_detected,
-            safety_mode=safe_mode,
+            model_name=resolved_model_name,
+            injection_detected=injection_detected,
+            safe_mode=safe_mode,
+            parallel=parallel,
+            chunked=chunked,
+            warning_message=warning_message,
+            cache_key=cache_key,
+            use_cache=settings.generation_cache_enabled and not bypass_cache,
+        )
+
+    async def _lookup_cached(self, context: GenerationContext) -> Optional[str]:
+        """Get a cached raw JSON output for this generation, if allowed."""
+        if not context.use_cache:
+            return None
+        return await self.generation_cache.lookup(self.db, context.cache_key)
+
+    async def _release_connection(self) -> None:
+        """End the read transaction ahead of a model call.
+        
+        Nothing has been written yet, so this only hands the connection back
+        to the pool; the next statement starts a new transaction.
+        """
+        await self.db.commit()
+
+    async def _store_generation(
+        self,
+        context: GenerationContext,
+        user_id: int,
+        output: AiOutputSchema,
+        latency_ms: int,
+        cached: bool = False,
+        warning_message: Optional[str] = None,
+        repaired: bool = False,
+    ) -> GenerateResponse:
+        """Persist an AI suggestion and its draft version.
+        
+        Args:
+            context: Prepared generation.
+            user_id: User requesting generation.
+            output: Validated (or fallback) output.
+            latency_ms: Model latency.
+            cached: Whether the output came from the generation cache.
+            warning_message: Failure or repair warning; such outputs are never cached.
+            repaired: Whether the output only fit the schema after coercion; never cached.
+            
+        Returns:
+            GenerateResponse with AI suggestions.
+        """
+        raw_json = output.model_dump_json()
+
+        # Only fresh, successful generations that needed no coercion are reusable
+        stored_cache_key = None
+        if not cached and warning_message is None and not repaired:
+            stored_cache_key = context.cache_key.digest
+            if settings.generation_cache_enabled:
+                # A bypassed call still refreshes the cache for later requests
+                self.generation_cache.set(stored_cache_key, raw_json)
+
+        # Store AI suggestion
+        ai_suggestion = AiSuggestion(
+            session_id=context.session_id,
+            model_name=context.model_name,
+            prompt_version=context.prompt_version,
+            raw_json=raw_json,
+            injection_flag=context.injection_detected,
+            safety_mode=context.safe_mode,
             gemini_latency_ms=latency_ms,
+            cache_key=stored_cache_key,
         )
         self.db.add(ai_suggestion)
         await self.db.flush()
 
         # Create new draft version
         version = await self._create_version_from_ai(
-            session_id=session_id,
+            session_id=context.session_id,
             user_id=user_id,
             ai_suggestion_id=ai_suggestion.id,
             output=output,
         )
+        await self._set_latest_version(version, has_ai_suggestions=True)
 
         return GenerateResponse(
             ai_suggestion_id=ai_suggestion.id,
             note_version_id=version.id,
-            injection_detected=injection_detected,
-            safety_mode=safe_mode,
-            warning_message=warning_message,
+            injection_detected=context.injection_detected,
+            safety_mode=context.safe_mode,
+            warning_message=warning_message or context.warning_message,
             soap=output.soap,
             diagnosis=output.diagnosis,
             medications=output.medications,
             safety_plan=output.safety_plan,
             gemini_latency_ms=latency_ms,
+            cached=cached,
         )
 
     async def _create_version_from_ai(
@@ -149,16 +581,9 @@ class NotesService:
         Returns:
             Created NoteVersion.
         """
-        # Get next version number
-        result = await self.db.execute(
-            select(func.max(NoteVersion.version_number))
-            .where(NoteVersion.session_id == session_id)
-        )
-        max_version = result.scalar() or 0
-
         version = NoteVersion(
             session_id=session_id,
-            version_number=max_version + 1,
+            version_number=await self._next_version_number(session_id),
             status=NoteStatus.DRAFT.value,
             soap_json=output.soap.model_dump_json(),
             dx_json=output.diagnosis.model_dump_json(),
@@ -181,6 +606,50 @@ class NotesService:
 
         return version
 
+    async def _next_version_number(self, session_id: int) -> int:
+        """Allocate the session's next version number.
+        
+        The increment and read are one statement, and the row lock it takes
+        (SQLite: the database write lock) is held until the caller commits,
+        so concurrent writers always get distinct, consecutive numbers.
+        
+        Args:
+            session_id: Session ID.
+            
+        Returns:
+            The allocated version number.
+        """
+        result = await self.db.execute(
+            update(Session)
+            .where(Session.id == session_id)
+            .values(version_count=Session.version_count + 1)
+            .returning(Session.version_count)
+        )
+        version_number = result.scalar_one_or_none()
+        if version_number is None:
+            raise ValueError(f"Session {session_id} not found")
+        return version_number
+
+    async def _set_latest_version(self, version: NoteVersion, **summary: Any) -> None:
+        """Point the session's summary columns at its newest version.
+        
+        Runs in the caller's transaction, so the summary commits or rolls
+        back together with the version itself.
+        
+        Args:
+            version: Newly created version (always the highest number).
+            **summary: Other Session summary columns to set.
+        """
+        await self.db.execute(
+            update(Session)
+            .where(Session.id == version.session_id)
+            .values(
+                latest_version_id=version.id,
+                latest_version_status=version.status,
+                **summary,
+            )
+        )
+
     async def update_version(
         self,
         version_id: int,
@@ -270,6 +739,11 @@ class NotesService:
 
         before_status = version.status
         version.status = NoteStatus.FINAL.value
+        await self.db.execute(
+            update(Session)
+            .where(Session.id == version.session_id, Session.latest_version_id == version.id)
+            .values(latest_version_status=version.status)
+        )
 
         await self.audit.log(
             actor_user_id=user_id,
@@ -310,17 +784,10 @@ class NotesService:
         if target.session_id != session_id:
             raise ValueError("Target version does not belong to this session")
 
-        # Get next version number
-        result = await self.db.execute(
-            select(func.max(NoteVersion.version_number))
-            .where(NoteVersion.session_id == session_id)
-        )
-        max_version = result.scalar() or 0
-
         # Create new version with old content
         new_version = NoteVersion(
             session_id=session_id,
-            version_number=max_version + 1,
+            version_number=await self._next_version_number(session_id),
             status=NoteStatus.DRAFT.value,
             soap_json=target.soap_json,
             dx_json=target.dx_json,
@@ -331,6 +798,7 @@ class NotesService:
         )
         self.db.add(new_version)
         await self.db.flush()
+        await self._set_latest_version(new_version)
 
         await self.audit.log(
             actor_user_id=user_id,
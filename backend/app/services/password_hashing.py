@@ -0,0 +1,118 @@
+"""Bounded thread pool for password hashing.
+
+bcrypt costs a few hundred milliseconds of CPU per call at the default cost.
+Run inline it blocks the event loop, so a burst of logins stalls every other
+request. The bcrypt extension releases the GIL while hashing, so a small
+thread pool keeps the loop free without the pickling and start-up cost of
+worker processes. Submissions beyond ``workers + max_queue`` are rejected
+with ``HashingPoolFullError`` instead of queueing without bound.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import get_settings
+from app.core.metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_IN_FLIGHT,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_REJECTIONS,
+)
+from app.core.security import get_password_hash, verify_and_update_password
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class HashingPoolFullError(RuntimeError):
+    """Too many password hashes are already running or waiting."""
+
+
+class PasswordHasher:
+    """Runs password hashing and verification on a bounded thread pool."""
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None):
+        """Initialize the hasher.
+
+        Args:
+            workers: Hashing threads.
+            max_queue: Hashes allowed to wait for a thread.
+        """
+        self.workers = workers or settings.password_hash_workers
+        self.max_queue = settings.password_hash_max_queue if max_queue is None else max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="password-hash"
+        )
+        self._pending = 0  # Submitted and not yet finished
+
+    @property
+    def queue_depth(self) -> int:
+        """Hashes waiting for a thread."""
+        return max(0, self._pending - self.workers)
+
+    async def verify(self, password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+        """Verify a password against its stored hash.
+
+        Args:
+            password: Plain password.
+            password_hash: Stored hash.
+
+        Returns:
+            (valid, new_hash); ``new_hash`` is set when the stored hash uses a
+            different cost and should be replaced.
+
+        Raises:
+            HashingPoolFullError: If the pool has no room.
+        """
+        return await self._run("verify", verify_and_update_password, password, password_hash)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost.
+
+        Raises:
+            HashingPoolFullError: If the pool has no room.
+        """
+        return await self._run("hash", get_password_hash, password)
+
+    async def _run(self, operation: str, func: Callable[..., T], *args: str) -> T:
+        """Run one hashing call on the pool, or reject it if the pool is full."""
+        if self._pending >= self.workers + self.max_queue:
+            PASSWORD_HASH_REJECTIONS.inc()
+            raise HashingPoolFullError(
+                f"Password hashing pool is full ({self._pending} pending)"
+            )
+
+        self._pending += 1
+        self._record_depth()
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            self._record_depth()
+            PASSWORD_HASH_DURATION.labels(operation=operation).observe(
+                time.perf_counter() - start
+            )
+
+    def _record_depth(self) -> None:
+        """Export the running and waiting counts."""
+        PASSWORD_HASH_IN_FLIGHT.set(min(self._pending, self.workers))
+        PASSWORD_HASH_QUEUE_DEPTH.set(self.queue_depth)
+
+    def shutdown(self) -> None:
+        """Stop the hashing threads once submitted work finishes."""
+        self._executor.shutdown(wait=True)
+
+
+_password_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get the password hasher singleton."""
+    global _password_hasher
+    if _password_hasher is None:
+        _password_hasher = PasswordHasher()
+    return _password_hasher
@@ -0,0 +1,174 @@
+"""In-process cache of authenticated user principals.
+
+Role checks only need a user's id, role and active flag, so those are cached
+per user id with a TTL and LRU bound instead of reading the users table on
+every request. Any ORM flush that inserts, changes or deletes a ``User``
+drops that user's entry, again once the transaction commits, so role
+changes and deactivations apply on the next request. A bulk ``update(User)``
+or ``delete(User)`` run through a session clears the whole cache, since the
+rows it touches are not known. Changes made by other processes, or on a raw
+connection, are picked up when the entry expires, so the TTL is kept to a
+few seconds.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from sqlalchemy import Delete, Update, event
+from sqlalchemy.orm import ORMExecuteState
+from sqlalchemy.orm import Session as OrmSession
+
+from app.core.config import get_settings
+from app.core.metrics import PRINCIPAL_CACHE_HIT_RATIO, PRINCIPAL_CACHE_LOOKUPS
+from app.db.models import User
+
+settings = get_settings()
+
+# Session.info key for users changed in the current transaction
+_CHANGED_USERS = "principal_cache_changed_users"
+# Session.info flag for a bulk write to users in the current transaction
+_BULK_CHANGED_USERS = "principal_cache_bulk_changed_users"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The parts of a user that authorization needs."""
+
+    id: int
+    role: str
+    is_active: bool
+
+
+class PrincipalCache:
+    """LRU cache of active principals with TTL."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum entries before LRU eviction.
+            ttl_seconds: Entry lifetime in seconds.
+            clock: Monotonic time source.
+        """
+        self.max_entries = max_entries or settings.principal_cache_max_entries
+        self.ttl_seconds = ttl_seconds or settings.principal_cache_ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+        self._hits = 0
+        self._lookups = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        """Get a cached principal.
+
+        Args:
+            user_id: User ID.
+
+        Returns:
+            Principal, or None on miss or expiry.
+        """
+        principal = None
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            expires_at, principal = entry
+            if expires_at < self._clock():
+                del self._entries[user_id]
+                principal = None
+            else:
+                self._entries.move_to_end(user_id)
+
+        self._record(principal is not None)
+        return principal
+
+    def set(self, principal: Principal) -> None:
+        """Cache a principal.
+
+        Args:
+            principal: Principal loaded from the database.
+        """
+        self._entries[principal.id] = (self._clock() + self.ttl_seconds, principal)
+        self._entries.move_to_end(principal.id)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's entry."""
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def _record(self, hit: bool) -> None:
+        """Count a lookup and export the running hit ratio."""
+        PRINCIPAL_CACHE_LOOKUPS.labels(result="hit" if hit else "miss").inc()
+        self._lookups += 1
+        self._hits += hit
+        PRINCIPAL_CACHE_HIT_RATIO.set(self._hits / self._lookups)
+
+
+# Singleton instance
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the principal cache singleton."""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _invalidate_flushed_users(session: OrmSession, flush_context: Any) -> None:
+    """Drop cached principals for users written in this flush."""
+    user_ids = {
+        obj.id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+    }
+    if not user_ids:
+        return
+
+    cache = get_principal_cache()
+    for user_id in user_ids:
+        cache.invalidate(user_id)
+    # Again after commit, in case a concurrent request re-cached the old row
+    session.info.setdefault(_CHANGED_USERS, set()).update(user_ids)
+
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _invalidate_bulk_user_writes(orm_execute_state: ORMExecuteState) -> None:
+    """Drop every cached principal before a bulk update or delete of users."""
+    statement = orm_execute_state.statement
+    if not isinstance(statement, (Update, Delete)):
+        return
+    if getattr(statement.table, "name", None) != User.__tablename__:
+        return
+
+    get_principal_cache().clear()
+    orm_execute_state.session.info[_BULK_CHANGED_USERS] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_committed_users(session: OrmSession) -> None:
+    """Drop cached principals for users changed in the committed transaction."""
+    cache = get_principal_cache()
+    if session.info.pop(_BULK_CHANGED_USERS, False):
+        cache.clear()
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        cache.invalidate(user_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_rolled_back_users(session: OrmSession) -> None:
+    """Nothing to invalidate once the changes are rolled back."""
+    session.info.pop(_CHANGED_USERS, None)
+    session.info.pop(_BULK_CHANGED_USERS, None)
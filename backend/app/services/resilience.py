@@ -0,0 +1,247 @@
+"""Circuit breaker and adaptive concurrency limit for model calls."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Callable, Optional
+
+from app.core.logging import get_logger
+from app.core.metrics import (
+    GEMINI_CIRCUIT_REJECTIONS,
+    GEMINI_CIRCUIT_STATE,
+    GEMINI_CONCURRENCY_LIMIT,
+    GEMINI_IN_FLIGHT,
+)
+
+logger = get_logger()
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Exported gauge values
+CIRCUIT_STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """The model is failing; calls are rejected without being attempted."""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a rolling window of call outcomes.
+
+    Opens when at least ``failure_rate`` of the last ``window`` calls failed
+    (once ``min_calls`` have been seen). While open every call is rejected
+    with ``CircuitOpenError``. After ``reset_timeout`` one probe call is let
+    through: success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the breaker.
+
+        Args:
+            name: Label for metrics (the model name).
+            failure_rate: Failure fraction that opens the circuit.
+            window: Number of recent outcomes considered.
+            min_calls: Outcomes needed before the circuit can open.
+            reset_timeout: Seconds to stay open before probing.
+            clock: Monotonic time source.
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._set_state(CircuitState.CLOSED)
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the timeout passes."""
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    def before_call(self) -> bool:
+        """Admit or reject a call.
+
+        Returns:
+            True if this call is the half-open probe; only that caller may
+            hand the slot back with ``release_probe``.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with the
+                probe already in flight.
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return False
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        GEMINI_CIRCUIT_REJECTIONS.labels(model=self.name).inc()
+        retry_in = max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+        raise CircuitOpenError(
+            f"Model {self.name} is failing; calls suspended for {retry_in:.0f}s"
+        )
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        if self._state == CircuitState.HALF_OPEN:
+            logger.info(f"Circuit for {self.name} closed after successful probe")
+            self._outcomes.clear()
+            self._probe_in_flight = False
+            self._set_state(CircuitState.CLOSED)
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if warranted."""
+        if self._state == CircuitState.HALF_OPEN:
+            self._probe_in_flight = False
+            self._open()
+            return
+
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if (
+            self._state == CircuitState.CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_rate
+        ):
+            self._open()
+
+    def release_probe(self) -> None:
+        """Give up the probe slot without an outcome (e.g. the probe was cancelled)."""
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """Start rejecting calls."""
+        logger.warning(f"Circuit for {self.name} opened")
+        self._opened_at = self._clock()
+        self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> None:
+        """Change state and export it."""
+        self._state = state
+        GEMINI_CIRCUIT_STATE.labels(model=self.name).set(CIRCUIT_STATE_VALUES[state])
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight calls.
+
+    Each fast, successful call raises the limit by ``1 / limit`` (about +1
+    per limit's worth of calls); an error or a call slower than
+    ``latency_target`` multiplies it by ``backoff`` (at most once per
+    ``cooldown`` so one slow burst does not collapse it to the floor).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        min_limit: int = 1,
+        latency_target: float = 30.0,
+        backoff: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the limiter at its maximum.
+
+        Args:
+            name: Label for metrics (the model name).
+            max_limit: Upper bound on in-flight calls.
+            min_limit: Lower bound on in-flight calls.
+            latency_target: Calls slower than this count as congestion.
+            backoff: Multiplicative decrease factor.
+            cooldown: Minimum seconds between decreases.
+            clock: Monotonic time source.
+        """
+        self.name = name
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self._clock = clock
+        self._limit = float(max_limit)
+        self._in_flight = 0
+        self._last_decrease: Optional[float] = None
+        self._changed = asyncio.Condition()
+        GEMINI_CONCURRENCY_LIMIT.labels(model=name).set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        """Current whole-number limit."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently holding a slot."""
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a call slot, adjusting the limit from the call's outcome.
+
+        Exceptions raised inside count as failures, except cancellation,
+        which says nothing about the model's health.
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        GEMINI_IN_FLIGHT.labels(model=self.name).set(self._in_flight)
+
+        start = self._clock()
+        ok: Optional[bool] = None
+        try:
+            yield
+            ok = True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            ok = False
+            raise
+        finally:
+            if ok is not None:
+                self._record(ok, self._clock() - start)
+            self._in_flight -= 1
+            GEMINI_IN_FLIGHT.labels(model=self.name).set(self._in_flight)
+            await self._notify()
+
+    def _record(self, ok: bool, latency: float) -> None:
+        """Apply additive increase or multiplicative decrease."""
+        if ok and latency <= self.latency_target:
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+        else:
+            now = self._clock()
+            if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        GEMINI_CONCURRENCY_LIMIT.labels(model=self.name).set(self.limit)
+
+    async def _notify(self) -> None:
+        """Wake callers waiting for a slot."""
+        async with self._changed:
+            self._changed.notify_all()
@@ -0,0 +1 @@
+"""Performance benchmarks that run without external services."""
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent /sessions/{id}/generate throughput against the fake LLM backend.
+
+The fake backend waits for a sampled latency per call (fixed by default). With a
+non-blocking client, throughput scales with concurrency up to
+``GEMINI_MAX_CONCURRENCY``; with the old blocking call (``--blocking``) every
+request serializes behind the others.
+"""
+
+import asyncio
+import time
+
+from benchmarks import common  # noqa: F401  (configures environment)
+from benchmarks.common import (
+    auth_header,
+    percentile,
+    reset_database,
+    seed_clinician_and_patient,
+    seed_session,
+)
+
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.services.llm_backends import FakeBackend
+from app.services.llm_client import get_llm_client
+
+
+class BlockingFakeBackend(FakeBackend):
+    """Reproduces the old behaviour: a synchronous call inside the loop."""
+
+    async def _wait(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+async def run_level(
+    client: AsyncClient, headers: dict[str, str], session_id: int, concurrency: int
+) -> dict[str, float]:
+    """Fire ``concurrency`` generate calls at once and time them."""
+    latencies: list[float] = []
+
+    async def one() -> None:
+        start = time.perf_counter()
+        response = await client.post(
+            f"/api/v1/sessions/{session_id}/generate",
+            headers=headers,
+            json={"bypass_cache": True},
+        )
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "wall_s": wall,
+        "throughput_rps": concurrency / wall,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+    }
+
+
+async def main() -> None:
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark generate concurrency")
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake model latency (s)")
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "uniform", "lognormal"],
+        default="fixed",
+        help="Fake model latency distribution",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of fake model calls that fail"
+    )
+    parser.add_argument(
+        "--levels", default="1,4,16,32", help="Comma-separated concurrency levels"
+    )
+    parser.add_argument(
+        "--blocking", action="store_true", help="Simulate the old blocking SDK call"
+    )
+    args = parser.parse_args()
+
+    await reset_database()
+    user, patient = await seed_clinician_and_patient()
+    session_id = await seed_session(patient.id, user.id)
+
+    backend_class = BlockingFakeBackend if args.blocking else FakeBackend
+    get_llm_client().backend = backend_class(
+        latency_ms=args.latency * 1000,
+        distribution=args.distribution,
+        error_rate=args.error_rate,
+        seed=0,
+    )
+
+    mode = "blocking" if args.blocking else "async"
+    print(f"Fake model latency: {args.latency:.2f}s ({args.distribution})  mode: {mode}")
+    print(f"{'Conc.':<8} {'Wall (s)':<10} {'RPS':<10} {'p50 (s)':<10} {'p95 (s)':<10}")
+    print("-" * 50)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        headers = auth_header(user)
+        for level in (int(x) for x in args.levels.split(",")):
+            r = await run_level(client, headers, session_id, level)
+            print(
+                f"{r['concurrency']:<8} {r['wall_s']:<10.2f} {r['throughput_rps']:<10.2f} "
+                f"{r['p50_s']:<10.2f} {r['p95_s']:<10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark GET /sessions/patients/{id}/sessions against a patient with many sessions.
+
+Seeds one patient with ``--sessions`` sessions (a third with two note
+versions, half with an AI suggestion) and reports latency percentiles and the
+number of SQL statements per request.
+"""
+
+import asyncio
+import time
+
+from benchmarks import common  # noqa: F401  (configures environment)
+from benchmarks.common import (
+    SAMPLE_TRANSCRIPT,
+    auth_header,
+    percentile,
+    reset_database,
+    seed_clinician_and_patient,
+)
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert, select, update
+
+from app.core.security import hash_for_audit
+from app.db.models import AiSuggestion, NoteStatus, NoteVersion, Session
+from app.db.session import async_session, engine
+from app.main import app
+from app.services.data_keys import DataKeyService
+
+
+async def seed_history(patient_id: int, user_id: int, count: int) -> None:
+    """Bulk-insert sessions with note versions and suggestions."""
+    transcript_hash = hash_for_audit(SAMPLE_TRANSCRIPT)
+
+    async with async_session() as db:
+        key_id, transcript = await DataKeyService(db).encrypt_transcript(
+            patient_id, SAMPLE_TRANSCRIPT
+        )
+        await db.execute(
+            insert(Session),
+            [
+                {
+                    "patient_id": patient_id,
+                    "created_by_user_id": user_id,
+                    "transcript_encrypted": transcript,
+                    "transcript_key_id": key_id,
+                    "transcript_hash": transcript_hash,
+                    "transcript_length": len(SAMPLE_TRANSCRIPT),
+                }
+                for _ in range(count)
+            ],
+        )
+        session_ids = (
+            await db.execute(select(Session.id).where(Session.patient_id == patient_id))
+        ).scalars().all()
+
+        await db.execute(
+            insert(AiSuggestion),
+            [
+                {"session_id": session_id, "model_name": "bench", "raw_json": "{}"}
+                for session_id in session_ids[::2]
+            ],
+        )
+        await db.execute(
+            insert(NoteVersion),
+            [
+                {
+                    "session_id": session_id,
+                    "version_number": number,
+                    "status": status.value,
+                    "created_by_user_id": user_id,
+                }
+                for session_id in session_ids[::3]
+                for number, status in ((1, NoteStatus.DRAFT), (2, NoteStatus.FINAL))
+            ],
+        )
+
+        # Summary columns, as NotesService would have maintained them
+        latest = (
+            await db.execute(
+                select(NoteVersion.session_id, NoteVersion.id).where(
+                    NoteVersion.version_number == 2
+                )
+            )
+        ).all()
+        await db.execute(
+            update(Session),
+            [{"id": session_id, "has_ai_suggestions": True} for session_id in session_ids[::2]],
+        )
+        await db.execute(
+            update(Session),
+            [
+                {
+                    "id": session_id,
+                    "latest_version_id": version_id,
+                    "latest_version_status": NoteStatus.FINAL.value,
+                }
+                for session_id, version_id in latest
+            ],
+        )
+        await db.commit()
+
+
+async def main() -> None:
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark patient session listing")
+    parser.add_argument("--sessions", type=int, default=1000, help="Sessions to seed")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests")
+    args = parser.parse_args()
+
+    await reset_database()
+    user, patient = await seed_clinician_and_patient()
+    await seed_history(patient.id, user.id, args.sessions)
+
+    statements = 0
+
+    def count_statement(*_: object) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    url = f"/api/v1/sessions/patients/{patient.id}/sessions"
+    latencies: list[float] = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        headers = auth_header(user)
+        params = {"limit": args.limit}
+        (await client.get(url, headers=headers, params=params)).raise_for_status()  # warm up
+
+        statements = 0
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers, params=params)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    print(f"Sessions: {args.sessions}  page size: {args.limit}  requests: {args.requests}")
+    print(f"SQL statements per request: {statements / args.requests:.1f}")
+    print(f"p50: {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"p95: {percentile(latencies, 95) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
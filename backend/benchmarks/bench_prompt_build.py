@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark prompt assembly time and prompt size per registered template.
+
+Compares the original per-call build (``model_json_schema`` + ``json.dumps``
++ ``str.format``) with the cached, pre-split templates in
+``app.services.prompts``. Token counts use the model's ``count_tokens`` when a
+Gemini key is configured and a chars/4 estimate otherwise.
+"""
+
+import json
+import os
+import time
+from typing import Callable
+
+from benchmarks import common  # noqa: F401  (configures environment)
+from benchmarks.common import SAMPLE_TRANSCRIPT
+
+from app.schemas.ai import AiOutputSchema
+from app.services.prompts import FULL_PROMPT_TEMPLATE, PROMPT_TEMPLATES
+
+
+def build_uncached(transcript: str) -> str:
+    """Build a prompt the way ``LLMClient`` did before templates were cached."""
+    schema = json.dumps(AiOutputSchema.model_json_schema(), indent=2)
+    return FULL_PROMPT_TEMPLATE.format(schema=schema, transcript=transcript)
+
+
+def time_per_call(build: Callable[[str], str], transcript: str, iterations: int) -> float:
+    """Mean build time in microseconds."""
+    build(transcript)  # warm caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build(transcript)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def make_token_counter() -> tuple[str, Callable[[str], int]]:
+    """Pick the most accurate token counter available."""
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if api_key:
+        import google.generativeai as genai
+
+        from app.core.config import get_settings
+
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(get_settings().gemini_model)
+        return "count_tokens", lambda text: model.count_tokens(text).total_tokens
+    return "chars/4", lambda text: len(text) // 4
+
+
+def main() -> None:
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark prompt assembly")
+    parser.add_argument(
+        "--transcript-kb", type=int, default=50, help="Transcript size in KB"
+    )
+    parser.add_argument("--iterations", type=int, default=200, help="Builds per template")
+    args = parser.parse_args()
+
+    repeats = args.transcript_kb * 1024 // len(SAMPLE_TRANSCRIPT) + 1
+    transcript = (SAMPLE_TRANSCRIPT * repeats)[: args.transcript_kb * 1024]
+    counter_name, count_tokens = make_token_counter()
+
+    builders: list[tuple[str, Callable[[str], str]]] = [("uncached", build_uncached)]
+    for version, template in sorted(PROMPT_TEMPLATES.items()):
+        builders.append((version, template.render))
+
+    print(f"Transcript: {len(transcript)} chars  tokens: {counter_name}")
+    print(f"{'Template':<10} {'Build (us)':<12} {'Chars':<10} {'Tokens':<10} {'Overhead tok':<12}")
+    print("-" * 56)
+
+    transcript_tokens = count_tokens(transcript)
+    for name, build in builders:
+        prompt = build(transcript)
+        tokens = count_tokens(prompt)
+        print(
+            f"{name:<10} {time_per_call(build, transcript, args.iterations):<12.1f} "
+            f"{len(prompt):<10} {tokens:<10} {tokens - transcript_tokens:<12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
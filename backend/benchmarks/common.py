@@ -0,0 +1,100 @@
+"""Shared setup for benchmarks.
+
+Import this module before any ``app`` module: it points the application at a
+throwaway SQLite database and the local fake LLM backend.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cryptography.fernet import Fernet
+
+BENCH_DB_PATH = Path(tempfile.gettempdir()) / "clinician_copilot_bench.db"
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{BENCH_DB_PATH}")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-for-benchmarks-32-chars")
+os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.core.security import create_access_token, get_password_hash, hash_for_audit  # noqa: E402
+from app.db.models import Base, Patient, Session, User, UserRole  # noqa: E402
+from app.db.session import async_session, engine  # noqa: E402
+from app.services.data_keys import DataKeyService  # noqa: E402
+
+
+SAMPLE_TRANSCRIPT = (
+    "Clinician: How have you been sleeping since our last session?\n"
+    "Patient: Not great. I wake up around 3am most nights and can't get back to sleep.\n"
+    "Clinician: How is your mood during the day?\n"
+    "Patient: Low. I feel tired and I've stopped going to the gym.\n"
+    "Clinician: Are you still taking the sertraline?\n"
+    "Patient: Yes, 50mg every morning. No side effects that I notice.\n"
+)
+
+
+async def reset_database() -> None:
+    """Drop and recreate all tables in the benchmark database."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def seed_clinician_and_patient() -> tuple[User, Patient]:
+    """Create one clinician and one patient.
+
+    Returns:
+        Tuple of (clinician, patient).
+    """
+    async with async_session() as db:
+        user = User(
+            email="bench@clinician-copilot.local",
+            password_hash=get_password_hash("bench123!"),
+            role=UserRole.CLINICIAN.value,
+            is_active=True,
+        )
+        patient = Patient(name="Benchmark Patient")
+        db.add_all([user, patient])
+        await db.commit()
+        return user, patient
+
+
+async def seed_session(patient_id: int, user_id: int, transcript: str = SAMPLE_TRANSCRIPT) -> int:
+    """Create a session with an encrypted transcript.
+
+    Returns:
+        New session ID.
+    """
+    async with async_session() as db:
+        key_id, token = await DataKeyService(db).encrypt_transcript(patient_id, transcript)
+        session = Session(
+            patient_id=patient_id,
+            created_by_user_id=user_id,
+            transcript_encrypted=token,
+            transcript_key_id=key_id,
+            transcript_hash=hash_for_audit(transcript),
+        )
+        db.add(session)
+        await db.commit()
+        return session.id
+
+
+def auth_header(user: User) -> dict[str, str]:
+    """Build a bearer header for a user."""
+    token = create_access_token({"sub": str(user.id), "role": user.role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
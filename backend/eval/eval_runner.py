@@ -12,6 +12,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from pydantic import ValidationError
 
+from app.core.config import get_settings
+from app.services.llm_backends import FakeBackend
 from app.services.llm_client import LLMClient
 from app.schemas.ai import AiOutputSchema
 
@@ -19,16 +21,17 @@ from app.schemas.ai import AiOutputSchema
 class EvaluationRunner:
     """Runner for evaluating AI output quality."""
 
-    def __init__(self, dataset_path: str | None = None):
+    def __init__(self, dataset_path: str | None = None, llm_client: LLMClient | None = None):
         """Initialize the evaluation runner.
         
         Args:
             dataset_path: Path to evaluation dataset JSON.
+            llm_client: Client to evaluate (backend from settings if not provided).
         """
         self.dataset_path = dataset_path or str(
             Path(__file__).parent / "dataset.json"
         )
-        self.llm_client = LLMClient()
+        self.llm_client = llm_client or LLMClient()
         self.results: list[dict[str, Any]] = []
 
     def load_dataset(self) -> list[dict[str, Any]]:
@@ -342,9 +345,9 @@ class EvaluationRunner:
             valid = "✓" if r["schema_valid"] else "✗"
             print(
                 f"{r['id']:<12} {valid:<6} "
-                f"{r['citation_coverage']:.1%:<10} "
-                f"{r['hallucination_score']:.1%:<10} "
-                f"{r['key_field_overlap']:.1%:<10}"
+                f"{r['citation_coverage']:<10.1%} "
+                f"{r['hallucination_score']:<10.1%} "
+                f"{r['key_field_overlap']:<10.1%}"
             )
         
         print("=" * 60)
@@ -376,9 +379,17 @@ async def main():
         default="eval_report.json",
         help="Output path for JSON report"
     )
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="Use the local fake LLM backend (no API key or network needed)"
+    )
     args = parser.parse_args()
 
-    runner = EvaluationRunner(dataset_path=args.dataset)
+    llm_client = None
+    if args.fake:
+        llm_client = LLMClient(backend=FakeBackend.from_settings(get_settings()))
+    runner = EvaluationRunner(dataset_path=args.dataset, llm_client=llm_client)
     
     try:
         report = await runner.run_evaluation()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Script to rewrap patient data keys with the active master key."""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.key_rotation import KeyRotationJob
+
+
+async def rotate_keys(
+    batch_size: Optional[int] = None, rows_per_second: Optional[float] = None
+) -> bool:
+    """Run the rotation and print the result.
+    
+    Args:
+        batch_size: Keys rewrapped per transaction.
+        rows_per_second: Throttle; 0 runs unthrottled.
+        
+    Returns:
+        True if every data key is now under the active master key.
+    """
+    job = KeyRotationJob(batch_size=batch_size, rows_per_second=rows_per_second)
+    result = await job.run()
+
+    print(f"Active master key: {result.master_key_id}")
+    print(f"Rewrapped: {result.rewrapped}, failed: {result.failed}")
+    if result.remaining:
+        print(f"{result.remaining} data keys are still under another master key.")
+    else:
+        print("All data keys are under the active master key.")
+    return result.remaining == 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rewrap data keys with the active master key")
+    parser.add_argument("--batch-size", type=int, default=None, help="Keys per transaction")
+    parser.add_argument(
+        "--rows-per-second", type=float, default=None, help="Throttle (0 for unthrottled)"
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(rotate_keys(args.batch_size, args.rows_per_second)) else 1)
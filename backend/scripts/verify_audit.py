@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Script to verify the audit log hash chain."""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import async_session
+from app.services.audit_chain import AuditChainVerifier
+
+
+async def verify_audit(full: bool = False, batch_size: Optional[int] = None) -> bool:
+    """Verify the chain and print the result.
+    
+    Args:
+        full: Verify from the first row instead of the latest checkpoint.
+        batch_size: Rows fetched per query.
+        
+    Returns:
+        True if the chain is intact.
+    """
+    async with async_session() as db:
+        result = await AuditChainVerifier(db, batch_size=batch_size).verify(full=full)
+
+    print(f"Verified rows: {result.verified_rows} (chain at row {result.last_seq})")
+    print(f"Checkpoints created: {result.checkpoints_created}")
+    if not result.ok:
+        print(f"FAILED at row {result.first_bad_seq}: {result.error}")
+    else:
+        print("Audit chain intact.")
+    return result.ok
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verify the audit log hash chain")
+    parser.add_argument("--full", action="store_true", help="Verify from the first row")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows fetched per query")
+
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(verify_audit(args.full, args.batch_size)) else 1)
@@ -2,6 +2,7 @@
 
 import asyncio
 import os
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Generator
 
 # Set environment variables BEFORE importing app modules
@@ -22,7 +23,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 
 from app.core.security import get_password_hash, create_access_token
 from app.db.models import Base, User, Patient, UserRole
-from app.db.session import get_db
+from app.db.session import get_db, get_session_factory
 from app.main import app
 
 
@@ -66,7 +67,12 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
         yield db_session
 
+    @asynccontextmanager
+    async def shared_session() -> AsyncGenerator[AsyncSession, None]:
+        yield db_session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: shared_session
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -158,3 +158,299 @@ async def test_audit_log_filters(client, admin_user, clinician_user, db_session)
     assert response.status_code == 200
     data = response.json()
     assert all(log["action"] == "create" for log in data["logs"])
+
+
+@pytest.mark.asyncio
+async def test_audit_log_total_modes(client, admin_user, clinician_user, db_session):
+    """Test that estimated totals match exact ones and none omits the total."""
+    from app.services.audit import AuditService
+
+    audit_service = AuditService(db_session)
+    for entity_id in range(3):
+        await audit_service.log(
+            actor_user_id=clinician_user.id,
+            action="create",
+            entity_type="patient",
+            entity_id=entity_id,
+        )
+    await audit_service.log(
+        actor_user_id=admin_user.id,
+        action="update",
+        entity_type="patient",
+        entity_id=1,
+    )
+    await db_session.commit()
+
+    headers = get_auth_header(admin_user)
+    for params in (
+        {},
+        {"entity_type": "patient", "action": "create"},
+        {"actor_user_id": admin_user.id},
+        {"entity_type": "patient", "entity_id": 1},
+    ):
+        exact = await client.get("/api/v1/audit/logs", headers=headers, params=params)
+        estimated = await client.get(
+            "/api/v1/audit/logs", headers=headers, params={**params, "total_mode": "estimated"}
+        )
+        assert estimated.json()["total"] == exact.json()["total"]
+
+    response = await client.get(
+        "/api/v1/audit/logs", headers=headers, params={"total_mode": "none", "limit": 2}
+    )
+    data = response.json()
+    assert data["total"] is None
+    assert data["has_more"] is True
+    assert len(data["logs"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_audit_logs_inserted_in_one_statement(db_session, admin_user):
+    """Test that a request's audit rows are deferred to commit with one totals upsert."""
+    from sqlalchemy import event
+
+    from app.services.audit import AuditService
+    from tests.conftest import test_engine
+
+    audit_service = AuditService(db_session)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        logs = [
+            await audit_service.log(
+                actor_user_id=admin_user.id,
+                action="update",
+                entity_type="patient",
+                entity_id=entity_id,
+            )
+            for entity_id in range(3)
+        ]
+        assert statements == []
+        await db_session.commit()
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    # PostgreSQL batches these into one statement; SQLite has no insert sentinel
+    expected_inserts = 3 if test_engine.dialect.name == "sqlite" else 1
+    assert len([s for s in statements if s.startswith("INSERT INTO audit_logs ")]) == (
+        expected_inserts
+    )
+    assert len([s for s in statements if s.startswith("INSERT INTO audit_log_counts")]) == 1
+    assert all(log.id is not None for log in logs)
+
+
+@pytest.mark.asyncio
+async def test_audit_write_behind_spool(db_session, admin_user, monkeypatch):
+    """Test that rows spool with their transaction and drain in bulk, in batches."""
+    from app.db.models import AuditLogSpool
+    from app.services import audit
+    from app.services.audit import AuditService
+    from app.services.audit_chain import AuditChainVerifier
+    from app.services.audit_spool import AuditSpool
+    from tests.conftest import test_async_session
+
+    monkeypatch.setattr(audit.settings, "audit_write_behind", True)
+    audit_service = AuditService(db_session)
+    for entity_id in range(3):
+        await audit_service.log(
+            actor_user_id=admin_user.id, action="create", entity_type="patient", entity_id=entity_id
+        )
+    await db_session.commit()
+    await audit_service.log(
+        actor_user_id=admin_user.id, action="delete", entity_type="patient", entity_id=9
+    )
+    await db_session.rollback()
+
+    assert len((await db_session.execute(select(AuditLogSpool))).scalars().all()) == 3
+    assert (await db_session.execute(select(AuditLog))).scalars().all() == []
+
+    spool = AuditSpool(session_factory=test_async_session, batch_size=2)
+    assert await spool.drain() == 3
+    assert await spool.drain() == 0
+    db_session.expire_all()
+    assert (await db_session.execute(select(AuditLogSpool))).scalars().all() == []
+    logs = (await db_session.execute(select(AuditLog))).scalars().all()
+    assert sorted(log.entity_id for log in logs) == [0, 1, 2]
+    assert await AuditService(db_session).estimate_logs(action="create") == 3
+    assert (await AuditChainVerifier(db_session).verify()).ok
+
+
+@pytest.mark.asyncio
+async def test_failed_spool_drain_keeps_rows(db_session, admin_user, monkeypatch):
+    """Test that a drain failing mid-batch leaves the batch spooled, unclaimed."""
+    from app.db.models import AuditLogSpool
+    from app.services import audit, audit_spool
+    from app.services.audit import AuditService
+    from tests.conftest import test_async_session
+
+    monkeypatch.setattr(audit.settings, "audit_write_behind", True)
+    await AuditService(db_session).log(
+        actor_user_id=admin_user.id, action="create", entity_type="patient", entity_id=1
+    )
+    await db_session.commit()
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("crash after claim")
+
+    monkeypatch.setattr(audit_spool, "count_upsert", crash)
+    with pytest.raises(RuntimeError):
+        await audit_spool.AuditSpool(session_factory=test_async_session).drain()
+
+    db_session.expire_all()
+    spooled = (await db_session.execute(select(AuditLogSpool))).scalars().all()
+    assert [row.claimed_by for row in spooled] == [None]
+    assert (await db_session.execute(select(AuditLog))).scalars().all() == []
+
+
+async def _log_rows(db_session, actor_user_id, count):
+    """Write and commit ``count`` audit rows."""
+    from app.services.audit import AuditService
+
+    audit_service = AuditService(db_session)
+    for entity_id in range(count):
+        await audit_service.log(
+            actor_user_id=actor_user_id, action="update", entity_type="patient", entity_id=entity_id
+        )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "tamper, first_bad_seq",
+    [
+        ({3: {"entity_id": 99}}, 3),  # Edited row
+        ({2: {"chain_seq": -1}, 3: {"chain_seq": 2}, -1: {"chain_seq": 3}}, 2),  # Reordered
+        ({3: None}, 3),  # Deleted row
+        ({5: None}, 5),  # Truncated tail
+    ],
+)
+async def test_audit_chain_detects_tampering(
+    client: AsyncClient, db_session, admin_user, tamper, first_bad_seq
+):
+    """Test that edited, reordered and deleted rows break the chain."""
+    from sqlalchemy import delete, update
+
+    await _log_rows(db_session, admin_user.id, 5)
+    headers = get_auth_header(admin_user)
+
+    intact = (await client.post("/api/v1/audit/verify", headers=headers)).json()
+    assert intact["ok"] is True
+    assert intact["verified_rows"] == 5
+
+    for seq, values in tamper.items():
+        row = AuditLog.chain_seq == seq
+        if values is None:
+            await db_session.execute(delete(AuditLog).where(row))
+        else:
+            await db_session.execute(update(AuditLog).where(row).values(**values))
+    await db_session.commit()
+
+    response = await client.post("/api/v1/audit/verify", headers=headers, params={"full": True})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["ok"] is False
+    assert result["first_bad_seq"] == first_bad_seq
+
+
+@pytest.mark.asyncio
+async def test_audit_chain_verifies_from_checkpoint(db_session, admin_user):
+    """Test that later runs only read rows after the latest checkpoint."""
+    from sqlalchemy import update
+
+    from app.db.models import AuditCheckpoint
+    from app.services.audit_chain import AuditChainVerifier
+
+    verifier = AuditChainVerifier(db_session, batch_size=3, checkpoint_interval=2)
+    await _log_rows(db_session, admin_user.id, 5)
+
+    first = await verifier.verify()
+    assert (first.ok, first.verified_rows, first.checkpoints_created) == (True, 5, 2)
+
+    await _log_rows(db_session, admin_user.id, 2)
+    second = await verifier.verify()
+    assert (second.ok, second.verified_rows, second.last_seq) == (True, 3, 7)
+    checkpoints = (await db_session.execute(select(AuditCheckpoint.last_seq))).scalars().all()
+    assert sorted(checkpoints) == [2, 4, 6]
+
+    full = await verifier.verify(full=True)
+    assert (full.ok, full.verified_rows, full.checkpoints_created) == (True, 7, 0)
+
+    # Rows behind the latest checkpoint are only re-read by a full run
+    await db_session.execute(
+        update(AuditLog).where(AuditLog.chain_seq == 1).values(action="delete")
+    )
+    await db_session.commit()
+    assert (await verifier.verify()).ok is True
+    assert (await verifier.verify(full=True)).first_bad_seq == 1
+
+
+@pytest.mark.asyncio
+async def test_audit_log_export_formats(
+    client: AsyncClient, db_session, admin_user, monkeypatch
+):
+    """Test NDJSON and CSV exports across several chunks, with filters and a time range."""
+    import csv
+    import io
+    import json
+    from datetime import datetime, timedelta, timezone
+
+    from app.services import audit
+
+    await _log_rows(db_session, admin_user.id, 7)
+    headers = get_auth_header(admin_user)
+    params = {
+        "action": "update",
+        "start_date": (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat(),
+        "end_date": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+    }
+    monkeypatch.setattr(audit.settings, "audit_export_chunk_size", 3)
+
+    ndjson = await client.get("/api/v1/audit/export", headers=headers, params=params)
+    as_csv = await client.get(
+        "/api/v1/audit/export", headers=headers, params={**params, "format": "csv"}
+    )
+    later = await client.get(
+        "/api/v1/audit/export", headers=headers, params={**params, "start_date": params["end_date"]}
+    )
+
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [record["entity_id"] for record in records] == list(range(7))
+    assert [record["chain_seq"] for record in records] == list(range(1, 8))
+
+    assert as_csv.headers["content-disposition"] == 'attachment; filename="audit_logs.csv"'
+    rows = list(csv.DictReader(io.StringIO(as_csv.text)))
+    assert [row["id"] for row in rows] == [str(record["id"]) for record in records]
+
+    assert later.text == ""
+
+
+@pytest.mark.asyncio
+async def test_audit_log_export_parquet(client: AsyncClient, db_session, admin_user, monkeypatch):
+    """Test that Parquet round-trips with pyarrow and is refused without it."""
+    from app.services import audit_export
+
+    await _log_rows(db_session, admin_user.id, 3)
+    headers = get_auth_header(admin_user)
+
+    if audit_export.parquet_available():
+        import io
+
+        import pyarrow.parquet as pq
+
+        response = await client.get(
+            "/api/v1/audit/export", headers=headers, params={"format": "parquet"}
+        )
+        assert response.status_code == 200
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.column("entity_id").to_pylist() == [0, 1, 2]
+
+    monkeypatch.setattr(audit_export, "pq", None)
+    refused = await client.get(
+        "/api/v1/audit/export", headers=headers, params={"format": "parquet"}
+    )
+    assert refused.status_code == 400
@@ -45,6 +45,68 @@ async def test_login_nonexistent_user(client: AsyncClient):
     assert response.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_login_rehashes_password_when_cost_changes(
+    client: AsyncClient, admin_user, db_session, monkeypatch
+):
+    """Test that a hash made with the old bcrypt cost is replaced on login."""
+    from passlib.context import CryptContext
+
+    from app.core import security
+
+    assert admin_user.password_hash.startswith("$2b$12$")
+    monkeypatch.setattr(
+        security,
+        "pwd_context",
+        CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=4,
+            bcrypt__min_rounds=4,
+            bcrypt__max_rounds=4,
+        ),
+    )
+
+    for _ in range(2):
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "admin@test.com", "password": "admin123!"},
+        )
+        assert response.status_code == 200
+        await db_session.commit()  # As get_db does at the end of the request
+        await db_session.refresh(admin_user)
+        assert admin_user.password_hash.startswith("$2b$04$")
+
+
+@pytest.mark.asyncio
+async def test_login_returns_503_when_hashing_pool_full(
+    client: AsyncClient, admin_user, monkeypatch
+):
+    """Test that logins beyond the hashing pool's capacity are turned away."""
+    import asyncio
+
+    from app.services import password_hashing
+
+    hasher = password_hashing.PasswordHasher(workers=1, max_queue=0)
+    monkeypatch.setattr(password_hashing, "_password_hasher", hasher)
+    try:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/api/v1/auth/login",
+                    json={"email": "admin@test.com", "password": "admin123!"},
+                )
+                for _ in range(2)
+            )
+        )
+    finally:
+        hasher.shutdown()
+
+    assert sorted(response.status_code for response in responses) == [200, 503]
+    rejected = next(response for response in responses if response.status_code == 503)
+    assert rejected.headers["Retry-After"] == "1"
+
+
 @pytest.mark.asyncio
 async def test_refresh_token(client: AsyncClient, admin_user):
     """Test token refresh."""
@@ -0,0 +1,107 @@
+"""Tests for long-transcript chunking and map-reduce generation."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.ai import Citation, SOAPSection
+from app.services.chunking import TranscriptChunk, remap_citations, split_transcript
+from app.services.llm_backends import GeminiBackend
+from app.services.llm_client import LLMClient
+
+
+def make_transcript(turns: int) -> str:
+    """Build a transcript of alternating, numbered speaker turns."""
+    lines = []
+    for i in range(turns):
+        speaker = "Clinician" if i % 2 == 0 else "Patient"
+        lines.append(f"{speaker}: This is turn number {i} of the session.\n")
+    return "".join(lines)
+
+
+def test_split_on_speaker_turns_with_overlap():
+    """Test that chunks align to turns, stay under size and overlap."""
+    transcript = make_transcript(200)
+
+    chunks = split_transcript(transcript, chunk_size=1000, overlap=100)
+
+    assert len(chunks) > 1
+    assert chunks[0].start == 0
+    assert chunks[-1].end == len(transcript)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.end - chunk.start <= 1000
+        assert chunk.start < previous.end  # overlapping
+        assert chunk.text.startswith(("Clinician:", "Patient:"))
+        assert transcript[chunk.start : chunk.end] == chunk.text
+
+
+def test_split_cuts_oversized_turn():
+    """Test that a single turn longer than a chunk is cut at whitespace."""
+    transcript = "Patient: " + "word " * 1000
+
+    chunks = split_transcript(transcript, chunk_size=500, overlap=0)
+
+    assert all(chunk.end - chunk.start <= 500 for chunk in chunks)
+    assert "".join(chunk.text for chunk in chunks) == transcript
+
+
+def test_remap_citations_to_full_transcript():
+    """Test chunk-relative offsets are shifted and bad offsets are located."""
+    transcript = "Clinician: Hello.\nPatient: I cannot sleep.\nPatient: I feel low.\n"
+    chunk = TranscriptChunk(index=1, start=18, end=len(transcript), text=transcript[18:])
+    section = SOAPSection(
+        content="Insomnia and low mood.",
+        citations=[
+            Citation(text="I cannot sleep.", start_offset=9, end_offset=24),
+            Citation(text="I feel low.", start_offset=0, end_offset=3),
+            Citation(text="not in the transcript", start_offset=0, end_offset=5),
+        ],
+    )
+
+    remap_citations(section, transcript, chunk)
+
+    for citation in section.citations[:2]:
+        assert transcript[citation.start_offset : citation.end_offset] == citation.text
+    assert section.citations[2].start_offset is None
+
+
+class FakeMapReduceModel:
+    """Fake Gemini model that documents chunks and merges them."""
+
+    def __init__(self, llm_client: LLMClient):
+        self.llm_client = llm_client
+        self.map_prompts: list[str] = []
+
+    async def generate_content_async(self, prompt, **kwargs):
+        output = self.llm_client.create_empty_output()
+        if "EXCERPT DOCUMENTATION:" in prompt:
+            findings = prompt.split("EXCERPT DOCUMENTATION:\n---\n", 1)[1].rsplit("\n---", 1)[0]
+            last = json.loads(findings)[-1]["documentation"]
+            output.soap.plan = SOAPSection.model_validate(last["soap"]["plan"])
+        else:
+            self.map_prompts.append(prompt)
+            quote = "This is turn number 1999 of the session."
+            if quote in prompt:
+                output.soap.plan = SOAPSection(
+                    content="Safety discussion at the end.",
+                    citations=[Citation(text=quote, start_offset=0, end_offset=len(quote))],
+                )
+        return SimpleNamespace(text=output.model_dump_json())
+
+
+@pytest.mark.asyncio
+async def test_generate_chunked_keeps_transcript_ending():
+    """Test that the end of a long transcript reaches the model and is cited correctly."""
+    llm_client = LLMClient(api_key="")
+    model = FakeMapReduceModel(llm_client)
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+    transcript = make_transcript(2000)
+    assert len(transcript) > 50000
+
+    output, _ = await llm_client.generate_chunked(transcript)
+
+    assert len(model.map_prompts) > 1
+    citation = output.soap.plan.citations[0]
+    assert transcript[citation.start_offset : citation.end_offset] == citation.text
+    assert citation.start_offset > 50000
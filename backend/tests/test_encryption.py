@@ -1,18 +1,37 @@
 """Tests for encryption functionality."""
 
 import pytest
+from cryptography.fernet import InvalidToken
 from sqlalchemy import select
 
-from app.core.security import encrypt_data, decrypt_data, hash_for_audit
-from app.db.models import Session, Patient
+from app.core.crypto import (
+    HEADER_SIZE,
+    SALT_OFFSET,
+    TAG_SIZE,
+    open_sealed,
+    open_stream,
+    open_text,
+    seal,
+    seal_stream,
+    seal_text,
+)
+from app.core.security import (
+    decrypt_data,
+    get_fernet,
+    get_transcript_key,
+    hash_for_audit,
+)
+from app.db.models import Session, Patient, PatientDataKey
+from app.services.data_keys import DataKeyService
+from app.services.key_rotation import KeyRotationJob
 from tests.conftest import get_auth_header
 
 
-def test_encrypt_decrypt_roundtrip():
-    """Test that encryption and decryption work correctly."""
+def test_global_key_transcript_still_decrypts():
+    """Test that transcripts sealed with the global key before data keys still open."""
     original = "This is sensitive patient data that should be encrypted."
     
-    encrypted = encrypt_data(original)
+    encrypted = seal(get_transcript_key(), original.encode())
     decrypted = decrypt_data(encrypted)
     
     assert decrypted == original
@@ -23,13 +42,113 @@ def test_encrypted_data_is_different():
     """Test that encrypted data differs from plaintext."""
     plaintext = "Patient transcript content"
     
-    encrypted = encrypt_data(plaintext)
+    encrypted = seal(bytes(range(32)), plaintext.encode())
     
     # Encrypted should not contain plaintext
     assert plaintext.encode() not in encrypted
     assert plaintext not in encrypted.decode("latin-1")
 
 
+def test_legacy_fernet_token_still_decrypts():
+    """Test that transcripts encrypted before the AES-GCM format still open."""
+    token = get_fernet().encrypt("Older transcript".encode())
+
+    assert decrypt_data(token) == "Older transcript"
+
+
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 48, 50])
+def test_sealed_segments_roundtrip_and_stream(size):
+    """Test one-shot and streamed sealing agree across segment boundaries."""
+    key = bytes(range(32))
+    data = bytes(i % 251 for i in range(size))
+
+    token = seal(key, data, segment_size=16)
+    streamed = b"".join(
+        seal_stream(key, (data[i : i + 5] for i in range(0, len(data), 5)), segment_size=16)
+    )
+
+    segments = max(1, -(-size // 16))
+    assert len(token) == len(streamed) == HEADER_SIZE + size + segments * TAG_SIZE
+    for sealed in (token, streamed):
+        pieces = (sealed[i : i + 7] for i in range(0, len(sealed), 7))
+        assert open_sealed(key, sealed) == data
+        assert b"".join(open_stream(key, pieces)) == data
+        assert b"".join(open_stream(key, [sealed])) == data
+
+
+@pytest.mark.parametrize("text", ["", "plain ascii", "ünïcödé 🙂 split across segments" * 3])
+def test_text_roundtrip_splits_characters_across_segments(text):
+    """Test that text sealed a segment at a time decodes characters cut at a boundary."""
+    key = bytes(range(32))
+
+    token = seal_text(key, text, segment_size=7)
+
+    assert open_sealed(key, token).decode() == text
+    assert open_text(key, token) == text
+
+
+def test_each_payload_gets_its_own_key():
+    """Test that equal plaintexts get different salts, so different payload keys."""
+    key = bytes(range(32))
+    first, second = seal(key, b"same transcript"), seal(key, b"same transcript")
+
+    assert first[SALT_OFFSET:HEADER_SIZE] != second[SALT_OFFSET:HEADER_SIZE]
+    assert first[HEADER_SIZE:] != second[HEADER_SIZE:]
+    assert open_sealed(key, first) == open_sealed(key, second) == b"same transcript"
+
+
+def test_sealed_payload_detects_tampering():
+    """Test that flipped, dropped, truncated or reordered segments fail to open."""
+    key = bytes(range(32))
+    token = seal(key, b"a" * 40, segment_size=16)
+    stride = 16 + TAG_SIZE
+    segments = [token[HEADER_SIZE + i * stride : HEADER_SIZE + (i + 1) * stride] for i in range(3)]
+    header = token[:HEADER_SIZE]
+
+    flipped = bytearray(token)
+    flipped[HEADER_SIZE + 3] ^= 1
+    salted = bytearray(token)
+    salted[SALT_OFFSET] ^= 1
+    for bad in (
+        bytes(flipped),
+        bytes(salted),
+        header + segments[0] + segments[1],  # Last segment dropped
+        token[:-1],
+        header + segments[1] + segments[0] + segments[2],
+    ):
+        with pytest.raises(InvalidToken):
+            open_sealed(key, bad)
+        with pytest.raises(InvalidToken):
+            b"".join(open_stream(key, [bad]))
+
+
+@pytest.mark.asyncio
+async def test_async_encryption_offloads_large_payloads(monkeypatch, db_session, test_patient):
+    """Test that large payloads are encrypted on the crypto pool."""
+    import threading
+
+    from app.core import crypto
+
+    threads = []
+    original = crypto.seal_text
+
+    def recording_seal(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr("app.services.data_keys.seal_text", recording_seal)
+    transcript = "Patient: still not sleeping. " * 20000
+    service = DataKeyService(db_session)
+
+    key_id, encrypted = await service.encrypt_transcript(test_patient.id, transcript)
+    await service.encrypt_transcript(test_patient.id, "short")
+
+    session = Session(transcript_encrypted=encrypted, transcript_key_id=key_id)
+    assert await service.decrypt_transcript(session) == transcript
+    assert threads[0].startswith("crypto")
+    assert threads[1] == threading.current_thread().name
+
+
 def test_hash_for_audit():
     """Test that audit hashing produces consistent hashes."""
     data = "Some data to hash"
@@ -77,8 +196,9 @@ async def test_transcript_stored_encrypted(client, clinician_user, test_patient,
     # The raw bytes should not contain the plaintext
     assert transcript_text.encode() not in session.transcript_encrypted
     
-    # But decryption should return original
-    decrypted = decrypt_data(session.transcript_encrypted)
+    # But decryption with the patient's data key should return original
+    assert session.transcript_key_id is not None
+    decrypted = await DataKeyService(db_session).decrypt_transcript(session)
     assert decrypted == transcript_text
 
 
@@ -108,3 +228,133 @@ async def test_transcript_not_in_response(client, clinician_user, test_patient):
     response_text = str(data)
     assert transcript_text not in response_text
     assert "transcript_length" in str(data["sessions"][0])
+
+
+async def create_sessions(client, clinician_user, db_session, count):
+    """Create one session for each of ``count`` new patients."""
+    headers = get_auth_header(clinician_user)
+    session_ids = []
+    for i in range(count):
+        patient = Patient(name=f"Patient {i}")
+        db_session.add(patient)
+        await db_session.commit()
+        response = await client.post(
+            f"/api/v1/sessions/patients/{patient.id}/sessions",
+            headers=headers,
+            json={"transcript": f"Transcript for patient {i}."},
+        )
+        session_ids.append(response.json()["id"])
+    await db_session.commit()
+    return session_ids
+
+
+@pytest.mark.asyncio
+async def test_transcripts_use_per_patient_data_keys(client, clinician_user, db_session):
+    """Test that each patient's transcripts are sealed with their own wrapped key."""
+    session_ids = await create_sessions(client, clinician_user, db_session, 2)
+    sessions = [await db_session.get(Session, session_id) for session_id in session_ids]
+    keys = (await db_session.execute(select(PatientDataKey))).scalars().all()
+
+    assert len(keys) == 2
+    assert {session.transcript_key_id for session in sessions} == {key.id for key in keys}
+    assert {key.master_key_id for key in keys} == {"default"}
+    with pytest.raises(InvalidToken):
+        decrypt_data(sessions[0].transcript_encrypted)  # Not the global key
+
+
+@pytest.mark.asyncio
+async def test_key_rotation_rewraps_data_keys_only(
+    client, clinician_user, db_session, monkeypatch
+):
+    """Test that rotating the master key rewraps keys in throttled batches, resumably."""
+    import os
+
+    from app.core import security
+    from app.core.metrics import KEY_ROTATION_PENDING
+    from tests.conftest import test_async_session
+
+    session_ids = await create_sessions(client, clinician_user, db_session, 5)
+    before = {
+        session_id: (await db_session.get(Session, session_id)).transcript_encrypted
+        for session_id in session_ids
+    }
+    # An orphaned key under a master key that is no longer configured
+    db_session.add(PatientDataKey(patient_id=999, master_key_id="lost", wrapped_key=b"x" * 60))
+    await db_session.commit()
+
+    keyring = {**security.get_master_keys(), "2026a": os.urandom(32)}
+    monkeypatch.setattr(security, "_master_keys", keyring)
+    monkeypatch.setattr(security.settings, "encryption_active_master_key", "2026a")
+
+    sleeps = []
+
+    async def record_sleep(seconds):
+        sleeps.append(seconds)
+
+    job = KeyRotationJob(
+        session_factory=test_async_session, batch_size=2, rows_per_second=10, sleep=record_sleep
+    )
+    result = await job.run()
+
+    assert (result.rewrapped, result.failed, result.remaining) == (5, 1, 1)
+    assert len(sleeps) == 3 and all(0 < seconds <= 0.2 for seconds in sleeps)
+    assert KEY_ROTATION_PENDING._value.get() == 1
+
+    headers = get_auth_header(clinician_user)
+    db_session.expire_all()
+    keys = (await db_session.execute(select(PatientDataKey))).scalars().all()
+    assert sorted(key.master_key_id for key in keys) == ["2026a"] * 5 + ["lost"]
+    for session_id in session_ids:
+        session = await db_session.get(Session, session_id)
+        assert session.transcript_encrypted == before[session_id]  # Not re-encrypted
+        response = await client.get(f"/api/v1/sessions/{session_id}/transcript", headers=headers)
+        assert response.json()["transcript"].startswith("Transcript for patient")
+
+    # Nothing left to do on a second run
+    assert (await job.run()).rewrapped == 0
+
+
+@pytest.mark.asyncio
+async def test_key_rotation_reseals_unkeyed_transcripts(
+    client, clinician_user, test_patient, db_session
+):
+    """Test that transcripts stored before data keys are re-sealed under the patient's key."""
+    from tests.conftest import test_async_session
+
+    legacy = {
+        "Sealed with the global key.": seal(get_transcript_key(), b"Sealed with the global key."),
+        "An old Fernet token.": get_fernet().encrypt(b"An old Fernet token."),
+    }
+    sessions = [
+        Session(
+            patient_id=test_patient.id,
+            created_by_user_id=clinician_user.id,
+            transcript_encrypted=token,
+            transcript_hash=hash_for_audit(transcript),
+        )
+        for transcript, token in legacy.items()
+    ]
+    broken = Session(
+        patient_id=test_patient.id,
+        created_by_user_id=clinician_user.id,
+        transcript_encrypted=b"not a token",
+        transcript_hash=hash_for_audit(""),
+    )
+    db_session.add_all([*sessions, broken])
+    await db_session.commit()
+
+    job = KeyRotationJob(session_factory=test_async_session, batch_size=2, rows_per_second=0)
+    result = await job.run()
+
+    assert (result.resealed, result.failed, result.unkeyed_remaining) == (2, 1, 1)
+    headers = get_auth_header(clinician_user)
+    db_session.expire_all()
+    for session, transcript in zip(sessions, legacy):
+        await db_session.refresh(session)
+        assert session.transcript_key_id is not None
+        assert session.transcript_encrypted != legacy[transcript]
+        response = await client.get(f"/api/v1/sessions/{session.id}/transcript", headers=headers)
+        assert response.json()["transcript"] == transcript
+
+    # Already re-sealed rows are not touched again
+    assert (await job.run()).resealed == 0
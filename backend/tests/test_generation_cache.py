@@ -0,0 +1,179 @@
+"""Tests for the generation cache."""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import get_settings
+from app.services.generation_cache import GenerationCache, GenerationCacheKey
+from app.services.llm_backends import GeminiBackend
+from app.services.llm_client import LLMClient
+from app.services.notes import NotesService
+from tests.conftest import get_auth_header
+
+settings = get_settings()
+
+
+class CountingModel:
+    """Fake Gemini model that counts calls."""
+
+    def __init__(self, payload: str):
+        self.payload = payload
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(text=self.payload)
+
+
+def make_key(**overrides) -> GenerationCacheKey:
+    """Build a cache key with default fields."""
+    fields = {
+        "transcript_hash": "abc",
+        "prompt_version": "v1",
+        "model_name": "gemini-test",
+        "safe_mode": False,
+        "temperature": 0.0,
+        "schema_version": "s1",
+    }
+    fields.update(overrides)
+    return GenerationCacheKey(**fields)
+
+
+def test_cache_key_covers_all_inputs():
+    """Test that changing any input changes the digest."""
+    base = make_key().digest
+
+    assert make_key(prompt_version="v2").digest != base
+    assert make_key(safe_mode=True).digest != base
+    assert make_key(temperature=0.5).digest != base
+    assert make_key(schema_version="s2").digest != base
+    assert make_key(generation_mode="parallel").digest != base
+    assert make_key(generation_mode="chunked").digest != base
+    assert make_key(generation_mode="chunked").digest != make_key(generation_mode="parallel").digest
+    assert make_key().digest == base
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = GenerationCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+
+def test_ttl_expiry():
+    """Test that entries expire after the TTL."""
+    cache = GenerationCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "1")
+    cache._entries["a"] = (time.monotonic() - 1, "1")
+
+    assert cache.get("a") is None
+
+
+@pytest.fixture
+async def session_id(client, clinician_user, test_patient):
+    """Create a session through the API."""
+    response = await client.post(
+        f"/api/v1/sessions/patients/{test_patient.id}/sessions",
+        headers=get_auth_header(clinician_user),
+        json={"transcript": "Patient reports poor sleep and low mood."},
+    )
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_repeat_generation_served_from_cache(db_session, clinician_user, session_id):
+    """Test that a repeated generation skips the model call."""
+    llm_client = LLMClient(api_key="")
+    model = CountingModel(llm_client.create_empty_output().model_dump_json())
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+    service = NotesService(db_session, llm_client=llm_client, generation_cache=GenerationCache())
+
+    first = await service.generate_ai_suggestions(session_id, clinician_user.id)
+    second = await service.generate_ai_suggestions(session_id, clinician_user.id)
+
+    assert model.calls == 1
+    assert first.cached is False
+    assert second.cached is True
+    assert second.ai_suggestion_id != first.ai_suggestion_id
+
+
+@pytest.mark.asyncio
+async def test_bypass_cache_calls_model(db_session, clinician_user, session_id):
+    """Test that bypass_cache forces a model call."""
+    llm_client = LLMClient(api_key="")
+    model = CountingModel(llm_client.create_empty_output().model_dump_json())
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+    service = NotesService(db_session, llm_client=llm_client, generation_cache=GenerationCache())
+
+    await service.generate_ai_suggestions(session_id, clinician_user.id)
+    response = await service.generate_ai_suggestions(
+        session_id, clinician_user.id, bypass_cache=True
+    )
+
+    assert model.calls == 2
+    assert response.cached is False
+
+
+@pytest.mark.asyncio
+async def test_cache_falls_back_to_stored_suggestions(db_session, clinician_user, session_id):
+    """Test that a cold in-memory cache is filled from stored suggestions."""
+    llm_client = LLMClient(api_key="")
+    model = CountingModel(llm_client.create_empty_output().model_dump_json())
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+
+    await NotesService(
+        db_session, llm_client=llm_client, generation_cache=GenerationCache()
+    ).generate_ai_suggestions(session_id, clinician_user.id)
+    response = await NotesService(
+        db_session, llm_client=llm_client, generation_cache=GenerationCache()
+    ).generate_ai_suggestions(session_id, clinician_user.id)
+
+    assert model.calls == 1
+    assert response.cached is True
+
+
+@pytest.mark.asyncio
+async def test_repaired_output_warns_and_is_not_cached(db_session, clinician_user, session_id):
+    """Test that output filled in by local repair is flagged and never reused."""
+    llm_client = LLMClient(api_key="")
+    output = llm_client.create_empty_output().model_dump()
+    del output["soap"]
+    model = CountingModel(json.dumps(output))
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+    service = NotesService(db_session, llm_client=llm_client, generation_cache=GenerationCache())
+
+    first = await service.generate_ai_suggestions(session_id, clinician_user.id)
+    second = await service.generate_ai_suggestions(session_id, clinician_user.id)
+
+    assert model.calls == 2
+    assert second.cached is False
+    assert "repaired" in first.warning_message
+    assert "soap" in first.warning_message
+
+
+@pytest.mark.asyncio
+async def test_chunked_generation_not_served_from_full_cache(
+    db_session, clinician_user, session_id, monkeypatch
+):
+    """Test that a transcript now over the chunk threshold is not served a full-mode output."""
+    llm_client = LLMClient(api_key="")
+    model = CountingModel(llm_client.create_empty_output().model_dump_json())
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+    service = NotesService(db_session, llm_client=llm_client, generation_cache=GenerationCache())
+
+    await service.generate_ai_suggestions(session_id, clinician_user.id)
+    calls = model.calls
+    monkeypatch.setattr(settings, "transcript_chunk_threshold_chars", 10)
+    response = await service.generate_ai_suggestions(session_id, clinician_user.id)
+
+    assert model.calls > calls
+    assert response.cached is False
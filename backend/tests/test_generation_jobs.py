@@ -0,0 +1,185 @@
+"""Tests for background generation jobs."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.security import hash_for_audit
+from app.db.models import GenerationJob, Session
+from app.main import app
+from app.services.data_keys import DataKeyService
+from app.services.generation_jobs import GenerationJobQueue, get_generation_job_queue
+from tests import conftest
+from tests.conftest import get_auth_header
+
+
+@pytest.fixture
+async def job_queue(db_session):
+    """Run a job queue against the test database."""
+    queue = GenerationJobQueue(session_factory=conftest.test_async_session, workers=2)
+    await queue.start()
+    app.dependency_overrides[get_generation_job_queue] = lambda: queue
+    yield queue
+    await queue.stop()
+
+
+@pytest.fixture
+async def committed_session(db_session, clinician_user, test_patient):
+    """Create a committed session visible to job workers."""
+    transcript = "Patient reports poor sleep and low mood."
+    key_id, token = await DataKeyService(db_session).encrypt_transcript(test_patient.id, transcript)
+    session = Session(
+        patient_id=test_patient.id,
+        created_by_user_id=clinician_user.id,
+        transcript_encrypted=token,
+        transcript_key_id=key_id,
+        transcript_hash=hash_for_audit(transcript),
+    )
+    db_session.add(session)
+    await db_session.commit()
+    return session
+
+
+async def wait_for_job(client, job_id, headers, timeout=5.0):
+    """Poll a job until it reaches a terminal status."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        response = await client.get(f"/api/v1/jobs/{job_id}", headers=headers)
+        data = response.json()
+        if data["status"] in ("succeeded", "failed"):
+            return data
+        await asyncio.sleep(0.05)
+    raise AssertionError("Job did not finish in time")
+
+
+@pytest.mark.asyncio
+async def test_queue_generation_returns_job(client, clinician_user, committed_session, job_queue):
+    """Test that queueing returns 202 with a job id and the job completes."""
+    headers = get_auth_header(clinician_user)
+
+    response = await client.post(
+        f"/api/v1/sessions/{committed_session.id}/generate/jobs",
+        headers=headers,
+        json={},
+    )
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+
+    finished = await wait_for_job(client, job["id"], headers)
+    assert finished["status"] == "succeeded"
+    assert finished["result"]["note_version_id"] is not None
+
+
+@pytest.mark.asyncio
+async def test_job_events_stream(client, clinician_user, committed_session, job_queue):
+    """Test that the event stream ends with the finished job."""
+    headers = get_auth_header(clinician_user)
+    response = await client.post(
+        f"/api/v1/sessions/{committed_session.id}/generate/jobs",
+        headers=headers,
+        json={},
+    )
+    job_id = response.json()["id"]
+
+    events = []
+    async with client.stream("GET", f"/api/v1/jobs/{job_id}/events", headers=headers) as stream:
+        async for line in stream.aiter_lines():
+            if line.startswith("data: "):
+                events.append(json.loads(line[len("data: "):]))
+
+    assert events[-1]["status"] == "succeeded"
+    assert events[-1]["result"] is not None
+
+
+@pytest.mark.asyncio
+async def test_queue_generation_unknown_session(client, clinician_user, job_queue):
+    """Test that queueing for a missing session returns 404."""
+    response = await client.post(
+        "/api/v1/sessions/9999/generate/jobs",
+        headers=get_auth_header(clinician_user),
+        json={},
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_requeued_on_start(db_session, committed_session, clinician_user):
+    """Test that only jobs whose worker stopped heartbeating are picked up again."""
+    now = datetime.now(timezone.utc)
+    for job_id, heartbeat_at in (("stale", now - timedelta(minutes=5)), ("live", now)):
+        db_session.add(
+            GenerationJob(
+                id=job_id,
+                session_id=committed_session.id,
+                requested_by_user_id=clinician_user.id,
+                status="running",
+                params_json="{}",
+                heartbeat_at=heartbeat_at,
+            )
+        )
+    await db_session.commit()
+
+    queue = GenerationJobQueue(
+        session_factory=conftest.test_async_session, workers=1, lease_seconds=60
+    )
+    await queue.start()
+    try:
+        await asyncio.wait_for(queue._queue.join(), timeout=5.0)
+    finally:
+        await queue.stop()
+
+    assert (await queue.get("stale")).status == "succeeded"
+    assert (await queue.get("live")).status == "running"
+
+
+@pytest.mark.asyncio
+async def test_job_is_claimed_once(db_session, committed_session, clinician_user):
+    """Test that a job handed to two workers is only claimed by one."""
+    db_session.add(
+        GenerationJob(
+            id="shared",
+            session_id=committed_session.id,
+            requested_by_user_id=clinician_user.id,
+            status="queued",
+            params_json="{}",
+        )
+    )
+    await db_session.commit()
+
+    first = GenerationJobQueue(session_factory=conftest.test_async_session)
+    second = GenerationJobQueue(session_factory=conftest.test_async_session)
+    claims = await asyncio.gather(first._claim("shared"), second._claim("shared"))
+
+    assert sorted(claim is None for claim in claims) == [False, True]
+    job = await first.get("shared")
+    assert job.status == "running"
+    assert job.heartbeat_at is not None
+
+
+@pytest.mark.asyncio
+async def test_watching_finished_job_registers_nothing(
+    db_session, committed_session, clinician_user
+):
+    """Test that watching a finished job returns no event and leaves no watcher."""
+    db_session.add(
+        GenerationJob(
+            id="done",
+            session_id=committed_session.id,
+            requested_by_user_id=clinician_user.id,
+            status="succeeded",
+            params_json="{}",
+        )
+    )
+    await db_session.commit()
+
+    queue = GenerationJobQueue(session_factory=conftest.test_async_session)
+    job, update = await queue.watch("done")
+
+    assert job.status == "succeeded"
+    assert update is None
+    assert queue._watchers == {}
@@ -22,6 +22,56 @@ async def test_readiness_check(client: AsyncClient):
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "ready"
+    assert data["database"] == "ok"
+    assert data["pool"]["saturated"] is False
+    assert data["pool"]["capacity"] > 0
+
+
+@pytest.mark.asyncio
+async def test_readiness_fails_when_pool_saturated(client: AsyncClient, monkeypatch):
+    """Test that a saturated pool fails readiness without waiting for a connection."""
+    from app.api.routes import health
+
+    monkeypatch.setattr(health.settings, "db_pool_saturation_threshold", 0.0)
+
+    response = await client.get("/api/v1/readyz")
+
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["database"] == "skipped"
+    assert data["pool"]["saturated"] is True
+
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_pragmas_and_pool_metrics(tmp_path):
+    """Test that new SQLite connections get the pragmas and checkouts are timed."""
+    from sqlalchemy import text
+
+    from app.core.metrics import DB_POOL_CHECKOUT_WAIT
+    from app.db.session import TimedQueuePool, create_engine
+
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}")
+    waits = DB_POOL_CHECKOUT_WAIT.collect()[0]
+    before = next(s.value for s in waits.samples if s.name.endswith("_count"))
+    try:
+        async with engine.connect() as conn:
+            pragmas = {
+                name: (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size")
+            }
+    finally:
+        await engine.dispose()
+
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": 5000,
+        "mmap_size": 268435456,
+    }
+    waits = DB_POOL_CHECKOUT_WAIT.collect()[0]
+    assert next(s.value for s in waits.samples if s.name.endswith("_count")) == before + 1
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,168 @@
+"""Tests for local JSON repair of model output."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.ai import AiOutputSchema, DiagnosisSuggestion, SafetyPlan
+from app.services.json_repair import JsonRepairError, repair_json, tolerant_json_loads
+from app.services.llm_backends import GeminiBackend
+from app.services.llm_client import LLMClient
+
+
+@pytest.fixture
+def empty_output() -> AiOutputSchema:
+    """Fallback output used to fill missing fields."""
+    return LLMClient(api_key="").create_empty_output()
+
+
+def test_strict_and_fenced(empty_output):
+    """Test that valid output, fenced or not, passes the strict tier."""
+    payload = empty_output.model_dump_json()
+
+    assert repair_json(payload, AiOutputSchema)[1] == "strict"
+    assert repair_json(f"```json\n{payload}\n```", AiOutputSchema)[1] == "strict"
+
+
+def test_extract_from_prose(empty_output):
+    """Test that JSON wrapped in prose is extracted."""
+    payload = empty_output.model_dump_json()
+
+    parsed, tier, _ = repair_json(f"Here is the note:\n{payload}\nLet me know!", AiOutputSchema)
+
+    assert tier == "extract"
+    assert parsed == empty_output
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"a": [1, 2,], "b": {"c": 3,},}', {"a": [1, 2], "b": {"c": 3}}),
+        ("{'a': 'it\\'s', 'b': \"say \\\"hi\\\"\"}", {"a": "it's", "b": 'say "hi"'}),
+        ('{"a": True, "b": None, "c": False}', {"a": True, "b": None, "c": False}),
+        ('{"a": {"b": [1, 2, {"c": "tex', {"a": {"b": [1, 2, {"c": "tex"}]}}),
+        ('{"a": 1, "b": ', {"a": 1}),
+    ],
+)
+def test_tolerant_parse(text, expected):
+    """Test the common model JSON mistakes."""
+    assert tolerant_json_loads(text) == expected
+
+
+def test_truncated_output_is_completed(empty_output):
+    """Test that output cut off mid-document still yields a valid note."""
+    payload = empty_output.model_dump_json()
+    truncated = payload[: payload.index('"safety_plan"') + 20]
+
+    parsed, tier, _ = repair_json(truncated, AiOutputSchema, empty_output)
+
+    assert tier == "coerce"
+    assert parsed.safety_plan == empty_output.safety_plan
+
+
+def test_coerce_fixes_schema_mismatches():
+    """Test percentages, number parsing, truncation and dropping bad list items."""
+    data = {
+        "primary": {
+            "diagnosis": "Major depressive disorder",
+            "confidence": "85",
+            "rationale": "Low mood",
+            "citations": [{"text": "x" * 300}],
+        },
+        "differential": [
+            {"diagnosis": "GAD", "confidence": "60%", "rationale": "Worry"},
+            {"diagnosis": "Missing rationale and confidence"},
+            {"diagnosis": "PTSD", "confidence": 140, "rationale": "Out of range"},
+        ],
+    }
+
+    parsed, tier, report = repair_json(
+        json.dumps(data), DiagnosisSuggestion, DiagnosisSuggestion()
+    )
+
+    assert tier == "coerce"
+    assert parsed.primary.confidence == pytest.approx(0.85)
+    assert len(parsed.primary.citations[0].text) == 150
+    assert [item.diagnosis for item in parsed.differential] == ["GAD"]
+    assert parsed.differential[0].confidence == pytest.approx(0.6)
+    assert report.coerced == [
+        "primary.confidence",
+        "primary.citations.0.text",
+        "differential.0.confidence",
+    ]
+    # Paths are positions at the time of each drop; PTSD moved up to 1
+    assert report.dropped == ["differential.1", "differential.1"]
+
+
+def test_coerce_reads_only_known_bool_tokens():
+    """Test that unknown yes/no answers fall back or drop instead of becoming True."""
+    data = {
+        "warning_signs": [
+            {"item": "Withdrawing", "completed": "not yet"},
+            {"item": "Poor sleep", "completed": "maybe"},
+        ],
+        "coping_strategies": [{"item": "Walk", "completed": "Yes"}],
+    }
+
+    parsed, _, report = repair_json(json.dumps(data), SafetyPlan, SafetyPlan())
+
+    assert [(item.item, item.completed) for item in parsed.warning_signs] == [
+        ("Withdrawing", False)
+    ]
+    assert parsed.coping_strategies[0].completed is True
+    assert report.dropped == ["warning_signs.1"]
+
+
+def test_out_of_range_field_outside_a_list_is_filled_from_fallback():
+    """Test that an unusable nested value falls back instead of being clamped."""
+    data = {"primary": {"diagnosis": "MDD", "confidence": -3, "rationale": "Low mood"}}
+
+    parsed, _, report = repair_json(json.dumps(data), DiagnosisSuggestion, DiagnosisSuggestion())
+
+    assert parsed.primary is None
+    assert report.filled == ["primary"]
+
+
+def test_unrecoverable_output():
+    """Test that output with no JSON at all is left to the LLM fix."""
+    with pytest.raises(JsonRepairError):
+        repair_json("I'm sorry, I can't help with that.", AiOutputSchema)
+
+
+class FakeModel:
+    """Fake Gemini model returning queued responses."""
+
+    def __init__(self, *responses: str):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(text=self.responses.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_generate_repairs_locally_without_second_call(empty_output):
+    """Test that a trailing comma does not cost an LLM fix round trip."""
+    llm_client = LLMClient(api_key="")
+    broken = empty_output.model_dump_json()[:-1] + ",}"
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=FakeModel(broken))
+
+    parsed, _ = await llm_client.generate(transcript="Patient reports low mood.")
+
+    assert parsed == empty_output
+    assert llm_client.backend.model.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_falls_back_to_llm_fix(empty_output):
+    """Test that unrecoverable output is sent back to the model once."""
+    llm_client = LLMClient(api_key="")
+    model = FakeModel("Sorry, no JSON today.", empty_output.model_dump_json())
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+
+    parsed, _ = await llm_client.generate(transcript="Patient reports low mood.")
+
+    assert parsed == empty_output
+    assert llm_client.backend.model.calls == 2
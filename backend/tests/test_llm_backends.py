@@ -0,0 +1,110 @@
+"""Tests for the pluggable LLM backends."""
+
+import pytest
+
+from app.core.config import get_settings
+from app.schemas.ai import AiOutputSchema, DiagnosisSuggestion
+from app.services.chunking import iter_citations
+from app.services.llm_backends import (
+    FakeBackend,
+    GeminiBackend,
+    build_fake_output,
+    build_fake_response,
+    create_llm_backend,
+)
+from app.services.llm_client import LLMClient
+from app.services.prompts import get_prompt_template
+
+TRANSCRIPT = (
+    "Clinician: How have you been sleeping?\n"
+    "Patient: Badly. I wake at 3am and have had low mood most days.\n"
+    "Clinician: Are you still taking sertraline 50mg?\n"
+    "Patient: Yes, sertraline 50mg every morning.\n"
+)
+
+
+def fake_backend(**kwargs) -> FakeBackend:
+    """Fake backend without latency."""
+    return FakeBackend(latency_ms=0, distribution="fixed", seed=0, **kwargs)
+
+
+def test_fake_output_cites_transcript():
+    """Test that every citation is a verbatim quote at its offsets."""
+    output = build_fake_output(TRANSCRIPT)
+
+    citations = list(iter_citations(output))
+    assert citations
+    for citation in citations:
+        assert TRANSCRIPT[citation.start_offset : citation.end_offset] == citation.text
+    assert output.diagnosis.primary.diagnosis.startswith("Major depressive disorder")
+    assert [med.medication for med in output.medications.medications] == ["Sertraline"]
+
+
+def test_fake_output_without_speaker_labels():
+    """Test that narrative transcripts are cited sentence by sentence."""
+    transcript = "Patient reports low mood. Sleep is poor. Denies self-harm."
+
+    output = build_fake_output(transcript)
+
+    assert output.soap.subjective.citations[0].text == "Patient reports low mood."
+    for citation in iter_citations(output):
+        assert transcript[citation.start_offset : citation.end_offset] == citation.text
+
+
+def test_fake_response_matches_prompt_schema():
+    """Test that full and section prompts get JSON for their own schema."""
+    template = get_prompt_template("v1")
+
+    full = build_fake_response(template.render(TRANSCRIPT))
+    section = build_fake_response(template.render(TRANSCRIPT, section="diagnosis"))
+
+    AiOutputSchema.model_validate_json(full)
+    assert DiagnosisSuggestion.model_validate_json(section).primary is not None
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_injects_faults():
+    """Test error and malformed-output injection."""
+    with pytest.raises(ConnectionError):
+        await fake_backend(error_rate=1.0).generate("prompt", 0.0, 100, 1.0)
+
+    text = await fake_backend(malformed_rate=1.0).generate("prompt", 0.0, 100, 1.0)
+    with pytest.raises(ValueError):
+        AiOutputSchema.model_validate_json(text)
+
+
+def test_latency_distributions():
+    """Test that sampled latencies follow the configured distribution."""
+    assert FakeBackend(latency_ms=200, distribution="fixed").sample_latency() == 0.2
+
+    uniform = FakeBackend(latency_ms=200, distribution="uniform", spread=0.5, seed=1)
+    assert all(0.1 <= uniform.sample_latency() <= 0.3 for _ in range(100))
+
+    with pytest.raises(ValueError):
+        FakeBackend(distribution="bimodal")
+
+
+def test_create_backend_from_settings():
+    """Test backend selection by LLM_BACKEND."""
+    def backend_settings(name: str):
+        return get_settings().model_copy(update={"llm_backend": name})
+
+    assert isinstance(create_llm_backend(backend_settings("fake"), "m", None), FakeBackend)
+    assert isinstance(create_llm_backend(backend_settings("gemini"), "m", "k"), GeminiBackend)
+    assert create_llm_backend(backend_settings("gemini"), "m", "") is None
+    with pytest.raises(ValueError):
+        create_llm_backend(backend_settings("other"), "m", "k")
+
+
+@pytest.mark.asyncio
+async def test_client_generates_through_fake_backend():
+    """Test the full generate and per-section paths against the fake backend."""
+    llm_client = LLMClient(backend=fake_backend())
+
+    output, _ = await llm_client.generate(transcript=TRANSCRIPT)
+    sections, _, failed = await llm_client.generate_sections(transcript=TRANSCRIPT)
+
+    assert llm_client.model_name == "fake-llm"
+    assert output.soap.subjective.citations
+    assert sections == output
+    assert failed == []
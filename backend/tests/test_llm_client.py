@@ -0,0 +1,119 @@
+"""Tests for the LLM client."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.llm_backends import GeminiBackend
+from app.services.llm_client import LLMClient
+from app.services.prompts import OUTPUT_SECTION_MODELS
+
+
+class FakeModel:
+    """Fake Gemini model that sleeps before returning a fixed payload."""
+
+    def __init__(self, latency_s: float, payload: str):
+        self.latency_s = latency_s
+        self.payload = payload
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        return SimpleNamespace(text=self.payload)
+
+
+@pytest.fixture
+def llm_client():
+    """Create an LLM client without an API key."""
+    return LLMClient(api_key="")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_generations_overlap(llm_client):
+    """Test that slow model calls do not serialize on the event loop."""
+    payload = llm_client.create_empty_output().model_dump_json()
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=FakeModel(0.2, payload))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(llm_client.generate(transcript="Patient reports low mood.") for _ in range(10))
+    )
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 10
+    assert elapsed < 1.0  # 10 x 0.2s would take 2s if serialized
+
+
+@pytest.mark.asyncio
+async def test_model_call_times_out(llm_client):
+    """Test that a hung model call is abandoned after the deadline."""
+    payload = llm_client.create_empty_output().model_dump_json()
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=FakeModel(5.0, payload))
+    llm_client.timeout_seconds = 0.05
+
+    with pytest.raises(TimeoutError):
+        await llm_client._call_model("prompt", temperature=0.0)
+
+
+class FakeSectionModel:
+    """Fake Gemini model that answers section prompts, optionally failing some."""
+
+    def __init__(self, latency_s: float, output, failing: tuple[str, ...] = ()):
+        self.latency_s = latency_s
+        self.output = output
+        self.failing = failing
+
+    async def generate_content_async(self, prompt, **kwargs):
+        await asyncio.sleep(self.latency_s)
+        for section, model in OUTPUT_SECTION_MODELS.items():
+            if f'"title": "{model.__name__}"' in prompt:
+                if section in self.failing:
+                    raise RuntimeError("section failed")
+                return SimpleNamespace(text=getattr(self.output, section).model_dump_json())
+        raise AssertionError("Not a section prompt")
+
+
+@pytest.mark.asyncio
+async def test_generate_sections_runs_concurrently(llm_client):
+    """Test that section calls overlap and merge into one output."""
+    output = llm_client.create_empty_output()
+    output.soap.subjective.content = "Poor sleep."
+    output.medications.general_guidance = "Take with food."
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=FakeSectionModel(0.2, output))
+
+    start = time.perf_counter()
+    merged, _, failed = await llm_client.generate_sections(transcript="Patient reports poor sleep.")
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6  # 4 x 0.2s would take 0.8s if serialized
+    assert failed == []
+    assert merged == output
+
+
+@pytest.mark.asyncio
+async def test_generate_sections_partial_failure(llm_client):
+    """Test that only the failed section falls back to empty output."""
+    output = llm_client.create_empty_output()
+    output.soap.plan.content = "Follow up in two weeks."
+    model = FakeSectionModel(0.0, output, failing=("diagnosis",))
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+
+    merged, _, failed = await llm_client.generate_sections(transcript="Patient reports poor sleep.")
+
+    assert failed == ["diagnosis"]
+    assert merged.soap.plan.content == "Follow up in two weeks."
+    assert merged.diagnosis == llm_client.create_empty_output().diagnosis
+
+
+@pytest.mark.asyncio
+async def test_generate_sections_all_failed(llm_client):
+    """Test that losing every section raises instead of returning an empty note."""
+    output = llm_client.create_empty_output()
+    model = FakeSectionModel(0.0, output, failing=tuple(OUTPUT_SECTION_MODELS))
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=model)
+
+    with pytest.raises(RuntimeError):
+        await llm_client.generate_sections(transcript="Patient reports poor sleep.")
@@ -2,9 +2,9 @@
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from app.db.models import NoteVersion, NoteStatus
+from app.db.models import NoteVersion, NoteStatus, Session
 from tests.conftest import get_auth_header
 
 
@@ -30,6 +30,9 @@ async def session_with_version(client, clinician_user, test_patient, db_session)
         created_by_user_id=clinician_user.id,
     )
     db_session.add(version)
+    await db_session.execute(
+        update(Session).where(Session.id == session_id).values(version_count=1)
+    )
     await db_session.commit()
     await db_session.refresh(version)
     
@@ -53,6 +56,39 @@ async def test_list_versions(client, clinician_user, session_with_version):
     assert len(data["versions"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_list_version_summaries(client, clinician_user, session_with_version, db_session):
+    """Test that summaries omit the bodies, which are stored compressed."""
+    import zlib
+
+    from sqlalchemy import text
+
+    headers = get_auth_header(clinician_user)
+    session_id = session_with_version["session_id"]
+
+    response = await client.get(
+        f"/api/v1/notes/sessions/{session_id}/versions/summary",
+        headers=headers,
+    )
+    full = await client.get(f"/api/v1/notes/sessions/{session_id}/versions", headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["versions"][0]["id"] == session_with_version["version_id"]
+    assert "soap_json" not in data["versions"][0]
+
+    soap_json = '{"subjective": {"content": "Test", "citations": []}}'
+    assert full.json()["versions"][0]["soap_json"] == soap_json
+    stored = (
+        await db_session.execute(
+            text("SELECT soap_json FROM note_versions WHERE id = :id"),
+            {"id": session_with_version["version_id"]},
+        )
+    ).scalar_one()
+    assert zlib.decompress(stored).decode() == soap_json
+
+
 @pytest.mark.asyncio
 async def test_get_version(client, clinician_user, session_with_version):
     """Test getting a specific version."""
@@ -144,6 +180,9 @@ async def test_rollback_version(client, clinician_user, session_with_version, db
         created_by_user_id=clinician_user.id,
     )
     db_session.add(version2)
+    await db_session.execute(
+        update(Session).where(Session.id == session_id).values(version_count=2)
+    )
     await db_session.commit()
     
     # Rollback to version 1
@@ -186,3 +225,80 @@ async def test_viewer_cannot_finalize(client, viewer_user, session_with_version)
     )
     
     assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_concurrent_versions_get_distinct_numbers(
+    client, clinician_user, session_with_version, db_session, monkeypatch
+):
+    """Test that concurrent generations and rollbacks number versions 1..n with no gaps."""
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.db.session import get_db
+    from app.main import app
+    from app.services.llm_backends import FakeBackend
+    from app.services.llm_client import get_llm_client
+    from app.services.resilience import AdaptiveConcurrencyLimiter
+    from tests.conftest import TEST_DATABASE_URL
+
+    headers = get_auth_header(clinician_user)
+    session_id = session_with_version["session_id"]
+
+    # Each request gets its own connection, so writers really interleave
+    engine = create_async_engine(TEST_DATABASE_URL, connect_args={"timeout": 30})
+    request_session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    async def per_request_db():
+        async with request_session() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    llm_client = get_llm_client()
+    monkeypatch.setattr(
+        llm_client, "backend", FakeBackend(latency_ms=20, distribution="fixed", seed=1)
+    )
+    monkeypatch.setattr(llm_client, "limiter", AdaptiveConcurrencyLimiter("test", max_limit=50))
+    app.dependency_overrides[get_db] = per_request_db
+    try:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    f"/api/v1/sessions/{session_id}/generate",
+                    headers=headers,
+                    json={"bypass_cache": True},
+                )
+                for _ in range(20)
+            ),
+            *(
+                client.post(
+                    f"/api/v1/notes/sessions/{session_id}/rollback",
+                    headers=headers,
+                    json={"target_version_id": session_with_version["version_id"]},
+                )
+                for _ in range(20)
+            ),
+        )
+    finally:
+        await engine.dispose()
+
+    assert [response.status_code for response in responses] == [200] * 40
+    db_session.expire_all()
+    numbers = (
+        await db_session.execute(
+            select(NoteVersion.version_number)
+            .where(NoteVersion.session_id == session_id)
+            .order_by(NoteVersion.version_number)
+        )
+    ).scalars().all()
+    assert numbers == list(range(1, 42))
+
+    session = await db_session.get(Session, session_id)
+    latest = await db_session.get(NoteVersion, session.latest_version_id)
+    assert session.version_count == 41
+    assert latest.version_number == 41
@@ -0,0 +1,103 @@
+"""Tests for keyset (cursor) pagination."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, split_page
+from app.db.models import Patient
+from tests.conftest import get_auth_header
+
+
+def test_cursor_round_trip():
+    """Test that cursors are opaque and decode to what was encoded."""
+    created_at = datetime(2026, 10, 18, 9, 30, 15, 123456)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(datetime.now(), 1)[:-3]])
+def test_invalid_cursor(cursor):
+    """Test that malformed cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_unlimited_page_has_no_cursor():
+    """Test that without a limit every row is returned and no cursor is built."""
+    rows = [SimpleNamespace(created_at=datetime.now(), id=index) for index in range(150)]
+
+    page, cursor = split_page(rows, None)
+
+    assert page == rows
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_patient_pages_follow_cursor(client: AsyncClient, db_session, clinician_user):
+    """Test walking every page, including rows created in the same second."""
+    db_session.add_all([Patient(name=f"Patient {index}") for index in range(7)])
+    await db_session.commit()
+    headers = get_auth_header(clinician_user)
+
+    everything = await client.get("/api/v1/patients", headers=headers)
+    seen = []
+    params = {"limit": 3}
+    while True:
+        response = await client.get("/api/v1/patients", headers=headers, params=params)
+        assert response.status_code == 200
+        seen.extend(patient["id"] for patient in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert seen == [patient["id"] for patient in everything.json()]
+    assert len(seen) == 7
+
+
+@pytest.mark.asyncio
+async def test_session_pages_keep_total(client: AsyncClient, clinician_user, test_patient):
+    """Test that later pages still report the full total."""
+    headers = get_auth_header(clinician_user)
+    url = f"/api/v1/sessions/patients/{test_patient.id}/sessions"
+    for index in range(5):
+        await client.post(url, headers=headers, json={"transcript": f"Session {index}."})
+
+    first = (await client.get(url, headers=headers, params={"limit": 2})).json()
+    second = (
+        await client.get(url, headers=headers, params={"limit": 2, "cursor": first["next_cursor"]})
+    ).json()
+    offset = (await client.get(url, headers=headers, params={"limit": 2, "skip": 2})).json()
+
+    assert second["total"] == first["total"] == 5
+    assert second["sessions"] == offset["sessions"]
+    assert second["next_cursor"] is not None
+
+
+@pytest.mark.asyncio
+async def test_audit_log_cursor_errors(client: AsyncClient, admin_user, test_patient):
+    """Test that a bad cursor, or a cursor with an offset, is rejected."""
+    headers = get_auth_header(admin_user)
+    for index in range(3):
+        await client.put(
+            f"/api/v1/patients/{test_patient.id}", headers=headers, json={"name": f"Name {index}"}
+        )
+
+    first = (await client.get("/api/v1/audit/logs", headers=headers, params={"limit": 2})).json()
+    assert first["next_cursor"]
+
+    combined = await client.get(
+        "/api/v1/audit/logs",
+        headers=headers,
+        params={"cursor": first["next_cursor"], "offset": 2},
+    )
+    invalid = await client.get("/api/v1/audit/logs", headers=headers, params={"cursor": "x"})
+
+    assert combined.status_code == 400
+    assert invalid.status_code == 400
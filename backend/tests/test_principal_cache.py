@@ -0,0 +1,81 @@
+"""Tests for the authenticated user cache."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, update
+
+from app.db.models import User, UserRole
+from app.services.principal_cache import Principal, PrincipalCache
+from tests.conftest import get_auth_header
+
+
+def test_entries_expire_and_evict_least_recent():
+    """Test TTL expiry and LRU eviction."""
+    now = [0.0]
+    cache = PrincipalCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    for user_id in (1, 2):
+        cache.set(Principal(id=user_id, role="viewer", is_active=True))
+
+    assert cache.get(1) is not None  # 2 is now least recently used
+    cache.set(Principal(id=3, role="viewer", is_active=True))
+    assert cache.get(2) is None
+    assert cache.get(3) is not None
+
+    now[0] = 11.0
+    assert cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_skips_users_query(client: AsyncClient, clinician_user, db_session):
+    """Test that a repeat request authorizes without reading the users table."""
+    headers = get_auth_header(clinician_user)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        for _ in range(2):
+            statements.clear()
+            response = await client.get("/api/v1/patients", headers=headers)
+            assert response.status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not [statement for statement in statements if "FROM users" in statement]
+
+
+@pytest.mark.asyncio
+async def test_deactivation_and_role_change_invalidate(
+    client: AsyncClient, admin_user, db_session
+):
+    """Test that committed user changes apply on the next request."""
+    headers = get_auth_header(admin_user)
+    assert (await client.get("/api/v1/audit/logs", headers=headers)).status_code == 200
+
+    admin_user.role = UserRole.VIEWER.value
+    await db_session.commit()
+    assert (await client.get("/api/v1/audit/logs", headers=headers)).status_code == 403
+    assert (await client.get("/api/v1/patients", headers=headers)).status_code == 200
+
+    admin_user.is_active = False
+    await db_session.commit()
+    response = await client.get("/api/v1/patients", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "User account is disabled"
+
+
+@pytest.mark.asyncio
+async def test_bulk_user_update_invalidates(client: AsyncClient, admin_user, db_session):
+    """Test that an update(User) statement, which skips the flush, still applies."""
+    headers = get_auth_header(admin_user)
+    assert (await client.get("/api/v1/audit/logs", headers=headers)).status_code == 200
+
+    await db_session.execute(
+        update(User).where(User.id == admin_user.id).values(role=UserRole.VIEWER.value)
+    )
+    await db_session.commit()
+    assert (await client.get("/api/v1/audit/logs", headers=headers)).status_code == 403
@@ -0,0 +1,66 @@
+"""Tests for prompt templates."""
+
+import json
+
+import pytest
+
+from app.schemas.ai import AiOutputSchema
+from app.services.prompts import (
+    FULL_PROMPT_TEMPLATE,
+    SAFE_MODE_PROMPT_TEMPLATE,
+    get_prompt_template,
+    get_schema_text,
+)
+from tests.conftest import get_auth_header
+
+
+def test_v1_matches_original_format():
+    """Test that v1 renders exactly what str.format produced before caching."""
+    transcript = "Patient said {not a placeholder} and felt low."
+    schema = json.dumps(AiOutputSchema.model_json_schema(), indent=2)
+
+    template = get_prompt_template("v1")
+
+    assert template.render(transcript) == FULL_PROMPT_TEMPLATE.format(
+        schema=schema, transcript=transcript
+    )
+    assert template.render(transcript, safe_mode=True) == SAFE_MODE_PROMPT_TEMPLATE.format(
+        schema=schema, transcript=transcript
+    )
+
+
+def test_compact_schema_is_smaller_and_equivalent():
+    """Test that the compact schema drops whitespace but not content."""
+    compact = get_schema_text(AiOutputSchema, compact=True)
+    indented = get_schema_text(AiOutputSchema)
+
+    assert len(compact) < len(indented)
+    assert json.loads(compact) == json.loads(indented)
+    assert len(get_prompt_template("v2").render("x")) < len(get_prompt_template("v1").render("x"))
+
+
+def test_unknown_prompt_version():
+    """Test that an unregistered version is rejected."""
+    with pytest.raises(ValueError, match="Unknown prompt version"):
+        get_prompt_template("v99")
+
+
+@pytest.mark.asyncio
+async def test_generate_rejects_unknown_prompt_version(client, clinician_user, test_patient):
+    """Test that generating with an unregistered prompt version returns 400."""
+    headers = get_auth_header(clinician_user)
+    response = await client.post(
+        f"/api/v1/sessions/patients/{test_patient.id}/sessions",
+        headers=headers,
+        json={"transcript": "Patient reports low mood."},
+    )
+    session_id = response.json()["id"]
+
+    response = await client.post(
+        f"/api/v1/sessions/{session_id}/generate",
+        headers=headers,
+        json={"prompt_version": "v99"},
+    )
+
+    assert response.status_code == 400
+    assert "Unknown prompt version" in response.json()["detail"]
@@ -0,0 +1,192 @@
+"""Tests for the circuit breaker and adaptive concurrency limiter."""
+
+import asyncio
+
+import pytest
+
+from app.services.llm_backends import GeminiBackend
+from app.services.llm_client import LLMClient, get_llm_client
+from app.services.resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+from tests.conftest import get_auth_header
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_probes_and_closes():
+    """Test the closed -> open -> half-open -> closed cycle."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "test", failure_rate=0.5, window=4, min_calls=4, reset_timeout=10, clock=clock
+    )
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 10
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.before_call()
+
+
+def test_breaker_reopens_on_failed_probe():
+    """Test that a failed probe re-opens the circuit for another timeout."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", window=2, min_calls=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    clock.now = 10
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    clock.now = 19
+    assert breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_limiter_backs_off_and_recovers():
+    """Test multiplicative decrease on errors and additive increase on success."""
+    limiter = AdaptiveConcurrencyLimiter("test", max_limit=8, min_limit=1, cooldown=0)
+
+    with pytest.raises(RuntimeError):
+        async with limiter.slot():
+            raise RuntimeError("model error")
+    assert limiter.limit == 4
+
+    for _ in range(10):
+        async with limiter.slot():
+            pass
+    assert 4 < limiter.limit <= 8
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_in_flight_calls():
+    """Test that no more than the limit run at once."""
+    limiter = AdaptiveConcurrencyLimiter("test", max_limit=3)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(10)))
+
+    assert peak == 3
+    assert limiter.in_flight == 0
+
+
+class FailingModel:
+    """Fake Gemini model that always errors."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        raise ConnectionError("upstream unavailable")
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_calling_model():
+    """Test that calls stop reaching the model once the circuit opens."""
+    llm_client = LLMClient(api_key="")
+    llm_client.backend = GeminiBackend(llm_client.model_name, model=FailingModel())
+    llm_client.breaker = CircuitBreaker("test", window=2, min_calls=2)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await llm_client._call_model("prompt", temperature=0.0)
+
+    with pytest.raises(CircuitOpenError):
+        await llm_client.generate(transcript="Patient reports low mood.")
+    assert llm_client.backend.model.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_endpoint_warns_when_circuit_open(
+    client, clinician_user, test_patient, monkeypatch
+):
+    """Test that an open circuit yields an empty note with a clear warning."""
+    headers = get_auth_header(clinician_user)
+    create_response = await client.post(
+        f"/api/v1/sessions/patients/{test_patient.id}/sessions",
+        headers=headers,
+        json={"transcript": "Patient reports poor sleep."},
+    )
+    session_id = create_response.json()["id"]
+
+    llm_client = get_llm_client()
+    breaker = CircuitBreaker("test", window=1, min_calls=1)
+    breaker.record_failure()
+    monkeypatch.setattr(
+        llm_client, "backend", GeminiBackend(llm_client.model_name, model=FailingModel())
+    )
+    monkeypatch.setattr(llm_client, "breaker", breaker)
+
+    response = await client.post(
+        f"/api/v1/sessions/{session_id}/generate",
+        headers=headers,
+        json={"bypass_cache": True},
+    )
+
+    assert response.status_code == 200
+    assert "temporarily unavailable" in response.json()["warning_message"]
+    assert llm_client.backend.model.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_only_releases_its_own_probe():
+    """Test that cancelling a call admitted while closed keeps the probe slot taken."""
+    clock = FakeClock()
+    llm_client = LLMClient(api_key="")
+    llm_client.breaker = CircuitBreaker(
+        "test", window=1, min_calls=1, reset_timeout=10, clock=clock
+    )
+    started = asyncio.Event()
+
+    async def slow_call():
+        async with llm_client._guarded_call():
+            started.set()
+            await asyncio.sleep(60)
+
+    task = asyncio.create_task(slow_call())
+    await started.wait()
+
+    llm_client.breaker.record_failure()
+    clock.now = 10
+    assert llm_client.breaker.before_call() is True  # the probe
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    with pytest.raises(CircuitOpenError):
+        llm_client.breaker.before_call()
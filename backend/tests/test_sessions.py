@@ -2,8 +2,10 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
-from tests.conftest import get_auth_header
+from app.db.models import NoteStatus
+from tests.conftest import get_auth_header, test_engine
 
 
 @pytest.mark.asyncio
@@ -68,6 +70,62 @@ async def test_list_patient_sessions(client: AsyncClient, clinician_user, test_p
     assert len(data["sessions"]) == 2
 
 
+@pytest.mark.asyncio
+async def test_list_patient_sessions_single_query(
+    client: AsyncClient, db_session, clinician_user, test_patient
+):
+    """Test session summaries kept up to date and read without per-session queries."""
+    headers = get_auth_header(clinician_user)
+    url = f"/api/v1/sessions/patients/{test_patient.id}/sessions"
+    transcripts = ["Patient reports low mood.", "Second session transcript."]
+    session_ids = []
+    for transcript in transcripts:
+        response = await client.post(url, headers=headers, json={"transcript": transcript})
+        session_ids.append(response.json()["id"])
+
+    for _ in range(2):
+        generated = await client.post(
+            f"/api/v1/sessions/{session_ids[0]}/generate",
+            headers=headers,
+            json={"bypass_cache": True},
+        )
+    latest_id = generated.json()["note_version_id"]
+    await client.post(f"/api/v1/notes/versions/{latest_id}/finalize", headers=headers)
+
+    await db_session.commit()  # write pending audit rows outside the measurement
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(url, headers=headers)
+        small_page = len(statements)
+        for index in range(5):
+            await client.post(url, headers=headers, json={"transcript": f"Extra {index}."})
+        await db_session.commit()
+        statements.clear()
+        await client.get(url, headers=headers)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert len(statements) == small_page <= 2  # user lookup + session list
+    sessions = {item["id"]: item for item in response.json()["sessions"]}
+    assert sessions[session_ids[0]]["latest_version_id"] == latest_id
+    assert sessions[session_ids[0]]["latest_version_status"] == NoteStatus.FINAL.value
+    assert sessions[session_ids[0]]["has_ai_suggestions"] is True
+    assert sessions[session_ids[1]]["has_ai_suggestions"] is False
+    assert sessions[session_ids[1]]["latest_version_id"] is None
+    assert [sessions[i]["transcript_length"] for i in session_ids] == [
+        len(transcript) for transcript in transcripts
+    ]
+    assert response.json()["total"] == 2
+
+    detail = await client.get(f"/api/v1/sessions/{session_ids[0]}", headers=headers)
+    assert detail.json() == sessions[session_ids[0]]
+
+
 @pytest.mark.asyncio
 async def test_get_session(client: AsyncClient, clinician_user, test_patient):
     """Test getting a specific session."""
@@ -153,3 +211,87 @@ async def test_viewer_cannot_create_session(client: AsyncClient, viewer_user, te
     )
     
     assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_parallel_generations_fit_small_pool(
+    client: AsyncClient, db_session, clinician_user, test_patient, monkeypatch
+):
+    """Test that 50 concurrent generations share a 5-connection pool while the model runs."""
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.db.session import get_db
+    from app.main import app
+    from app.services.llm_backends import FakeBackend
+    from app.services.llm_client import get_llm_client
+    from app.services.resilience import AdaptiveConcurrencyLimiter
+    from tests.conftest import TEST_DATABASE_URL
+
+    headers = get_auth_header(clinician_user)
+    created = await client.post(
+        f"/api/v1/sessions/patients/{test_patient.id}/sessions",
+        headers=headers,
+        json={"transcript": "Clinician: How are you?\nPatient: Low mood and poor sleep."},
+    )
+    await db_session.commit()
+
+    # Enough overflow that generations holding their connection through the
+    # model call would all get one, and show up in checkedout()
+    pool_size = 5
+    engine = create_async_engine(
+        TEST_DATABASE_URL, pool_size=pool_size, max_overflow=50 - pool_size, pool_timeout=10.0
+    )
+    request_session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    async def per_request_db():
+        async with request_session() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    entered = 0
+    all_in_model = asyncio.Event()
+    checked_out_in_model = []
+
+    class BarrierBackend(FakeBackend):
+        """Holds every call until all 50 are inside the model at once."""
+
+        async def generate(self, *args, **kwargs):
+            nonlocal entered
+            entered += 1
+            if entered == 50:
+                checked_out_in_model.append(engine.pool.checkedout())
+                all_in_model.set()
+            await asyncio.wait_for(all_in_model.wait(), timeout=10)
+            return await super().generate(*args, **kwargs)
+
+    llm_client = get_llm_client()
+    monkeypatch.setattr(
+        llm_client, "backend", BarrierBackend(latency_ms=0, distribution="fixed", seed=1)
+    )
+    monkeypatch.setattr(llm_client, "limiter", AdaptiveConcurrencyLimiter("test", max_limit=50))
+    app.dependency_overrides[get_db] = per_request_db
+    try:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    f"/api/v1/sessions/{created.json()['id']}/generate",
+                    headers=headers,
+                    json={"bypass_cache": True},
+                )
+                for _ in range(50)
+            )
+        )
+    finally:
+        await engine.dispose()
+
+    assert checked_out_in_model, "generations never all reached the model together"
+    assert max(checked_out_in_model) <= pool_size
+    assert [response.status_code for response in responses] == [200] * 50
+    versions = {response.json()["note_version_id"] for response in responses}
+    assert len(versions) == 50
@@ -0,0 +1,225 @@
+"""Tests for streamed AI generation."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.db.session import get_db, get_session_factory
+from app.main import app
+from app.services.json_stream import IncrementalSectionParser
+from app.services.llm_backends import GeminiBackend
+from app.services.llm_client import get_llm_client
+from app.services.notes import SECTION_MODELS
+from tests import conftest
+from tests.conftest import get_auth_header
+from tests.test_llm_client import FakeSectionModel
+
+
+def chunked(text: str, size: int) -> list[str]:
+    """Split text into fixed-size chunks."""
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class FakeStreamingModel:
+    """Fake Gemini model that streams a payload in small chunks."""
+
+    def __init__(self, payload: str, chunk_size: int = 17):
+        self.chunks = chunked(payload, chunk_size)
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        chunks = self.chunks
+
+        class Response:
+            async def __aiter__(self):
+                for chunk in chunks:
+                    yield SimpleNamespace(text=chunk)
+
+        return Response()
+
+
+def test_parser_emits_sections_in_order():
+    """Test that sections are emitted as soon as each one closes."""
+    output = get_llm_client().create_empty_output()
+    payload = output.model_dump_json()
+    parser = IncrementalSectionParser(SECTION_MODELS)
+
+    emitted = []
+    for chunk in chunked(payload, 7):
+        emitted.extend(path for path, _ in parser.feed(chunk))
+
+    assert emitted == list(SECTION_MODELS)
+
+
+def test_parser_handles_strings_and_prose():
+    """Test that braces and quotes inside strings do not confuse the parser."""
+    document = {
+        "soap": {
+            "subjective": {"content": 'He said "I {can\'t} [sleep]"', "citations": []},
+        }
+    }
+    text = "Here is the JSON:\n```json\n" + json.dumps(document) + "\n```"
+    parser = IncrementalSectionParser([("soap", "subjective")])
+
+    results = []
+    for chunk in chunked(text, 3):
+        results.extend(parser.feed(chunk))
+
+    assert results == [(("soap", "subjective"), document["soap"]["subjective"])]
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_emits_sections(
+    client, clinician_user, test_patient, monkeypatch
+):
+    """Test the streaming endpoint end to end with a fake model."""
+    headers = get_auth_header(clinician_user)
+    create_response = await client.post(
+        f"/api/v1/sessions/patients/{test_patient.id}/sessions",
+        headers=headers,
+        json={"transcript": "Patient reports poor sleep."},
+    )
+    session_id = create_response.json()["id"]
+
+    llm_client = get_llm_client()
+    payload = llm_client.create_empty_output().model_dump_json()
+    backend = GeminiBackend(llm_client.model_name, model=FakeStreamingModel(payload))
+    monkeypatch.setattr(llm_client, "backend", backend)
+
+    events = []
+    async with client.stream(
+        "POST",
+        f"/api/v1/sessions/{session_id}/generate/stream",
+        headers=headers,
+        json={"bypass_cache": True},
+    ) as response:
+        assert response.status_code == 200
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line[len("data: "):])))
+
+    names = [name for name, _ in events]
+    assert names[0] == "meta"
+    assert names.count("section") == len(SECTION_MODELS)
+    assert names[-1] == "complete"
+    assert events[1][1]["section"] == "soap.subjective"
+    assert events[-1][1]["note_version_id"] is not None
+
+
+async def test_stream_complete_event_warns_about_repairs(
+    client, clinician_user, test_patient, monkeypatch
+):
+    """Test that the complete event flags fields local repair filled in."""
+    headers = get_auth_header(clinician_user)
+    create_response = await client.post(
+        f"/api/v1/sessions/patients/{test_patient.id}/sessions",
+        headers=headers,
+        json={"transcript": "Patient reports poor sleep."},
+    )
+    session_id = create_response.json()["id"]
+
+    llm_client = get_llm_client()
+    output = llm_client.create_empty_output().model_dump()
+    del output["safety_plan"]
+    backend = GeminiBackend(llm_client.model_name, model=FakeStreamingModel(json.dumps(output)))
+    monkeypatch.setattr(llm_client, "backend", backend)
+
+    response = await client.post(
+        f"/api/v1/sessions/{session_id}/generate/stream",
+        headers=headers,
+        json={"bypass_cache": True},
+    )
+
+    complete = response.text.split("event: complete\ndata: ", 1)[1].splitlines()[0]
+    warning = json.loads(complete)["warning_message"]
+    assert "repaired" in warning
+    assert "safety_plan" in warning
+
+
+@pytest.mark.asyncio
+async def test_stream_parallel_mode_reports_failed_section(
+    client, clinician_user, test_patient, monkeypatch
+):
+    """Test that parallel mode streams completed sections and flags the failed one."""
+    headers = get_auth_header(clinician_user)
+    create_response = await client.post(
+        f"/api/v1/sessions/patients/{test_patient.id}/sessions",
+        headers=headers,
+        json={"transcript": "Patient reports poor sleep."},
+    )
+    session_id = create_response.json()["id"]
+
+    llm_client = get_llm_client()
+    output = llm_client.create_empty_output()
+    model = FakeSectionModel(0.0, output, failing=("safety_plan",))
+    monkeypatch.setattr(llm_client, "backend", GeminiBackend(llm_client.model_name, model=model))
+
+    events = []
+    async with client.stream(
+        "POST",
+        f"/api/v1/sessions/{session_id}/generate/stream",
+        headers=headers,
+        json={"bypass_cache": True, "mode": "parallel"},
+    ) as response:
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line[len("data: "):])))
+
+    sections = {data["section"] for name, data in events if name == "section"}
+    assert "safety_plan" not in sections
+    assert len(sections) == len(SECTION_MODELS) - 1
+    assert "safety_plan" in events[-1][1]["warning_message"]
+
+
+@pytest.mark.asyncio
+async def test_stream_releases_request_connection(
+    client, clinician_user, test_patient, db_session, monkeypatch
+):
+    """Test that the request's session holds no connection while the stream runs."""
+    headers = get_auth_header(clinician_user)
+    create_response = await client.post(
+        f"/api/v1/sessions/patients/{test_patient.id}/sessions",
+        headers=headers,
+        json={"transcript": "Patient reports poor sleep."},
+    )
+    session_id = create_response.json()["id"]
+    await db_session.commit()
+
+    request_sessions = []
+    holding_connection = []
+
+    class RecordingModel(FakeStreamingModel):
+        async def generate_content_async(self, prompt, stream=False, **kwargs):
+            holding_connection.append(request_sessions[0].in_transaction())
+            return await super().generate_content_async(prompt, stream=stream, **kwargs)
+
+    llm_client = get_llm_client()
+    payload = llm_client.create_empty_output().model_dump_json()
+    backend = GeminiBackend(llm_client.model_name, model=RecordingModel(payload))
+    monkeypatch.setattr(llm_client, "backend", backend)
+
+    async def separate_get_db():
+        async with conftest.test_async_session() as db:
+            request_sessions.append(db)
+            yield db
+
+    app.dependency_overrides[get_db] = separate_get_db
+    app.dependency_overrides[get_session_factory] = lambda: conftest.test_async_session
+
+    async with client.stream(
+        "POST",
+        f"/api/v1/sessions/{session_id}/generate/stream",
+        headers=headers,
+        json={"bypass_cache": True},
+    ) as response:
+        assert response.status_code == 200
+        body = await response.aread()
+
+    assert b"event: complete" in body
+    assert holding_connection == [False]
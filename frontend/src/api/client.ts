@@ -128,8 +128,9 @@ export const api = {
   generateAiSuggestions: async (sessionId: number, options?: {
     prompt_version?: string;
     model_name?: string;
-    mode?: 'full' | 'safe';
+    mode?: 'full' | 'safe' | 'parallel';
     temperature?: number;
+    bypass_cache?: boolean;
   }) => {
     const response = await apiClient.post(`/sessions/${sessionId}/generate`, options || {});
     return response.data;
@@ -146,6 +147,11 @@ export const api = {
     return response.data;
   },
 
+  getSessionVersionSummaries: async (sessionId: number) => {
+    const response = await apiClient.get(`/notes/sessions/${sessionId}/versions/summary`);
+    return response.data;
+  },
+
   getVersion: async (versionId: number) => {
     const response = await apiClient.get(`/notes/versions/${versionId}`);
     return response.data;
@@ -181,6 +187,8 @@ export const api = {
     action?: string;
     limit?: number;
     offset?: number;
+    cursor?: string;
+    total_mode?: 'exact' | 'estimated' | 'none';
   }) => {
     const response = await apiClient.get('/audit/logs', { params });
     return response.data;
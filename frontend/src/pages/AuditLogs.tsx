@@ -8,6 +8,7 @@ export default function AuditLogs() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [total, setTotal] = useState(0);
+  const [hasMore, setHasMore] = useState(false);
   const [offset, setOffset] = useState(0);
   const [entityType, setEntityType] = useState('');
   const [action, setAction] = useState('');
@@ -16,13 +17,14 @@ export default function AuditLogs() {
   const fetchLogs = async () => {
     try {
       setLoading(true);
-      const params: Record<string, string | number> = { limit, offset };
+      const params: Record<string, string | number> = { limit, offset, total_mode: 'estimated' };
       if (entityType) params.entity_type = entityType;
       if (action) params.action = action;
       
       const data = await api.getAuditLogs(params);
       setLogs(data.logs);
       setTotal(data.total);
+      setHasMore(data.has_more);
     } catch {
       setError('Failed to load audit logs');
     } finally {
@@ -121,7 +123,7 @@ export default function AuditLogs() {
 
           <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', marginTop: '1rem' }}>
             <span style={{ color: 'var(--color-text-secondary)', fontSize: '0.875rem' }}>
-              Showing {offset + 1} - {Math.min(offset + limit, total)} of {total}
+              Showing {offset + 1} - {offset + logs.length} of about {total}
             </span>
             <div style={{ display: 'flex', gap: '0.5rem' }}>
               <button
@@ -133,7 +135,7 @@ export default function AuditLogs() {
               </button>
               <button
                 className="btn btn-outline"
-                disabled={offset + limit >= total}
+                disabled={!hasMore}
                 onClick={() => setOffset(offset + limit)}
               >
                 Next
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import { api } from '../api/client';
 import { useAuthStore } from '../store/authStore';
-import type { Session, GenerateResponse, NoteVersion, SOAPNote, DiagnosisSuggestion, MedicationEducation, SafetyPlan, Citation } from '../types';
+import type { Session, GenerateResponse, NoteVersion, NoteVersionSummary, SOAPNote, DiagnosisSuggestion, MedicationEducation, SafetyPlan, Citation } from '../types';
 import { format } from 'date-fns';
 import clsx from 'clsx';
 
@@ -10,7 +10,7 @@ export default function SessionDetail() {
   const { sessionId } = useParams<{ sessionId: string }>();
   const [session, setSession] = useState<Session | null>(null);
   const [transcript, setTranscript] = useState('');
-  const [versions, setVersions] = useState<NoteVersion[]>([]);
+  const [versions, setVersions] = useState<NoteVersionSummary[]>([]);
   const [currentVersion, setCurrentVersion] = useState<NoteVersion | null>(null);
   const [loading, setLoading] = useState(true);
   const [generating, setGenerating] = useState(false);
@@ -23,6 +23,11 @@ export default function SessionDetail() {
   const user = useAuthStore((state) => state.user);
   const canEdit = user?.role === 'admin' || user?.role === 'clinician';
 
+  // The list carries metadata only; bodies are fetched one version at a time
+  const loadVersion = async (versionId: number) => {
+    setCurrentVersion(await api.getVersion(versionId));
+  };
+
   const fetchData = async () => {
     if (!sessionId) return;
     
@@ -30,14 +35,14 @@ export default function SessionDetail() {
       setLoading(true);
       const [sessionData, versionsData] = await Promise.all([
         api.getSession(parseInt(sessionId)),
-        api.getSessionVersions(parseInt(sessionId)),
+        api.getSessionVersionSummaries(parseInt(sessionId)),
       ]);
       setSession(sessionData);
       setVersions(versionsData.versions);
       
       // Set current version to latest
       if (versionsData.versions.length > 0) {
-        setCurrentVersion(versionsData.versions[0]);
+        await loadVersion(versionsData.versions[0].id);
       }
 
       // Try to get transcript (clinician/admin only)
@@ -75,9 +80,9 @@ export default function SessionDetail() {
       }
       
       // Refresh versions
-      const versionsData = await api.getSessionVersions(parseInt(sessionId));
+      const versionsData = await api.getSessionVersionSummaries(parseInt(sessionId));
       setVersions(versionsData.versions);
-      setCurrentVersion(versionsData.versions[0]);
+      await loadVersion(response.note_version_id);
     } catch (err: unknown) {
       const error = err as { response?: { data?: { detail?: string } } };
       setError(error.response?.data?.detail || 'AI generation failed');
@@ -217,7 +222,7 @@ export default function SessionDetail() {
                       <button
                         className="btn btn-outline"
                         style={{ padding: '0.25rem 0.5rem', fontSize: '0.75rem' }}
-                        onClick={() => setCurrentVersion(version)}
+                        onClick={() => loadVersion(version.id)}
                       >
                         View
                       </button>
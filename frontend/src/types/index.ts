@@ -117,7 +117,7 @@ export interface SafetyPlan {
 export interface GenerateRequest {
   prompt_version?: string;
   model_name?: string;
-  mode?: 'full' | 'safe';
+  mode?: 'full' | 'safe' | 'parallel';
   temperature?: number;
 }
 
@@ -132,6 +132,7 @@ export interface GenerateResponse {
   medications: MedicationEducation;
   safety_plan: SafetyPlan;
   gemini_latency_ms: number;
+  cached?: boolean;
 }
 
 // Note version types
@@ -149,6 +150,9 @@ export interface NoteVersion {
   created_at: string;
 }
 
+// Note version metadata, without the note bodies
+export type NoteVersionSummary = Omit<NoteVersion, 'soap_json' | 'dx_json' | 'meds_json' | 'safety_json'>;
+
 export interface NoteVersionUpdate {
   soap_json?: string;
   dx_json?: string;
@@ -185,4 +189,5 @@ export interface AuditLog {
 export interface PaginatedResponse<T> {
   items: T[];
   total: number;
+  next_cursor?: string | null;
 }